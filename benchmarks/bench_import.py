@@ -0,0 +1,78 @@
+"""
+Import-time guard for the modeling core.
+
+Imports each core module in a fresh interpreter, reports the median wall time
+as JSON and fails (exit status 1) if any of them pulls in a plotting or
+analysis library, or if the median exceeds the time budget.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--max-ms 1000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE_MODULES = ["systems.process", "systems.connectors", "systems.pump", "systems.facility", "systems.sweep"]
+FORBIDDEN_MODULES = ["matplotlib", "pandas"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "forbidden": [name for name in {forbidden!r} if name in sys.modules]
+}}))
+"""
+
+
+def measure(module, repeat):
+    """
+    Time importing one module in fresh interpreters.
+
+    Args:
+        module (str): Dotted module name.
+        repeat (int): Number of fresh interpreters to time.
+
+    Returns:
+        dict: "median_ms" and "forbidden" (forbidden modules that were loaded).
+    """
+    samples = []
+    forbidden = set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, forbidden=FORBIDDEN_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        result = json.loads(output.stdout)
+        samples.append(result["seconds"] * 1000)
+        forbidden.update(result["forbidden"])
+    return {"median_ms": statistics.median(samples), "forbidden": sorted(forbidden)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--max-ms", type=float, default=1000, help="median import time budget per module")
+    args = parser.parse_args()
+
+    report = {module: measure(module, args.repeat) for module in CORE_MODULES}
+    print(json.dumps(report, indent=2))
+
+    failures = [
+        module for module, result in report.items()
+        if result["forbidden"] or result["median_ms"] > args.max_ms
+    ]
+    for module in failures:
+        print(f"FAIL {module}: {report[module]}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
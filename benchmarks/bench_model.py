@@ -0,0 +1,264 @@
+"""
+Benchmark suite for the model's hot paths.
+
+Micro-benchmarks time single calls of the conversion, process, connector, pump
+and facility functions. Macro-benchmarks time a notebook-sized design sweep
+(5 pumps × 4 tiers of each processor × diameters × friction factors) and a
+24-hour, one-second time series, streamed and as one batch. Results are written as JSON; when a baseline
+file from an earlier run is given, each benchmark is compared against it and
+the run fails (exit status 1) if any is slower than the regression threshold.
+
+Usage:
+    python benchmarks/bench_model.py [--quick] [--only micro|macro]
+        [--output results.json] [--baseline previous.json] [--threshold 1.25]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from systems.process import Process
+from systems.processors import Fermentation, Filtration, Distillation, Dehydration
+from systems.connectors import Pipe, Valve, Bend
+from systems.pump import Pump
+from systems.sweep import DesignSweep, build_standard_facility
+
+
+FEED = {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2}
+DIAMETERS = [0.10, 0.11, 0.12, 0.13, 0.14, 0.15]
+FRICTION_FACTORS = [0.002, 0.01, 0.02, 0.03, 0.04, 0.05]
+
+
+def catalog():
+    """
+    Component options from the analysis notebook.
+
+    Returns:
+        dict: Option lists keyed by DesignSweep keyword argument.
+    """
+    return {
+        "pumps": [
+            Pump(name="Cheap", efficiency=0.80, cost=200000, opening_diameter=0.10, performance_rating=6),
+            Pump(name="Value", efficiency=0.83, cost=240000, opening_diameter=0.10, performance_rating=6),
+            Pump(name="Standard", efficiency=0.86, cost=280000, opening_diameter=0.10, performance_rating=6),
+            Pump(name="High-Grade", efficiency=0.89, cost=340000, opening_diameter=0.10, performance_rating=6),
+            Pump(name="Premium", efficiency=0.92, cost=415000, opening_diameter=0.10, performance_rating=6)
+        ],
+        "fermenters": [
+            Fermentation(name="Scrap", efficiency=0.5, power_consumption_rate=46600, cost_per_flow=320000),
+            Fermentation(name="Average", efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000),
+            Fermentation(name="Premium", efficiency=0.9, power_consumption_rate=47500, cost_per_flow=460000),
+            Fermentation(name="World-Class", efficiency=0.95, power_consumption_rate=48000, cost_per_flow=1100000)
+        ],
+        "filtrations": [
+            Filtration(name="Scrap", efficiency=0.81, power_consumption_rate=47004, cost_per_flow=390000),
+            Filtration(name="Average", efficiency=0.9, power_consumption_rate=47812, cost_per_flow=460000),
+            Filtration(name="Premium", efficiency=0.915, power_consumption_rate=48200, cost_per_flow=560000),
+            Filtration(name="World-Class", efficiency=0.98, power_consumption_rate=49500, cost_per_flow=1370000)
+        ],
+        "distillations": [
+            Distillation(name="Scrap", efficiency=0.5, power_consumption_rate=48800, cost_per_flow=200000),
+            Distillation(name="Average", efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+            Distillation(name="Premium", efficiency=0.9, power_consumption_rate=50350, cost_per_flow=280000),
+            Distillation(name="World-Class", efficiency=0.98, power_consumption_rate=51000, cost_per_flow=480000)
+        ],
+        "dehydrations": [
+            Dehydration(name="Scrap", efficiency=0.5, power_consumption_rate=48800, cost_per_flow=200000),
+            Dehydration(name="Average", efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+            Dehydration(name="Premium", efficiency=0.9, power_consumption_rate=50350, cost_per_flow=280000),
+            Dehydration(name="World-Class", efficiency=0.98, power_consumption_rate=51000, cost_per_flow=480000)
+        ]
+    }
+
+
+def standard_facility():
+    """Notebook facility built from the 'Average' tier of every slot."""
+    options = catalog()
+    return build_standard_facility(
+        options["fermenters"][1], options["filtrations"][1], options["distillations"][1],
+        options["dehydrations"][1], options["pumps"][2], diameter=0.12, friction_factor=0.02
+    )
+
+
+def time_call(function, number, repeat):
+    """
+    Time a callable.
+
+    Args:
+        function (callable): Zero-argument callable to time.
+        number (int): Calls per timing sample.
+        repeat (int): Number of timing samples.
+
+    Returns:
+        dict: "median_s" and "min_s" per call, plus "calls".
+    """
+    function()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "calls": number * repeat}
+
+
+def micro_benchmarks(quick):
+    """
+    Time single calls of the model's hot functions.
+
+    Args:
+        quick (bool): Use fewer calls per sample.
+
+    Returns:
+        dict: Benchmark name → timing.
+    """
+    number = 200 if quick else 2000
+    repeat = 5
+
+    volumetric_amounts = {"ethanol": 0.0, "water": 0.006, "sugar": 0.002, "fiber": 0.002}
+    mass_amounts = Process.volumetricToMass(inputs=volumetric_amounts)
+    fermenter = catalog()["fermenters"][1]
+    fermented = fermenter.processMassFlow(inputs=mass_amounts, input_type="amount", output_type="amount")
+    distiller = catalog()["distillations"][1]
+    pipe = Pipe(length=6.096, friction_factor=0.02, diameter=0.12)
+    valve = Valve(diameter=0.12, resistance_coefficient=0.5)
+    bend = Bend(diameter=0.12, bend_factor=0.7)
+    pump = Pump(efficiency=0.86, opening_diameter=0.10)
+    facility = standard_facility()
+    transfer = facility.transfer_function()
+    table = facility.response_table(input_volume_composition=FEED, flow_range=(0.002, 0.05))
+
+    cases = {
+        "Process.volumetricToMass": lambda: Process.volumetricToMass(inputs=volumetric_amounts, output_type="full"),
+        "Process.massToVolumetric": lambda: Process.massToVolumetric(inputs=mass_amounts, output_type="full"),
+        "Fermentation.processMassFlow": lambda: fermenter.processMassFlow(inputs=mass_amounts, input_type="amount"),
+        "Distillation.processMassFlow": lambda: distiller.processMassFlow(inputs=fermented, input_type="amount"),
+        "Pipe.processFlow": lambda: pipe.processFlow(input_volumetric_flow=0.01, input_mass_flow=11.4),
+        "Valve.processFlow": lambda: valve.processFlow(input_volumetric_flow=0.01, input_mass_flow=11.4),
+        "Bend.processFlow": lambda: bend.processFlow(input_volumetric_flow=0.01, input_mass_flow=11.4),
+        "Pump.pump_process": lambda: pump.pump_process(input_volume_flow=0.01, input_composition=dict(FEED)),
+        "Facility.facility_process": lambda: facility.facility_process(
+            input_volume_composition=dict(FEED), input_volumetric_flow=0.01, interval=86400
+        ),
+        "TransferFunction.evaluate": lambda: transfer.evaluate(
+            input_volume_composition=FEED, input_volumetric_flow=0.01, interval=86400
+        ),
+        "ResponseTable.query": lambda: table.query(input_volumetric_flow=0.013)
+    }
+    return {name: time_call(case, number, repeat) for name, case in cases.items()}
+
+
+def macro_benchmarks(quick):
+    """
+    Time a notebook-sized design sweep and a 24-hour one-second time series.
+
+    Args:
+        quick (bool): Shrink the sweep to one diameter and friction factor and the
+            time series to one hour.
+
+    Returns:
+        dict: Benchmark name → timing, with the workload size in "items".
+    """
+    sweep = DesignSweep(
+        **catalog(),
+        diameters=DIAMETERS[2:3] if quick else DIAMETERS,
+        friction_factors=FRICTION_FACTORS[2:3] if quick else FRICTION_FACTORS,
+        input_volume_composition=FEED,
+        input_volumetric_flow=0.01
+    )
+    results = {"DesignSweep.run": dict(time_call(lambda: sweep.run(workers=1), 1, 1), items=len(sweep))}
+    sweep.share_prefixes = True
+    results["DesignSweep.run[share_prefixes]"] = dict(time_call(lambda: sweep.run(workers=1), 1, 1), items=len(sweep))
+
+    seconds = 3600 if quick else 86400
+    facility = standard_facility()
+    start = datetime.datetime(2025, 1, 1)
+    feed = [FEED[component] for component in ["ethanol", "water", "sugar", "fiber"]]
+
+    def replay():
+        records = (
+            (start + datetime.timedelta(seconds=i), 0.01 + 0.002 * np.sin(i / 3600), feed)
+            for i in range(seconds)
+        )
+        for _ in facility.facility_process_stream(records):
+            pass
+
+    results["Facility.facility_process_stream"] = dict(time_call(replay, 1, 1), items=seconds)
+
+    flows = 0.01 + 0.002 * np.sin(np.arange(seconds) / 3600)
+    results["Facility.facility_process_batch"] = dict(time_call(
+        lambda: facility.facility_process_batch(input_volume_composition=np.array(feed), input_volumetric_flow=flows, interval=1),
+        5, 3
+    ), items=seconds)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against a baseline run.
+
+    Args:
+        results (dict): Current benchmark timings.
+        baseline (dict): Timings from an earlier run's "benchmarks" section.
+        threshold (float): Slowdown ratio above which a benchmark regresses.
+
+    Returns:
+        dict: Benchmark name → {"ratio", "regression"} for benchmarks in both runs.
+    """
+    comparison = {}
+    for name, timing in results.items():
+        if name in baseline:
+            ratio = timing["median_s"] / baseline[name]["median_s"]
+            comparison[name] = {"ratio": ratio, "regression": ratio > threshold}
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="smaller workloads for a fast check")
+    parser.add_argument("--only", choices=["micro", "macro"], help="run one group of benchmarks")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    benchmarks = {}
+    if args.only in (None, "micro"):
+        benchmarks.update(micro_benchmarks(args.quick))
+    if args.only in (None, "macro"):
+        benchmarks.update(macro_benchmarks(args.quick))
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "benchmarks": benchmarks
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(benchmarks, json.load(f)["benchmarks"], args.threshold)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+    regressions = [name for name, result in report.get("comparison", {}).items() if result["regression"]]
+    for name in regressions:
+        print(f"REGRESSION {name}: {report['comparison'][name]['ratio']:.2f}x baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Load generator for the local simulation service.
+
+Starts a SimulationService on localhost holding the notebook facility, then
+drives it with many concurrent clients, each pipelining its requests over one
+connection. Reports throughput, latency percentiles and the mean batch size
+as JSON, next to the throughput of calling Facility.facility_process() in a
+loop for the same inputs.
+
+Usage:
+    python benchmarks/bench_service.py [--clients 32] [--requests 200]
+        [--max-batch 1024] [--max-delay 0.002] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from systems.service import SimulationService, ServiceClient
+from bench_model import FEED, standard_facility
+
+
+async def client_load(address, requests, flows, latencies):
+    """Send one client's requests concurrently and record each latency."""
+    async with await ServiceClient.connect(*address) as client:
+        async def one(flow):
+            start = time.perf_counter()
+            await client.evaluate(facility="standard", input_volume_composition=FEED, input_volumetric_flow=flow)
+            latencies.append(time.perf_counter() - start)
+        await asyncio.gather(*(one(flow) for flow in flows[:requests]))
+
+
+async def run_load(args, flows):
+    """Start the service, run every client and summarize."""
+    service = SimulationService(
+        {"standard": standard_facility()}, max_batch=args.max_batch, max_delay=args.max_delay
+    )
+    await service.start()
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client_load(service.address, args.requests, flows[i * args.requests:], latencies)
+        for i in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+    await service.stop()
+
+    latencies = np.array(latencies)
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "latency_ms": {
+            "p50": float(np.percentile(latencies, 50) * 1e3),
+            "p95": float(np.percentile(latencies, 95) * 1e3),
+            "p99": float(np.percentile(latencies, 99) * 1e3),
+            "max": float(latencies.max() * 1e3)
+        },
+        "batches": service.batches,
+        "mean_batch_size": service.evaluated / service.batches
+    }
+
+
+def direct_loop(flows):
+    """Throughput of evaluating the same inputs one call at a time."""
+    facility = standard_facility()
+    start = time.perf_counter()
+    for flow in flows:
+        facility.facility_process(input_volume_composition=dict(FEED), input_volumetric_flow=flow)
+    elapsed = time.perf_counter() - start
+    return {"requests": len(flows), "seconds": elapsed, "requests_per_s": len(flows) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent client connections")
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--max-batch", type=int, default=1024, help="service batch size limit")
+    parser.add_argument("--max-delay", type=float, default=0.002, help="service latency budget in seconds")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    total = args.clients * args.requests
+    flows = (0.01 + 0.002 * np.sin(np.arange(total) / 100)).tolist()
+    report = {
+        "clients": args.clients,
+        "max_batch": args.max_batch,
+        "max_delay": args.max_delay,
+        "service": asyncio.run(run_load(args, flows)),
+        "direct": direct_loop(flows)
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
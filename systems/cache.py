@@ -0,0 +1,223 @@
+from collections import OrderedDict
+import hashlib
+import math
+import numbers
+import types
+
+
+def quantize(value, digits):
+    """
+    Round a number to a fixed number of significant digits for use in a cache key.
+
+    Args:
+        value (float): Value to quantize.
+        digits (int): Significant digits to keep.
+
+    Returns:
+        float: The rounded value.
+    """
+    if value == 0 or not math.isfinite(value):
+        return float(value)
+    return round(float(value), digits - 1 - math.floor(math.log10(abs(value))))
+
+
+def _code_digest(code):
+    """Digest a code object by its bytecode, names and constants, nested code included."""
+    constants = tuple(
+        _code_digest(constant) if isinstance(constant, types.CodeType) else constant
+        for constant in code.co_consts
+    )
+    return hashlib.sha1(code.co_code + repr((code.co_names, constants)).encode()).hexdigest()
+
+
+def callable_fingerprint(function):
+    """
+    Fingerprint a callable parameter by what it computes rather than its identity.
+
+    Module- and class-level functions are identified by module and qualified name.
+    Lambdas and nested functions add a digest of their code and of the numbers or
+    strings they capture as defaults or closure variables. The result is the same
+    in every process and session.
+
+    Args:
+        function (callable): Callable to fingerprint.
+
+    Returns:
+        tuple: Hashable fingerprint.
+
+    Raises:
+        ValueError: If the callable's behavior depends on state the fingerprint
+            cannot see: bound methods of other objects, callable instances and
+            partials, or closures over anything but numbers and strings.
+    """
+    owner = getattr(function, "__self__", None)
+    module = getattr(function, "__module__", None)
+    qualname = getattr(function, "__qualname__", None)
+    if (owner is not None and not isinstance(owner, types.ModuleType)) or module is None or qualname is None:
+        raise ValueError(f"Cannot fingerprint {function!r}; use a plain function or a method of the component")
+    code = getattr(function, "__code__", None)
+    if code is None or "<" not in qualname:
+        return (module, qualname)
+    try:
+        captured = tuple(function.__defaults__ or ()) + tuple(cell.cell_contents for cell in function.__closure__ or ())
+    except ValueError:
+        captured = (None,)
+    if not all(isinstance(value, (numbers.Number, str)) for value in captured):
+        raise ValueError(f"Cannot fingerprint {qualname}: it captures values other than numbers and strings")
+    return (module, qualname, _code_digest(code), captured)
+
+
+def component_fingerprint(component):
+    """
+    Build a stable, hashable fingerprint of a component's configuration.
+
+    The fingerprint covers the component type and every numeric or string
+    attribute (efficiencies, diameters, friction factors, costs, ...) plus any
+    callable attributes, identified by callable_fingerprint(). Names, private
+    state and runtime logs are ignored, so two identically configured components
+    share a fingerprint, in this process or any other.
+
+    Args:
+        component (Process, Connector or Pump): Component to fingerprint.
+
+    Returns:
+        tuple: Hashable fingerprint.
+
+    Raises:
+        ValueError: If a callable attribute cannot be fingerprinted.
+    """
+    fields = []
+    for name, value in sorted(vars(component).items()):
+        if name == "name" or name.startswith("_"):
+            continue
+        if isinstance(value, (numbers.Number, str)):
+            fields.append((name, value))
+        elif callable(value):
+            if getattr(value, "__self__", None) is component:
+                # Bound methods of the component are identified by their class
+                fields.append((name, value.__func__.__qualname__))
+            else:
+                fields.append((name,) + callable_fingerprint(value))
+    return (type(component).__qualname__, tuple(fields))
+
+
+class Fingerprinted:
+    """
+    Base for components that cache their fingerprint.
+
+    Setting any public attribute discards the cached fingerprint, so parameters
+    changed in place are picked up by the next fingerprint() call.
+    """
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self.__dict__.pop("_fingerprint", None)
+        object.__setattr__(self, name, value)
+
+    def fingerprint(self):
+        """
+        Get the component's fingerprint, cached until a parameter is set.
+
+        Returns:
+            tuple: Fingerprint from component_fingerprint().
+        """
+        fingerprint = self.__dict__.get("_fingerprint")
+        if fingerprint is None:
+            fingerprint = self.__dict__["_fingerprint"] = component_fingerprint(self)
+        return fingerprint
+
+
+class EvaluationCache:
+    """
+    Size-bounded LRU cache of facility evaluation results.
+
+    Keys combine a facility fingerprint with quantized inputs; values are stored
+    as given. One cache can be shared by many Facility instances, so identically
+    configured facilities built separately (as in a design sweep) reuse each
+    other's results.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize (int, optional): Maximum number of stored results. Default is 4096.
+            digits (int, optional): Significant digits kept when quantizing inputs.
+                Default is 12.
+        """
+        self.maxsize = kwargs.get("maxsize", 4096)
+        self.digits = kwargs.get("digits", 12)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, fingerprint, *values):
+        """
+        Build a cache key from a fingerprint and numeric inputs.
+
+        Args:
+            fingerprint (tuple): Facility fingerprint.
+            *values (float): Inputs to quantize.
+
+        Returns:
+            tuple: Hashable key.
+        """
+        return (fingerprint,) + tuple(quantize(value, self.digits) for value in values)
+
+    def get(self, key):
+        """
+        Look up a result, marking it as most recently used.
+
+        Args:
+            key (tuple): Key from key().
+
+        Returns:
+            The stored result, or None on a miss.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a result, evicting the least recently used entry if full.
+
+        Args:
+            key (tuple): Key from key().
+            value: Result to store.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Report cache statistics.
+
+        Returns:
+            dict: "hits", "misses", "evictions", "size", "maxsize" and "hit_rate".
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -1,7 +1,8 @@
 import numpy as np
 import math
+from .cache import Fingerprinted
 
-class Connector:
+class Connector(Fingerprinted):
     """
     Base class for all connector types in the ethanol plant model.
     
@@ -9,6 +10,9 @@ class Connector:
     such as pipes, bends, and valves. Each connector can consume power due to
     friction and other flow resistance mechanisms.
     """
+    # Instrumentation hook (systems.profiling.Profiler), None when disabled
+    profiler = None
+
     def __init__(self, **kwargs):
         """
         Initialize a connector with configurable parameters.
@@ -44,6 +48,20 @@ class Connector:
         input_mass_flow = kwargs.get("input_mass_flow", 0)
         return input_mass_flow / input_volumetric_flow if input_volumetric_flow != 0 else 0
     
+    def lossFactor(self):
+        """
+        Fraction of the incoming kinetic power dissipated by the connector.
+        
+        Connectors whose loss is proportional to kinetic power (P_loss = ζ * (1/2) * m * v²)
+        override this to return ζ, which lets compiled facility plans evaluate them
+        in closed form: the output flow is then Q * (1 - ζ)^(1/3).
+        
+        Returns:
+            float or None: Dimensionless loss factor ζ, or None if the loss is not
+                proportional to kinetic power.
+        """
+        return None
+
     def processPower(self, **kwargs):
         """
         Calculate output kinetic power after accounting for power losses.
@@ -68,7 +86,7 @@ class Connector:
         This method:
         1. Calculates flow velocity from volumetric flow and cross-sectional area
         2. Computes input kinetic power using velocity and mass flow
-        3. Determines output power after losses using processPower()
+        3. Determines output power after losses
         4. Calculates resulting output volumetric flow rate
         
         Args:
@@ -78,22 +96,130 @@ class Connector:
         Returns:
             float: Output volumetric flow rate in m³/s after accounting for power losses.
         """
+        return self.evaluateFlow(**kwargs)[2]
+
+    def evaluateFlow(self, **kwargs):
+        """
+        Evaluate the connector's power loss and output flow in a single pass.
+        
+        Computes velocity, density and input kinetic power once and calls the
+        power loss function once, returning everything Facility needs for a
+        connector step. processFlow() is the output-flow-only view of this.
+        The loss function receives input_volumetric_flow, input_mass_flow and
+        input_power.
+        
+        Args:
+            input_volumetric_flow (float, optional): Input volumetric flow rate in m³/s. Default is 0.
+            input_mass_flow (float, optional): Input mass flow rate in kg/s. Default is 0.
+        
+        Returns:
+            tuple: (power_consumed, output_power, output_volumetric_flow)
+                - power_consumed (float): Power lost in the connector in Watts (0 without a loss function)
+                - output_power (float): Output kinetic power in Watts
+                - output_volumetric_flow (float): Output volumetric flow rate in m³/s
+        """
         input_volumetric_flow = kwargs.get("input_volumetric_flow", 0)
         input_mass_flow = kwargs.get("input_mass_flow", 0)
+        area = self.cross_sectional_area
         
         # Calculate flow velocity: Q = v * A, so v = Q / A
-        velocity = input_volumetric_flow / self.cross_sectional_area if self.cross_sectional_area != 0 else 0
+        velocity = input_volumetric_flow / area if area != 0 else 0
         
         # Calculate input kinetic power: P = (1/2) * m * v^2
         input_power = input_mass_flow * (velocity ** 2) / 2
-
-        # Determine output power after accounting for connector losses
-        output_power = self.processPower(input_power=input_power, **kwargs)
         
-        # Calculate output volumetric flow rate from output power
-        # Derived from kinetic power formula and continuity equation
-        output_volumetric_flow = (2 * output_power * self.cross_sectional_area**2 / self.processDensity(**kwargs)) ** (1 / 3) if self.processDensity(**kwargs) != 0 else 0
-        return output_volumetric_flow
+        power_consumed = self.powerConsumed(
+            input_volumetric_flow=input_volumetric_flow,
+            input_mass_flow=input_mass_flow,
+            input_power=input_power
+        ) if self.powerConsumed else 0
+        output_power = input_power - power_consumed
+        
+        # Output flow from kinetic power and continuity: Q = (2 * P * A² / ρ)^(1/3)
+        density = input_mass_flow / input_volumetric_flow if input_volumetric_flow != 0 else 0
+        output_volumetric_flow = (2 * output_power * area**2 / density) ** (1 / 3) if density != 0 else 0
+        return power_consumed, output_power, output_volumetric_flow
+
+    def processFlowBatch(self, **kwargs):
+        """
+        Vectorized counterpart of processFlow() for arrays of flow rates.
+
+        Args:
+            input_volumetric_flow (array-like): Input volumetric flow rates in m³/s.
+            input_mass_flow (array-like): Input mass flow rates in kg/s.
+
+        Returns:
+            numpy.ndarray: Output volumetric flow rates in m³/s.
+        """
+        return self.evaluateFlowBatch(**kwargs)[2]
+
+    def evaluateFlowBatch(self, **kwargs):
+        """
+        Vectorized counterpart of evaluateFlow() for arrays of flow rates.
+
+        Applies the same kinetic power balance element-wise. Samples with zero
+        volumetric flow (and therefore undefined density) produce zero output flow.
+        Samples whose losses exceed the available kinetic power have no real
+        output flow and are returned as NaN.
+
+        Args:
+            input_volumetric_flow (array-like): Input volumetric flow rates in m³/s.
+            input_mass_flow (array-like): Input mass flow rates in kg/s.
+
+        Returns:
+            tuple: (power_consumed, output_power, output_volumetric_flow) arrays, with the
+                same units as evaluateFlow().
+        """
+        input_volumetric_flow = np.asarray(kwargs.get("input_volumetric_flow", 0), dtype=float)
+        input_mass_flow = np.asarray(kwargs.get("input_mass_flow", 0), dtype=float)
+        area = self.cross_sectional_area
+
+        velocity = input_volumetric_flow / area if area != 0 else np.zeros_like(input_volumetric_flow)
+        input_power = input_mass_flow * (velocity ** 2) / 2
+        power_consumed = self.powerConsumed(
+            input_volumetric_flow=input_volumetric_flow,
+            input_mass_flow=input_mass_flow,
+            input_power=input_power
+        ) if self.powerConsumed else np.zeros_like(input_power)
+        output_power = input_power - power_consumed
+
+        has_flow = input_volumetric_flow != 0
+        density = input_mass_flow / np.where(has_flow, input_volumetric_flow, 1)
+        has_density = has_flow & (density != 0)
+        with np.errstate(invalid="ignore"):
+            output_volumetric_flow = np.where(
+                has_density,
+                (2 * output_power * area**2 / np.where(has_density, density, 1)) ** (1 / 3),
+                0
+            )
+        return power_consumed, output_power, output_volumetric_flow
+
+    def processFlowState(self, state):
+        """
+        Pass a FlowState through the connector.
+
+        Only the total volumetric flow changes; component amounts are carried
+        through unchanged.
+
+        Args:
+            state (FlowState): Input flow.
+
+        Returns:
+            tuple: (output_state, power_consumed)
+                - output_state (FlowState): Flow with the reduced total volumetric flow
+                - power_consumed (float): Power lost in the connector in Watts
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            mark = profiler.start()
+        power_consumed, _, output_volumetric_flow = self.evaluateFlow(
+            input_volumetric_flow=state.total_volumetric_flow,
+            input_mass_flow=state.total_mass_flow
+        )
+        state = state.with_total_volumetric_flow(output_volumetric_flow)
+        if profiler is not None:
+            profiler.lap(mark, self, "flow")
+        return state, power_consumed
 
 
 class Pipe(Connector):
@@ -138,6 +264,12 @@ class Pipe(Connector):
         # Darcy-Weisbach power loss formula
         return input_mass_flow * (8 * self.friction_factor * self.length * input_volumetric_flow**2) / (math.pi**2 * self.diameter**5)
 
+    def lossFactor(self):
+        """
+        Darcy-Weisbach loss factor ζ = f * L / D.
+        """
+        return self.friction_factor * self.length / self.diameter
+
 
 class Bend(Connector):
     """
@@ -178,8 +310,8 @@ class Bend(Connector):
         input_volumetric_flow = kwargs.get("input_volumetric_flow", 0)
         input_mass_flow = kwargs.get("input_mass_flow", 0)
 
-        # Return zero power loss if there is no flow
-        if input_volumetric_flow == 0 or input_mass_flow == 0:
+        # Return zero power loss if there is no flow (arrays fall through: zero flow already gives zero loss)
+        if np.ndim(input_volumetric_flow) == 0 and np.ndim(input_mass_flow) == 0 and (input_volumetric_flow == 0 or input_mass_flow == 0):
             return 0
 
         # Calculate flow velocity
@@ -187,6 +319,12 @@ class Bend(Connector):
         # Power loss based on kinetic energy and bend inefficiency
         return input_mass_flow * (1 - self.bend_factor) * (velocity ** 2) / 2
 
+    def lossFactor(self):
+        """
+        Bend loss factor ζ = 1 - bend_factor.
+        """
+        return 1 - self.bend_factor
+
 
 class Valve(Connector):
     """
@@ -229,4 +367,71 @@ class Valve(Connector):
         # Calculate flow velocity
         velocity = input_volumetric_flow / self.cross_sectional_area
         # Power loss based on resistance coefficient and kinetic energy
-        return input_mass_flow * (velocity ** 2) * self.resistance_coefficient / 2
\ No newline at end of file
+        return input_mass_flow * (velocity ** 2) * self.resistance_coefficient / 2
+
+    def lossFactor(self):
+        """
+        Valve loss factor ζ = K, the resistance coefficient.
+        """
+        return self.resistance_coefficient
+
+
+class ConnectorRun:
+    """
+    Consecutive connectors evaluated as one segment.
+
+    Connectors change only the total volumetric flow: component amounts, and so
+    the composition and total mass flow, pass through unchanged. A run carries
+    the flow state through all of its connectors in one call, passing just the
+    total flows to each connector's evaluateFlow() instead of building a state per
+    connector, so results are identical to passing the state through the
+    connectors one by one.
+    """
+
+    def __init__(self, connectors):
+        """
+        Group connectors into a run.
+
+        Args:
+            connectors (list): Connector instances in flow order.
+        """
+        self.connectors = list(connectors)
+        # Fixed connector costs, one per connector in order
+        self.costs = [connector.cost for connector in self.connectors]
+
+    def __len__(self):
+        """Number of connectors in the run."""
+        return len(self.connectors)
+
+    def processFlowState(self, state, power_consumed=0):
+        """
+        Pass a FlowState through every connector of the run.
+
+        Connectors with a profiler attached are passed through their own
+        processFlowState(), so they keep reporting per component.
+
+        Args:
+            state (FlowState): Input flow.
+            power_consumed (float, optional): Power already consumed upstream in Watts.
+                Each connector's loss is added to it in flow order. Default is 0.
+
+        Returns:
+            tuple: (output_state, power_consumed)
+                - output_state (FlowState): Flow with the reduced total volumetric flow
+                - power_consumed (float): The given power plus the run's losses in Watts
+        """
+        volumetric_flow = state.total_volumetric_flow
+        mass_flow = state.total_mass_flow
+        for connector in self.connectors:
+            if connector.profiler is not None:
+                state, connector_power_consumed = connector.processFlowState(
+                    state.with_total_volumetric_flow(volumetric_flow)
+                )
+                volumetric_flow = state.total_volumetric_flow
+            else:
+                connector_power_consumed, _, volumetric_flow = connector.evaluateFlow(
+                    input_volumetric_flow=volumetric_flow,
+                    input_mass_flow=mass_flow
+                )
+            power_consumed += connector_power_consumed
+        return state.with_total_volumetric_flow(volumetric_flow), power_consumed
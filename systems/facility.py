@@ -1,7 +1,16 @@
 from .process import Process
 from .processors import Fermentation, Distillation, Dehydration, Filtration
-from .connectors import Connector, Pipe, Valve, Bend
+from .connectors import Connector, ConnectorRun, Pipe, Valve, Bend
 from .pump import Pump
+from .plan import FacilityPlan
+from .transfer import TransferFunction
+from .flow import FlowState
+from .cache import EvaluationCache
+from .profiling import Profiler
+from .uncertainty import propagate_uncertainty
+import copy
+import itertools
+import numpy as np
 
 class Facility():
     """
@@ -12,6 +21,12 @@ class Facility():
     of flow throughout the facility.
     """
     ETHANOL_ENERGY_DENSITY = 28.818e6  # J/kg
+    COMPONENTS = ["ethanol", "water", "sugar", "fiber"]  # column order for batch inputs
+    GALLON_VOLUME = 3.78541e-3  # m³
+    SECONDS_PER_DAY = 86400
+    # Instrumentation hook (systems.profiling.Profiler), None when disabled
+    profiler = None
+
     def __init__(self, **kwargs):
         """
         Initialize a Facility with multiple process and connector components.
@@ -21,10 +36,17 @@ class Facility():
                 in the facility. Default is empty list.
             pump_performance_rating (float, optional): Pump head rating in meters.
                 Default is 0 m.
+            cache (EvaluationCache, optional): Cache for facility_process() results, which
+                may be shared between facilities. Default is None (no caching).
         """
         self.components = kwargs.get("components", [])
         self.pump = kwargs.get("pump", Pump())
         self.cost = sum(component.cost for component in self.components) + self.pump.cost
+        self.cache = kwargs.get("cache", None)
+        self._plan = None
+        self._transfer = None
+        self._validated = False
+        self._chain = None
 
     def add_component(self, component):
         """
@@ -35,6 +57,223 @@ class Facility():
         """
         self.components.append(component)
         self.cost += component.cost
+        self.invalidate()
+        if self.profiler is not None:
+            self._attach_profiler(self.profiler)
+
+    def invalidate(self):
+        """
+        Discard state derived from the component chain.
+        
+        Drops the compiled plan, the transfer function, the wiring check and the
+        connector runs so they are redone on next use. add_component() calls this
+        automatically; call it yourself after changing component parameters in place.
+        """
+        self._plan = None
+        self._transfer = None
+        self._validated = False
+        self._chain = None
+
+    def detach_logs(self):
+        """
+        Take the logs out of every process in the facility.
+        
+        Each process is left without log storage (see Process.detach_logs()), so
+        a facility can be reused for a new logged run while the previous run's
+        logs are kept, saved or handed elsewhere.
+        
+        Returns:
+            list: (process, logs) pairs for the processes that had allocated logs,
+                in component order.
+        """
+        return [
+            (component, component.detach_logs())
+            for component in self.components
+            if isinstance(component, Process) and component.logs_allocated
+        ]
+
+    def clear_logs(self):
+        """Discard the logs of every process in the facility and release their storage."""
+        for component in self.components:
+            if isinstance(component, Process):
+                component.clear_logs()
+
+    def validate(self):
+        """
+        Check the component wiring once, so evaluation can use trusted component paths.
+        
+        facility_process() calls this before evaluating; the check is kept until the
+        component chain changes (add_component() or invalidate()). Once it passes,
+        logged process steps skip the per-call argument checks and input copies of
+        Process.processVolumetricFlow() and Process.processMassFlow(); inputs are
+        still checked on every call when they are converted to a flow state.
+        Consecutive connectors are grouped into ConnectorRuns at the same time, so
+        each run is evaluated as one segment.
+        
+        Raises:
+            TypeError: If the pump is not a Pump or a component is neither a Process
+                nor a Connector.
+            ValueError: If a process does not use the components (ethanol, water,
+                sugar, fiber) in that order.
+        """
+        if self._validated:
+            return
+        if not isinstance(self.pump, Pump):
+            raise TypeError(f"Facility pump must be a Pump, not {type(self.pump).__name__}")
+        for component in self.components:
+            if isinstance(component, Process):
+                if list(component.components) != Facility.COMPONENTS:
+                    raise ValueError(f"{component.name} must use the components {Facility.COMPONENTS}")
+            elif not isinstance(component, Connector):
+                raise TypeError(f"Facility components must be Process or Connector instances, not {type(component).__name__}")
+        self._chain = []
+        for is_connector, group in itertools.groupby(self.components, key=lambda component: isinstance(component, Connector)):
+            self._chain.extend([ConnectorRun(group)] if is_connector else group)
+        self._validated = True
+
+    def compile(self):
+        """
+        Compile the component chain into a precomputed evaluation plan.
+        
+        The plan is built once and reused by facility_process_batch() until
+        invalidate() (called by add_component()) discards it.
+        
+        Returns:
+            FacilityPlan: The compiled plan.
+        """
+        if self._plan is None:
+            self._plan = FacilityPlan(self)
+        return self._plan
+
+    def transfer_function(self):
+        """
+        Derive the closed-form response of the facility.
+        
+        Reduces the pump and component chain to coefficients of input flow and
+        composition (see systems.transfer), so that ethanol output, power and cost
+        evaluate in microseconds. Derived once and reused until invalidate().
+        
+        Returns:
+            TransferFunction: The derived transfer function; evaluate(verify=True)
+                checks it against facility_process().
+        
+        Raises:
+            ValueError: If a component has no closed form.
+        """
+        if self._transfer is None:
+            self._transfer = TransferFunction(self)
+        return self._transfer
+
+    def response_table(self, **kwargs):
+        """
+        Tabulate the facility response for fast interpolated queries.
+        
+        Samples ethanol mass flow, total power consumed, total cost consumed and net
+        power gained on an adaptive grid over input flow and, optionally, a line of
+        feed compositions (see systems.surrogate). Queries outside the grid fall
+        back to simulation.
+        
+        Args:
+            **kwargs: build_response_table() options: input_volume_composition,
+                flow_range, composition_to, interval, rtol, initial_points, max_points.
+        
+        Returns:
+            ResponseTable: The table; save() persists it and ResponseTable.load()
+                reads it back for this configuration.
+        """
+        # Imported on use: the surrogate's storage helpers pull in sqlite3
+        from .surrogate import build_response_table
+        return build_response_table(self, **kwargs)
+
+    def fingerprint(self):
+        """
+        Get a stable, hashable fingerprint of the facility configuration.
+        
+        Covers the type and parameters (efficiencies, diameters, friction factors,
+        costs, ...) of the pump and every component, in order. Each component caches
+        its own fingerprint until one of its parameters is set, so in-place changes
+        are reflected without invalidate().
+        
+        Returns:
+            tuple: Hashable fingerprint.
+        
+        Raises:
+            ValueError: If a component has a callable parameter that cannot be fingerprinted.
+        """
+        return (self.pump.fingerprint(),) + tuple(component.fingerprint() for component in self.components)
+
+    def enable_cache(self, **kwargs):
+        """
+        Turn on memoization of facility_process() results.
+        
+        Results are keyed by fingerprint() plus quantized inputs and returned without
+        recomputation on repeat calls. Calls with store_data=True always run the
+        simulation so component logs stay complete.
+        
+        Args:
+            cache (EvaluationCache, optional): Existing cache to share. If omitted, a new
+                cache is created from the remaining arguments.
+            maxsize (int, optional): Maximum number of stored results. Default is 4096.
+            digits (int, optional): Significant digits kept when quantizing inputs.
+                Default is 12.
+        
+        Returns:
+            EvaluationCache: The cache in use, whose stats() reports hits and misses.
+        """
+        self.cache = kwargs.pop("cache", None) or EvaluationCache(**kwargs)
+        return self.cache
+
+    def disable_cache(self):
+        """
+        Turn off memoization of facility_process() results.
+        """
+        self.cache = None
+
+    def enable_profiling(self, **kwargs):
+        """
+        Turn on instrumentation of facility_process() and its components.
+        
+        Attaches one Profiler to the facility, its pump and every component, which
+        then record call counts, wall time and allocated blocks per component and
+        per phase (see systems.profiling). Connector losses are part of their
+        "flow" phase.
+        Components are labeled by position and name, e.g. "3:Pipe". Components
+        shared with other facilities report into the same profiler while attached.
+        
+        Args:
+            profiler (Profiler, optional): Existing profiler to attach. If omitted, a new
+                profiler is created from the remaining arguments.
+            track_allocations (bool, optional): Whether to record allocated block counts.
+                Default is True.
+        
+        Returns:
+            Profiler: The attached profiler, whose report() gives the statistics.
+        """
+        profiler = kwargs.pop("profiler", None) or Profiler(**kwargs)
+        self._attach_profiler(profiler)
+        return profiler
+
+    def disable_profiling(self):
+        """
+        Turn off instrumentation, detaching the profiler from the facility and its components.
+        
+        Returns:
+            Profiler or None: The detached profiler, if one was attached.
+        """
+        profiler = self.profiler
+        for owner in [self, self.pump] + self.components:
+            owner.__dict__.pop("profiler", None)
+        return profiler
+
+    def _attach_profiler(self, profiler):
+        """Attach a profiler to the facility, pump and components and register their labels."""
+        self.profiler = profiler
+        profiler.register(self, "Facility")
+        self.pump.profiler = profiler
+        profiler.register(self.pump, f"pump:{self.pump.name}")
+        for i, component in enumerate(self.components):
+            component.profiler = profiler
+            profiler.register(component, f"{i}:{getattr(component, 'name', None) or type(component).__name__}")
     
     def facility_process(self, **kwargs):
         """
@@ -69,87 +308,59 @@ class Facility():
         input_volume_composition = kwargs.get("input_volume_composition", {})
         input_total_volumetric_flow = kwargs.get("input_volumetric_flow", 0)
         interval = kwargs.get("interval", 1)
+        profiler = self.profiler
+        if profiler is not None:
+            start = mark = profiler.start()
+        self.validate()
+        
+        # Return a memoized result when caching is enabled and nothing needs logging
+        cache_key = None
+        if self.cache is not None and not store_data:
+            cache_key = self.cache.key(
+                (self.fingerprint(), tuple(input_volume_composition)),
+                input_total_volumetric_flow,
+                interval,
+                *input_volume_composition.values()
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                cached = copy.deepcopy(cached)
+                if profiler is not None:
+                    profiler.lap(mark, self, "cache")
+                    profiler.lap(start, self, "total")
+                return cached
         
         # Initialize power and cost consumption accumulators
         total_power_consumed = 0
         total_cost_consumed = 0
         
-        # Convert input volumetric composition to mass flow representation
-        mass_flow_output = Process.volumetricToMass(
-            inputs=input_volume_composition, 
-            mode="composition", 
-            total_flow=input_total_volumetric_flow,
-            output_type="full"
-        )
-        
-        # Initialize mass flow state: extract amounts and composition from conversion
-        total_mass_flow = sum(mass_flow_output["amount"].values())
-        current_mass_flow = {
-            "total_mass_flow": total_mass_flow,
-            "amount": mass_flow_output["amount"],
-            "composition": mass_flow_output["composition"]
-        }
-        
-        # Initialize volumetric flow state: preserve input structure
-        current_volumetric_flow = {
-            "total_volumetric_flow": input_total_volumetric_flow,
-            "amount": {component: input_total_volumetric_flow * frac 
-                      for component, frac in input_volume_composition.items()},
-            "composition": input_volume_composition
-        }
+        # Flow state: fixed-order component arrays for the input volumetric composition
+        state = FlowState.from_composition(input_volume_composition, input_total_volumetric_flow)
+        if profiler is not None:
+            mark = profiler.lap(mark, self, "convert")
         
         # Process material through pump first
-        pump_mass_flow, pump_volumetric_flow, pump_power_consumed = self.pump.pump_process(
-            input_volume_flow=current_volumetric_flow["total_volumetric_flow"],
-            input_composition=current_volumetric_flow["composition"]
-        )
+        state, pump_power_consumed = self.pump.pump_process_state(state)
         total_power_consumed += pump_power_consumed
+        if profiler is not None:
+            mark = profiler.start()
         
         # Add pump cost consumption
-        pump_cost_consumed = self.pump.cost * current_volumetric_flow["total_volumetric_flow"]
+        pump_cost_consumed = self.pump.cost * input_total_volumetric_flow
         total_cost_consumed += pump_cost_consumed
+        if profiler is not None:
+            profiler.lap(mark, self.pump, "cost")
         
-        # Update volumetric flow state with pump output
-        current_volumetric_flow["total_volumetric_flow"] = pump_volumetric_flow
-        current_volumetric_flow["amount"] = {
-            component: pump_volumetric_flow * frac 
-            for component, frac in current_volumetric_flow["composition"].items()
-        }
-        
-        # Convert pump output to mass representation
-        current_mass_flow = Process.volumetricToMass(
-            inputs=current_volumetric_flow["amount"],
-            mode="amount",
-            output_type="full"
-        )
-        current_mass_flow["total_mass_flow"] = sum(current_mass_flow["amount"].values())
+        if state.total_mass_flow <= 0:
+            raise ValueError("Total mass flow must be greater than zero to calculate composition")
         
-        # Process material through each component in sequence
-        for component in self.components:
+        # Process material through each process and connector run in sequence
+        for component in self._chain:
             if isinstance(component, Process):
-                # Pass through process unit and get volumetric output
-                current_volumetric_flow = component.processVolumetricFlow(
-                    inputs=current_volumetric_flow,
-                    input_type="full",
-                    output_type="full",
-                    store_inputs=store_data,
-                    store_outputs=store_data,
-                    store_cost=store_data
-                )
-                
-                # Ensure total_volumetric_flow is present in output
-                if "total_volumetric_flow" not in current_volumetric_flow:
-                    current_volumetric_flow["total_volumetric_flow"] = sum(
-                        current_volumetric_flow["amount"].values()
-                    )
-                
-                # Convert volumetric output to mass representation for next component
-                current_mass_flow = Process.volumetricToMass(
-                    inputs=current_volumetric_flow["amount"],
-                    mode="amount",
-                    output_type="full"
-                )
-                current_mass_flow["total_mass_flow"] = sum(current_mass_flow["amount"].values())
+                # Pass through process unit; the state reports output mass fractions
+                state = component.processFlowState(state, store_data=store_data, trusted=True)
+                if profiler is not None:
+                    mark = profiler.start()
                 
                 # Accumulate power consumption from process
                 process_power_consumed = component.processPowerConsumption(
@@ -157,55 +368,358 @@ class Facility():
                     interval=interval
                 )
                 total_power_consumed += process_power_consumed
+                if profiler is not None:
+                    mark = profiler.lap(mark, component, "power")
                 
                 # Accumulate cost consumption from process
-                process_cost_consumed = component.cost_per_flow * current_volumetric_flow["total_volumetric_flow"]
+                process_cost_consumed = component.cost_per_flow * state.total_volumetric_flow
                 total_cost_consumed += process_cost_consumed
+                if profiler is not None:
+                    profiler.lap(mark, component, "cost")
                 
-            elif isinstance(component, Connector):
-                # Get power consumed by connector
-                connector_power_consumed = component.powerConsumed(
-                    input_volumetric_flow=current_volumetric_flow["total_volumetric_flow"],
-                    input_mass_flow=current_mass_flow["total_mass_flow"]
-                ) if component.powerConsumed else 0
-                total_power_consumed += connector_power_consumed
-                
-                # Get cost consumed by connector (fixed cost per connector)
-                connector_cost_consumed = component.cost
-                total_cost_consumed += connector_cost_consumed
+            else:
+                # Update total flow through the run of connectors (pressure drops only:
+                # composition and mass flow are carried through unchanged)
+                state, total_power_consumed = component.processFlowState(state, total_power_consumed)
                 
-                # Update total flow through connector (accounts for pressure drop, etc.)
-                current_volumetric_flow["total_volumetric_flow"] = component.processFlow(
-                    input_volumetric_flow=current_volumetric_flow["total_volumetric_flow"],
-                    input_mass_flow=current_mass_flow["total_mass_flow"]
-                )
-                
-                # Convert current volumetric state to mass representation
-                current_mass_flow = Process.volumetricToMass(
-                    inputs=current_volumetric_flow["amount"],
-                    mode="amount",
-                    output_type="full"
-                )
-                current_mass_flow["total_mass_flow"] = sum(current_mass_flow["amount"].values())
-                
-                # Convert mass representation back to volumetric for consistency
-                volumetric_output = Process.massToVolumetric(
-                    inputs=current_mass_flow["amount"],
-                    mode="amount",
-                    output_type="full"
-                )
-                current_volumetric_flow["amount"] = volumetric_output["amount"]
-                current_volumetric_flow["composition"] = volumetric_output["composition"]
+                # Add the fixed cost of each connector; zero costs add nothing
+                for connector_cost_consumed in component.costs:
+                    if connector_cost_consumed != 0:
+                        total_cost_consumed += connector_cost_consumed
         
-        power_generated = (current_mass_flow["amount"].get("ethanol", 0) * 
-                            Facility.ETHANOL_ENERGY_DENSITY * interval)
+        if profiler is not None:
+            mark = profiler.start()
+        mass_flow = state.mass_flow_dict()
+        power_generated = mass_flow["amount"]["ethanol"] * Facility.ETHANOL_ENERGY_DENSITY * interval
         net_power_gained = power_generated - total_power_consumed
 
-        return {
-            "volumetric_flow": current_volumetric_flow,
-            "mass_flow": current_mass_flow,
+        result = {
+            "volumetric_flow": state.volumetric_flow_dict(),
+            "mass_flow": mass_flow,
             "total_power_consumed": total_power_consumed,
             "total_cost_consumed": total_cost_consumed,
             "power_generated": power_generated,
             "net_power_gained": net_power_gained
-        }
\ No newline at end of file
+        }
+        if cache_key is not None:
+            self.cache.put(cache_key, copy.deepcopy(result))
+        if profiler is not None:
+            profiler.lap(mark, self, "convert")
+            profiler.lap(start, self, "total")
+        return result
+
+    def facility_process_batch(self, **kwargs):
+        """
+        Process a batch of inputs through all facility components in one vectorized pass.
+
+        Array counterpart of facility_process(): every sample in the batch follows the
+        same pump → component sequence, but each step operates on whole NumPy arrays
+        instead of one scalar flow at a time. Nothing is logged.
+
+        Args:
+            input_volume_composition (array-like): Component volumetric fractions with
+                columns ordered (ethanol, water, sugar, fiber), shape (N, 4). A single
+                composition of shape (4,) is broadcast across the batch.
+            input_volumetric_flow (array-like): Total input volumetric flow rates in m³/s,
+                shape (N,).
+            interval (float, optional): Time interval in seconds for energy calculations.
+                Default is 1.
+
+        Returns:
+            dict: Same layout as facility_process(), with every value an array of shape (N,):
+                - "volumetric_flow" (dict): "total_volumetric_flow", "amount", "composition"
+                - "mass_flow" (dict): "total_mass_flow", "amount", "composition"
+                - "total_power_consumed", "total_cost_consumed", "power_generated",
+                  "net_power_gained"
+
+        Raises:
+            ValueError: If the composition does not have four columns or a step produces
+                a non-positive total flow.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            return self.compile().evaluate(**kwargs)
+        mark = profiler.start()
+        output = self.compile().evaluate(**kwargs)
+        profiler.lap(mark, self, "batch")
+        return output
+
+    def monte_carlo(self, **kwargs):
+        """
+        Propagate uncertainty in efficiencies, friction factors and feed by Monte Carlo.
+        
+        Draws per-sample process efficiencies, pump efficiency, pipe friction factors,
+        feed composition and flow, and evaluates all samples in one vectorized pass
+        through the component chain. The facility is not modified. See
+        systems.uncertainty.propagate_uncertainty() for the distribution formats.
+        
+        Args:
+            samples (int, optional): Number of samples. Default is 10000.
+            efficiencies (dict, optional): Process selector (position, component, name or
+                class name) → efficiency distribution, e.g. {"Fermentation": ("normal", 0.9, 0.02)}.
+            pump_efficiency (optional): Pump efficiency distribution.
+            friction_factors (dict, optional): Pipe selector → friction factor distribution.
+            input_volume_composition (dict, optional): Component → volumetric fraction
+                distribution or fixed value; samples are normalized to sum to 1.
+            input_volumetric_flow (optional): Input flow distribution in m³/s. Default is 0.01.
+            interval (float, optional): Time interval in seconds. Default is 1.
+            percentiles (list, optional): Percentiles to report. Default is [5, 25, 50, 75, 95].
+            seed (int, optional): Random seed. Default is None.
+            return_samples (bool, optional): Include per-sample values. Default is False.
+        
+        Returns:
+            dict: "sample_count", "valid_count", "degenerate_count", "percentiles" and
+                "metrics", with mean, std, min, max and percentile bands for
+                ethanol_mass_flow, net_power_gained, total_cost_consumed and
+                total_power_consumed.
+        """
+        return propagate_uncertainty(self, **kwargs)
+
+    def find_min_flow(self, **kwargs):
+        """
+        Solve for the minimum input flow that reaches a target ethanol output.
+        
+        Brackets the threshold with a single vectorized pass over a geometric grid of
+        flows, then refines it with Illinois (modified regula falsi) iteration. Ethanol
+        output is assumed to increase monotonically with input flow, which holds for
+        the built-in processors; for them the output is proportional to flow and the
+        first regula falsi step lands on the threshold.
+        
+        Args:
+            target_ethanol_mass_flow (float): Target ethanol output in kg/s.
+            target_gallons_per_day (float): Target ethanol output in gallons/day.
+                Exactly one of the two targets must be given.
+            input_volume_composition (dict, optional): Component volumetric fractions of
+                the feed. Default is 60% water, 20% sugar, 20% fiber.
+            tolerance (float, optional): Width of the final bracket in m³/s. Default is 1e-9.
+            max_flow (float, optional): Largest input flow considered in m³/s. Default is 10.
+            max_iterations (int, optional): Maximum refinement iterations. Default is 100.
+        
+        Returns:
+            float or None: Smallest input flow in m³/s (within tolerance) whose ethanol
+                output meets the target, or None if max_flow does not reach it.
+        
+        Raises:
+            ValueError: If neither or both targets are given.
+        """
+        target = kwargs.get("target_ethanol_mass_flow", None)
+        target_gallons_per_day = kwargs.get("target_gallons_per_day", None)
+        composition = kwargs.get("input_volume_composition", {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2})
+        tolerance = kwargs.get("tolerance", 1e-9)
+        max_flow = kwargs.get("max_flow", 10)
+        max_iterations = kwargs.get("max_iterations", 100)
+        
+        if (target is None) == (target_gallons_per_day is None):
+            raise ValueError("Provide exactly one of target_ethanol_mass_flow or target_gallons_per_day")
+        if target is None:
+            target = (target_gallons_per_day * Facility.GALLON_VOLUME * Process.DENSITY_ETHANOL /
+                      Facility.SECONDS_PER_DAY)
+        composition = [composition.get(component, 0) for component in Facility.COMPONENTS]
+        
+        def ethanol_shortfall(flows):
+            output = self.facility_process_batch(input_volume_composition=composition, input_volumetric_flow=flows)
+            return output["mass_flow"]["amount"]["ethanol"] - target
+        
+        # Bracket the threshold: grid spans max_flow * 2^-40 to max_flow
+        grid = max_flow * 2.0 ** np.arange(-40, 1)
+        shortfall = ethanol_shortfall(grid)
+        reached = np.nonzero(shortfall >= 0)[0]
+        if len(reached) == 0:
+            return None
+        i = reached[0]
+        high, f_high = grid[i], shortfall[i]
+        # No flow produces no ethanol
+        low, f_low = (grid[i - 1], shortfall[i - 1]) if i > 0 else (0.0, -target)
+        
+        side = 0
+        for _ in range(max_iterations):
+            if high - low <= tolerance or f_high == 0:
+                break
+            flow = high - f_high * (high - low) / (f_high - f_low)
+            if not low < flow < high:
+                flow = (low + high) / 2
+            f_flow = ethanol_shortfall(flow)[0]
+            if f_flow >= 0:
+                high, f_high = flow, f_flow
+                if side == 1:
+                    f_low /= 2
+                side = 1
+            else:
+                low, f_low = flow, f_flow
+                if side == -1:
+                    f_high /= 2
+                side = -1
+        
+        return float(high)
+
+    def facility_process_stream(self, records, **kwargs):
+        """
+        Drive the facility with a stream of time-series records, yielding results lazily.
+        
+        Records are pulled from the iterator in fixed-size chunks, each chunk is
+        evaluated in one vectorized pass through the compiled plan, and per-record
+        results are yielded with running energy, cost and ethanol totals. Memory use
+        is bounded by chunk_size regardless of how long the stream is.
+        
+        Each record covers the time since the previous record's timestamp. The first
+        record covers the default interval.
+        
+        Args:
+            records (iterable): (timestamp, volumetric_flow, composition) tuples, where
+                timestamp is seconds (float) or a datetime, volumetric_flow is in m³/s and
+                composition is a dict of volumetric fractions or a (ethanol, water, sugar,
+                fiber) sequence.
+            chunk_size (int, optional): Records evaluated per vectorized pass. Default is 1024.
+            interval (float, optional): Interval in seconds for the first record. Default is 1.
+            cost_period (float, optional): Period in seconds over which total_cost_consumed
+                is incurred, used to prorate cost per record. Default is 86400 (the analysis
+                notebook treats total_cost_consumed as a daily cost).
+        
+        Yields:
+            dict: Per-record results with keys:
+                - "timestamp", "interval" (s)
+                - "ethanol_mass_flow" (kg/s), "total_power_consumed" (W),
+                  "total_cost_consumed" (USD), "power_generated" (J), "net_power_gained" (J)
+                - "energy_consumed" (J) and "cost_incurred" (USD) for this record
+                - "cumulative_energy_consumed", "cumulative_energy_generated" (J),
+                  "cumulative_cost" (USD), "cumulative_ethanol_mass" (kg)
+        
+        Raises:
+            ValueError: If a record has non-positive flow or a malformed composition.
+        """
+        chunk_size = kwargs.get("chunk_size", 1024)
+        first_interval = kwargs.get("interval", 1)
+        cost_period = kwargs.get("cost_period", Facility.SECONDS_PER_DAY)
+        
+        records = iter(records)
+        previous_timestamp = None
+        totals = [0.0, 0.0, 0.0, 0.0]
+        
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                return
+            
+            timestamps = [record[0] for record in chunk]
+            flows = np.array([record[1] for record in chunk], dtype=float)
+            compositions = np.array([
+                [record[2].get(component, 0) for component in Facility.COMPONENTS]
+                if isinstance(record[2], dict) else record[2]
+                for record in chunk
+            ], dtype=float)
+            
+            intervals = np.empty(len(chunk))
+            for i, timestamp in enumerate(timestamps):
+                if previous_timestamp is None:
+                    intervals[i] = first_interval
+                else:
+                    elapsed = timestamp - previous_timestamp
+                    intervals[i] = elapsed.total_seconds() if hasattr(elapsed, "total_seconds") else elapsed
+                previous_timestamp = timestamp
+            
+            results = self._stream_chunk(flows, compositions, intervals, cost_period, totals)
+            names = ["timestamp"] + list(results)
+            for row in zip(timestamps, *(values.tolist() for values in results.values())):
+                yield dict(zip(names, row))
+
+    def facility_process_series(self, series, **kwargs):
+        """
+        Drive the facility with a columnar time series, yielding results chunk by chunk.
+        
+        Columnar counterpart of facility_process_stream() for data that is already
+        in arrays, such as a memory-mapped systems.timeseries.TimeSeries: slices of
+        the series' arrays go straight into the compiled plan without building
+        per-record tuples, and results come back as arrays.
+        
+        Args:
+            series: Object with equal-length timestamps (float seconds or datetime64),
+                volumetric_flow (m³/s) and composition ((N, 4) volumetric fractions)
+                arrays, e.g. a TimeSeries.
+            chunk_size (int, optional): Records evaluated per vectorized pass. Default is 65536.
+            start (int, optional): First record. Default is 0.
+            stop (int, optional): End record (exclusive). Default is the end of the series.
+            interval (float, optional): Interval in seconds for the first record. Default is 1.
+            cost_period (float, optional): Period in seconds over which total_cost_consumed
+                is incurred. Default is 86400.
+        
+        Yields:
+            dict: Per-chunk results with the keys of facility_process_stream(), each an
+                array over the chunk's records; "timestamp" is a view of the series.
+        
+        Raises:
+            ValueError: If a record has non-positive flow.
+        """
+        chunk_size = kwargs.get("chunk_size", 65536)
+        start = kwargs.get("start", 0)
+        stop = kwargs.get("stop", None)
+        first_interval = kwargs.get("interval", 1)
+        cost_period = kwargs.get("cost_period", Facility.SECONDS_PER_DAY)
+        stop = len(series.volumetric_flow) if stop is None else stop
+        
+        totals = [0.0, 0.0, 0.0, 0.0]
+        previous_timestamp = None
+        for begin in range(start, stop, chunk_size):
+            end = min(begin + chunk_size, stop)
+            timestamps = series.timestamps[begin:end]
+            
+            # Elapsed time since the previous record, in seconds
+            edges = timestamps if previous_timestamp is None else np.concatenate(([previous_timestamp], timestamps))
+            elapsed = np.diff(edges)
+            if elapsed.dtype.kind == "m":
+                elapsed = elapsed.astype("timedelta64[ns]").astype(np.int64) / 1e9
+            intervals = elapsed if previous_timestamp is not None else np.concatenate(([first_interval], elapsed))
+            previous_timestamp = timestamps[-1]
+            
+            results = self._stream_chunk(
+                series.volumetric_flow[begin:end], series.composition[begin:end], intervals, cost_period, totals
+            )
+            yield dict(timestamp=timestamps, **results)
+
+    def _stream_chunk(self, flows, compositions, intervals, cost_period, totals):
+        """
+        Evaluate one chunk of a time series and advance the running totals.
+        
+        Args:
+            flows (numpy.ndarray): Input flows in m³/s, shape (N,).
+            compositions (numpy.ndarray): Volumetric fractions, shape (N, 4).
+            intervals (numpy.ndarray): Seconds covered by each record, shape (N,).
+            cost_period (float): Period in seconds over which total_cost_consumed is incurred.
+            totals (list): Cumulative energy consumed, energy generated, cost and ethanol
+                mass before the chunk; updated in place.
+        
+        Returns:
+            dict: Per-record result arrays, keyed as in facility_process_stream().
+        """
+        output = self.compile().evaluate(
+            input_volumetric_flow=flows,
+            input_volume_composition=compositions,
+            interval=1
+        )
+        ethanol_mass_flow = output["mass_flow"]["amount"]["ethanol"]
+        total_power_consumed = output["total_power_consumed"]
+        total_cost_consumed = output["total_cost_consumed"]
+        power_generated = output["power_generated"] * intervals
+        net_power_gained = power_generated - total_power_consumed
+        energy_consumed = total_power_consumed * intervals
+        cost_incurred = total_cost_consumed * intervals / cost_period
+        
+        running_energy_consumed = totals[0] + np.cumsum(energy_consumed)
+        running_energy_generated = totals[1] + np.cumsum(power_generated)
+        running_cost = totals[2] + np.cumsum(cost_incurred)
+        running_ethanol_mass = totals[3] + np.cumsum(ethanol_mass_flow * intervals)
+        totals[:] = [running_energy_consumed[-1], running_energy_generated[-1], running_cost[-1], running_ethanol_mass[-1]]
+        
+        return {
+            "interval": intervals,
+            "ethanol_mass_flow": ethanol_mass_flow,
+            "total_power_consumed": total_power_consumed,
+            "total_cost_consumed": total_cost_consumed,
+            "power_generated": power_generated,
+            "net_power_gained": net_power_gained,
+            "energy_consumed": energy_consumed,
+            "cost_incurred": cost_incurred,
+            "cumulative_energy_consumed": running_energy_consumed,
+            "cumulative_energy_generated": running_energy_generated,
+            "cumulative_cost": running_cost,
+            "cumulative_ethanol_mass": running_ethanol_mass
+        }
@@ -0,0 +1,208 @@
+from .process import Process
+import numpy as np
+
+
+# Component densities (kg/m³) in (ethanol, water, sugar, fiber) order
+COMPONENTS = ["ethanol", "water", "sugar", "fiber"]
+DENSITIES = np.array([
+    Process.DENSITY_ETHANOL,
+    Process.DENSITY_WATER,
+    Process.DENSITY_SUGAR,
+    Process.DENSITY_FIBER
+], dtype=float)
+
+
+def component_vector(values):
+    """
+    Convert a component dict to a fixed-order array.
+
+    Args:
+        values (dict): Values keyed by component name. Missing components are zero.
+
+    Returns:
+        numpy.ndarray: Values ordered (ethanol, water, sugar, fiber).
+
+    Raises:
+        ValueError: For unknown components.
+    """
+    for component in values:
+        if component not in COMPONENTS:
+            raise ValueError(f"Unknown component: {component}")
+    return np.array([values.get(component, 0) for component in COMPONENTS], dtype=float)
+
+
+class FlowState:
+    """
+    Compact flow state for the four plant components.
+
+    Holds component flows as fixed-order (ethanol, water, sugar, fiber) arrays
+    instead of nested dicts keyed by name, with the mass representation derived
+    from the volumetric one by a single multiply with the density vector. The
+    last axis indexes components, so the same type carries one flow (shape (4,))
+    or a batch of flows (shape (N, 4)).
+
+    total_volumetric_flow is stored separately from the component amounts: a
+    connector changes the total flow without changing the amounts, as in
+    Facility.facility_process(). composition is the fraction vector reported
+    alongside the volumetric flow (volume fractions unless a step sets it, e.g.
+    mass fractions after a process).
+    """
+    __slots__ = ("volumetric_amounts", "mass_amounts", "total_volumetric_flow", "total_mass_flow", "_composition")
+
+    def __init__(self, volumetric_amounts, **kwargs):
+        """
+        Initialize a flow state from component volumetric flows.
+
+        Args:
+            volumetric_amounts (array-like): Component volumetric flows in m³/s, shape (4,)
+                or (N, 4).
+            total_volumetric_flow (float or array, optional): Total volumetric flow in m³/s.
+                Default is the sum of the component flows.
+            composition (array-like, optional): Reported component fractions. Default is
+                the volume fractions of the component flows.
+            mass_amounts (array-like, optional): Precomputed component mass flows in kg/s.
+                Default is volumetric_amounts times the component densities.
+        """
+        self.volumetric_amounts = np.asarray(volumetric_amounts, dtype=float)
+        mass_amounts = kwargs.get("mass_amounts", None)
+        self.mass_amounts = self.volumetric_amounts * DENSITIES if mass_amounts is None else mass_amounts
+        self.total_mass_flow = self._total(self.mass_amounts)
+        total_volumetric_flow = kwargs.get("total_volumetric_flow", None)
+        self.total_volumetric_flow = self._total(self.volumetric_amounts) if total_volumetric_flow is None else total_volumetric_flow
+        composition = kwargs.get("composition", None)
+        self._composition = None if composition is None else np.asarray(composition, dtype=float)
+
+    @staticmethod
+    def _total(amounts):
+        """Sum component flows, as a Python float for a single flow."""
+        return float(sum(amounts.tolist())) if amounts.ndim == 1 else amounts.sum(axis=-1)
+
+    @classmethod
+    def from_composition(cls, composition, total_volumetric_flow):
+        """
+        Build a flow state from volumetric fractions and a total flow.
+
+        Args:
+            composition (dict or array-like): Component volumetric fractions, as a dict
+                keyed by component or an array with components on the last axis.
+            total_volumetric_flow (float or array): Total volumetric flow in m³/s.
+
+        Returns:
+            FlowState: State with amounts total_volumetric_flow × composition, reporting
+                the given composition.
+
+        Raises:
+            ValueError: For unknown components.
+        """
+        composition = component_vector(composition) if isinstance(composition, dict) else np.asarray(composition, dtype=float)
+        amounts = np.asarray(total_volumetric_flow, dtype=float)[..., None] * composition
+        return cls(amounts, total_volumetric_flow=total_volumetric_flow, composition=composition)
+
+    @classmethod
+    def from_mass(cls, mass_amounts, **kwargs):
+        """
+        Build a flow state from component mass flows.
+
+        Args:
+            mass_amounts (array-like): Component mass flows in kg/s, shape (4,) or (N, 4).
+            composition (array-like, optional): Reported component fractions. Default is
+                the volume fractions of the resulting flows.
+
+        Returns:
+            FlowState: State with volumetric amounts mass_amounts / densities.
+        """
+        mass_amounts = np.asarray(mass_amounts, dtype=float)
+        return cls(mass_amounts / DENSITIES, mass_amounts=mass_amounts, composition=kwargs.get("composition", None))
+
+    def with_total_volumetric_flow(self, total_volumetric_flow):
+        """
+        Get a state with a new total flow and unchanged component amounts.
+
+        Used for connectors, whose pressure losses change only the total flow. The
+        component arrays are shared, not copied; the reported composition becomes
+        the volume fractions of the amounts.
+
+        Args:
+            total_volumetric_flow (float or array): New total volumetric flow in m³/s.
+
+        Returns:
+            FlowState: The updated state.
+        """
+        state = FlowState.__new__(FlowState)
+        state.volumetric_amounts = self.volumetric_amounts
+        state.mass_amounts = self.mass_amounts
+        state.total_mass_flow = self.total_mass_flow
+        state.total_volumetric_flow = total_volumetric_flow
+        state._composition = None
+        return state
+
+    @property
+    def composition(self):
+        """Reported component fractions (volume fractions unless set explicitly)."""
+        if self._composition is None:
+            self._composition = self.volumetric_amounts / self._total(self.volumetric_amounts) if self.volumetric_amounts.ndim == 1 else (
+                self.volumetric_amounts / self.volumetric_amounts.sum(axis=-1)[..., None]
+            )
+        return self._composition
+
+    @property
+    def mass_composition(self):
+        """
+        Component mass fractions.
+
+        Raises:
+            ValueError: If the total mass flow is not positive.
+        """
+        if np.any(np.asarray(self.total_mass_flow) <= 0):
+            raise ValueError("Total mass flow must be greater than zero to calculate composition")
+        return self.mass_amounts / np.asarray(self.total_mass_flow)[..., None]
+
+    def density(self):
+        """
+        Bulk density implied by the reported composition.
+
+        Returns:
+            float or numpy.ndarray: Density in kg/m³.
+        """
+        density = self.composition @ DENSITIES
+        return float(density) if np.ndim(density) == 0 else density
+
+    @staticmethod
+    def _as_dict(values):
+        """Component dict from a fixed-order array."""
+        if values.ndim == 1:
+            return dict(zip(COMPONENTS, values.tolist()))
+        return {component: values[..., i] for i, component in enumerate(COMPONENTS)}
+
+    def volumetric_flow_dict(self):
+        """
+        Volumetric flow in the nested-dict layout used by Facility.facility_process().
+
+        Returns:
+            dict: "total_volumetric_flow", "amount" (m³/s) and "composition".
+        """
+        return {
+            "total_volumetric_flow": self.total_volumetric_flow,
+            "amount": self._as_dict(self.volumetric_amounts),
+            "composition": self._as_dict(np.asarray(self.composition, dtype=float))
+        }
+
+    def mass_flow_dict(self):
+        """
+        Mass flow in the nested-dict layout used by Facility.facility_process().
+
+        Returns:
+            dict: "total_mass_flow", "amount" (kg/s) and "composition".
+
+        Raises:
+            ValueError: If the total mass flow is not positive.
+        """
+        return {
+            "total_mass_flow": self.total_mass_flow,
+            "amount": self._as_dict(self.mass_amounts),
+            "composition": self._as_dict(self.mass_composition)
+        }
+
+    def __repr__(self):
+        return (f"FlowState(volumetric_amounts={self.volumetric_amounts!r}, "
+                f"total_volumetric_flow={self.total_volumetric_flow!r})")
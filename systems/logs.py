@@ -0,0 +1,176 @@
+import numpy as np
+
+
+class ArrayLog:
+    """
+    Preallocated, fixed-dtype NumPy column used as a compact log backend.
+
+    Supports the list operations the logging code relies on (append, extend,
+    len, indexing, iteration), so it can replace the Python lists inside
+    Process.input_log, output_log and consumption_log without changing the
+    code that writes to them. Values are stored in a single contiguous buffer
+    and exposed to analysis code through view().
+
+    When the buffer is full, the overflow policy decides what happens:
+    - 'grow': capacity doubles (amortized O(1) appends, nothing is lost)
+    - 'wrap': ring buffer, the oldest entries are overwritten
+    - 'drop': new entries are discarded
+    """
+    OVERFLOW_POLICIES = ["grow", "wrap", "drop"]
+
+    def __init__(self, **kwargs):
+        """
+        Initialize an empty log column.
+
+        Args:
+            capacity (int, optional): Number of entries to preallocate. Default is 1024.
+            dtype (numpy dtype, optional): Element type. Default is float64.
+            overflow (str, optional): 'grow', 'wrap' or 'drop'. Default is 'grow'.
+
+        Raises:
+            ValueError: For an unknown overflow policy or a non-positive capacity.
+        """
+        capacity = kwargs.get("capacity", 1024)
+        self.overflow = kwargs.get("overflow", "grow")
+
+        if self.overflow not in ArrayLog.OVERFLOW_POLICIES:
+            raise ValueError("overflow must be either 'grow', 'wrap', or 'drop'")
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than zero")
+
+        self.buffer = np.empty(capacity, dtype=kwargs.get("dtype", np.float64))
+        self.size = 0
+        self.start = 0
+        self.dropped = 0
+
+    @property
+    def capacity(self):
+        """Number of entries the buffer can hold before overflowing."""
+        return len(self.buffer)
+
+    def append(self, value):
+        """
+        Append one value, applying the overflow policy if the buffer is full.
+
+        Args:
+            value: Value convertible to the log dtype.
+        """
+        if self.size == len(self.buffer):
+            if self.overflow == "grow":
+                self.buffer = np.concatenate([self.buffer, np.empty_like(self.buffer)])
+            elif self.overflow == "wrap":
+                self.buffer[self.start] = value
+                self.start = (self.start + 1) % len(self.buffer)
+                self.dropped += 1
+                return
+            else:
+                self.dropped += 1
+                return
+        self.buffer[(self.start + self.size) % len(self.buffer)] = value
+        self.size += 1
+
+    def extend(self, values):
+        """
+        Append every value from an iterable or array.
+
+        Args:
+            values (iterable): Values convertible to the log dtype.
+        """
+        values = np.asarray(values, dtype=self.buffer.dtype).ravel()
+        if self.overflow == "grow" and self.start == 0:
+            needed = self.size + len(values)
+            if needed > len(self.buffer):
+                grown = np.empty(max(needed, 2 * len(self.buffer)), dtype=self.buffer.dtype)
+                grown[:self.size] = self.buffer[:self.size]
+                self.buffer = grown
+            self.buffer[self.size:needed] = values
+            self.size = needed
+            return
+        for value in values:
+            self.append(value)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def view(self):
+        """
+        Get the logged values in chronological order.
+
+        Returns:
+            numpy.ndarray: A zero-copy view of the buffer, except for a ring buffer
+                that has wrapped around, which returns a chronological copy.
+        """
+        end = self.start + self.size
+        if end <= len(self.buffer):
+            return self.buffer[self.start:end]
+        return np.concatenate([self.buffer[self.start:], self.buffer[:end - len(self.buffer)]])
+
+    def tolist(self):
+        """Logged values as a Python list."""
+        return self.view().tolist()
+
+    def clear(self):
+        """Discard all entries, keeping the allocated capacity."""
+        self.size = 0
+        self.start = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.view(), dtype=dtype)
+
+    def __repr__(self):
+        return f"ArrayLog({self.tolist()!r}, overflow={self.overflow!r})"
+
+
+def build_flow_log(column):
+    """
+    Build a mass/volumetric flow log with the layout of Process.input_log.
+
+    Args:
+        column (callable): Factory returning an empty column (list or ArrayLog).
+
+    Returns:
+        dict: Nested log dict with fresh columns.
+    """
+    components = ["ethanol", "water", "sugar", "fiber"]
+    return {
+        "mass_flow": {
+            "total_mass_flow": column(),
+            "amount": {component: column() for component in components},
+            "composition": {component: column() for component in components}
+        },
+        "volumetric_flow": {
+            "total_volumetric_flow": column(),
+            "amount": {component: column() for component in components},
+            "composition": {component: column() for component in components}
+        },
+    }
+
+
+def build_consumption_log(column):
+    """
+    Build a consumption log with the layout of Process.consumption_log.
+
+    Args:
+        column (callable): Factory returning an empty column (list or ArrayLog).
+
+    Returns:
+        dict: Log dict with fresh columns.
+    """
+    return {
+        "power_consumption_rate": column(),
+        "energy_consumed": column(),
+        "interval": column(),
+        "cost_per_unit_flow": column(),
+        "cost_incurred": column()
+    }
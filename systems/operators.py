@@ -0,0 +1,141 @@
+"""
+Process mass flow transforms as operators on component vectors.
+
+A process's massFlowFunction maps a dict of component mass flows to a dict of
+output mass flows. Where the transform has a closed form it is also available
+as an operator on (ethanol, water, sugar, fiber) arrays, from
+Process.massFlowOperator():
+
+- LinearOperator: a 4×4 matrix (or a stack of them for sampled parameters);
+  consecutive linear operators fuse into a single matrix
+- KernelOperator: a vectorized nonlinear function, flagged with linear = False
+
+Operators apply to a single vector of shape (4,) or a batch of shape (N, 4).
+"""
+import numpy as np
+
+
+class LinearOperator:
+    """Linear mass flow transform, output_mass = matrix @ input_mass."""
+    linear = True
+
+    def __init__(self, matrix):
+        """
+        Args:
+            matrix (array-like): Transform matrix, shape (4, 4), or (N, 4, 4) for
+                per-sample parameters.
+        """
+        self.matrix = np.asarray(matrix, dtype=float)
+
+    def apply(self, mass):
+        """
+        Apply the transform.
+
+        Args:
+            mass (array-like): Mass flows, shape (4,) or (N, 4).
+
+        Returns:
+            numpy.ndarray: Output mass flows.
+        """
+        mass = np.asarray(mass, dtype=float)
+        if self.matrix.ndim == 2:
+            return mass @ self.matrix.T
+        return np.matmul(self.matrix, mass[..., None])[..., 0]
+
+    def then(self, other):
+        """
+        Compose with a linear operator applied afterwards.
+
+        Args:
+            other (LinearOperator): Transform applied to this one's output.
+
+        Returns:
+            LinearOperator: The fused transform.
+        """
+        return LinearOperator(np.matmul(other.matrix, self.matrix))
+
+
+class KernelOperator:
+    """Nonlinear mass flow transform given by a vectorized function."""
+    linear = False
+
+    def __init__(self, kernel):
+        """
+        Args:
+            kernel (callable): Function mapping mass flows of shape (..., 4) to
+                output mass flows of the same shape.
+        """
+        self.kernel = kernel
+
+    def apply(self, mass):
+        """
+        Apply the transform.
+
+        Args:
+            mass (array-like): Mass flows, shape (4,) or (N, 4).
+
+        Returns:
+            numpy.ndarray: Output mass flows.
+        """
+        return self.kernel(np.asarray(mass, dtype=float))
+
+
+def fuse(operators):
+    """
+    Merge consecutive linear operators of a chain.
+
+    Args:
+        operators (list): Operators in application order.
+
+    Returns:
+        list: Equivalent chain in which no two linear operators are adjacent.
+    """
+    fused = []
+    for operator in operators:
+        if operator.linear and fused and fused[-1].linear:
+            fused[-1] = fused[-1].then(operator)
+        else:
+            fused.append(operator)
+    return fused
+
+
+def chain_operator(processes):
+    """
+    Fused operator chain of a sequence of processes.
+
+    Only the mass flow transforms are chained; process power, cost and the
+    flow losses of any connectors in between are not represented.
+
+    Args:
+        processes (list): Process instances in flow order.
+
+    Returns:
+        list: Fused operators; apply them in order, e.g. with apply_chain().
+
+    Raises:
+        ValueError: If a process has no operator form (custom massFlowFunction).
+    """
+    operators = []
+    for process in processes:
+        operator = process.massFlowOperator()
+        if operator is None:
+            raise ValueError(f"{process.name} has no operator form; use its massFlowFunction")
+        operators.append(operator)
+    return fuse(operators)
+
+
+def apply_chain(operators, mass):
+    """
+    Apply a chain of operators.
+
+    Args:
+        operators (list): Operators in application order.
+        mass (array-like): Mass flows, shape (4,) or (N, 4).
+
+    Returns:
+        numpy.ndarray: Output mass flows.
+    """
+    mass = np.asarray(mass, dtype=float)
+    for operator in operators:
+        mass = operator.apply(mass)
+    return mass
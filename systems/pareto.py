@@ -0,0 +1,393 @@
+"""
+Multi-objective design search over the Pareto front.
+
+The notebook evaluates every configuration of the design space and ranks them
+with a fixed weighting of four objectives. ParetoSearch instead computes the
+set of configurations that no other configuration beats on every objective at
+once, which contains the best configuration under any non-negative weighting:
+
+- "facility_cost": build cost, Facility.cost (USD, lower is better)
+- "daily_cost": operating cost, total_cost_consumed at the reference flow
+  (USD, lower is better)
+- "energy_return": energy generated over energy consumed during the interval
+  (higher is better)
+- "threshold_flow": input flow needed to reach the ethanol target (m³/s, lower
+  is better; inf if no ethanol is produced). Ethanol output is proportional to
+  input flow, so this is the reference flow scaled to the target, which is
+  what Facility.find_min_flow() converges to without the root finding
+
+The design space is searched as a tree that fixes the pump and then each
+processor in flow order. Every partial configuration gets optimistic bounds on
+the four objectives, and its subtree is skipped as soon as a configuration
+already on the front dominates those bounds. The bounds are exact for the
+fixed part of the chain (component flows do not depend on connectors) and
+optimistic for the rest:
+
+- build cost is additive, so unfixed slots contribute their cheapest option
+- processor power does not depend on flow, so unfixed slots contribute their
+  lowest power; connector losses are bounded below by zero
+- ethanol output is capped by sending the flow through the most efficient
+  option of every unfixed slot, which assumes ethanol output does not decrease
+  as any efficiency increases
+- downstream processors carry at least the ethanol already produced, which
+  bounds their flow-proportional cost from below
+- the ethanol cap also bounds the threshold flow
+
+These assumptions, and the proportionality of ethanol output to input flow,
+hold for the built-in processors and the layout of
+build_standard_facility(): the pump followed by the processors in slot order,
+with only connectors between them. Pass prune=False to evaluate exhaustively.
+"""
+import math
+import numpy as np
+from .facility import Facility
+from .process import Process
+from .flow import FlowState
+from .sweep import DesignSweep
+from .uncertainty import with_parameters
+
+
+OBJECTIVES = ["facility_cost", "daily_cost", "energy_return", "threshold_flow"]
+MAXIMIZED = {"energy_return"}
+# Default weights of the notebook's decision matrix
+WEIGHTS = {"facility_cost": 3, "daily_cost": 5, "energy_return": 4, "threshold_flow": 2}
+# The notebook normalizes threshold flows over a fixed range (m³/s)
+THRESHOLD_RANGE = (0.005, 0.08)
+JOULES_PER_KWH = 3.6e6
+
+
+def energy_return(power_generated, total_power_consumed, interval):
+    """
+    Ratio of energy generated to energy consumed, as computed by the notebook.
+
+    Args:
+        power_generated (float): Energy generated over the interval in Joules.
+        total_power_consumed (float): Power consumed in Watts.
+        interval (float): Time interval in seconds.
+
+    Returns:
+        float: Generated over consumed energy, with consumption floored at 0.001 kWh.
+    """
+    consumed = total_power_consumed * interval / JOULES_PER_KWH
+    return (power_generated / JOULES_PER_KWH) / max(consumed, 0.001)
+
+
+def minimization_form(values, objectives=OBJECTIVES):
+    """
+    Convert objective values so that lower is better for every objective.
+
+    Args:
+        values (array-like): Objective values, shape (..., len(objectives)).
+        objectives (list, optional): Objective names. Default is OBJECTIVES.
+
+    Returns:
+        numpy.ndarray: Values with maximized objectives negated.
+    """
+    signs = np.array([-1.0 if objective in MAXIMIZED else 1.0 for objective in objectives])
+    return np.asarray(values, dtype=float) * signs
+
+
+def non_dominated(values):
+    """
+    Find the rows of an objective matrix that no other row dominates.
+
+    A row dominates another if it is no worse on every objective and better on
+    at least one. Rows containing NaN are never on the front; identical rows are
+    all kept.
+
+    Args:
+        values (array-like): Objective values in minimization form, shape (N, M).
+
+    Returns:
+        numpy.ndarray: Boolean mask of shape (N,), True for non-dominated rows.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values).any(axis=1)
+    candidates = values[valid]
+    mask = np.zeros(len(values), dtype=bool)
+    keep = np.ones(len(candidates), dtype=bool)
+    for i, row in enumerate(candidates):
+        dominated = np.all(candidates <= row, axis=1) & np.any(candidates < row, axis=1)
+        keep[i] = not dominated.any()
+    mask[np.nonzero(valid)[0]] = keep
+    return mask
+
+
+def composite_scores(table, **kwargs):
+    """
+    Weighted composite score of each configuration in a results table.
+
+    Follows the notebook's decision matrix: each objective is scaled to 0-100
+    over a range (inverted for objectives where lower is better, clipped to the
+    range, 50 when the range is empty), and the scores are averaged with the
+    given weights. For non-negative weights the best-scoring configuration is
+    always on the Pareto front, so ranking ParetoSearch.run()["front"] finds it
+    without evaluating the rest of the design space. The notebook's ranges span
+    all configurations; pass them as ranges to reproduce its scores exactly.
+
+    Args:
+        table (dict): Columnar table with a column per objective, such as the
+            front returned by ParetoSearch.run().
+        weights (dict, optional): Objective → weight. Default is WEIGHTS.
+        ranges (dict, optional): Objective → (min, max) normalization range.
+            Default is the finite range of each column, and THRESHOLD_RANGE for
+            threshold_flow.
+
+    Returns:
+        numpy.ndarray: Composite score (0-100) per row.
+    """
+    weights = kwargs.get("weights", WEIGHTS)
+    ranges = dict(kwargs.get("ranges", {}))
+    ranges.setdefault("threshold_flow", THRESHOLD_RANGE)
+
+    total = 0.0
+    for objective, weight in weights.items():
+        values = np.asarray(table[objective], dtype=float)
+        if objective in ranges:
+            low, high = ranges[objective]
+        else:
+            finite = values[np.isfinite(values)]
+            low, high = (finite.min(), finite.max()) if len(finite) else (0.0, 0.0)
+        if high == low:
+            score = np.full(values.shape, 50.0)
+        else:
+            with np.errstate(invalid="ignore"):
+                score = 100 * (values - low) / (high - low)
+            if objective not in MAXIMIZED:
+                score = 100 - score
+            score = np.clip(np.nan_to_num(score, nan=0.0), 0, 100)
+        total = total + score * weight
+    return total / sum(weights.values())
+
+
+class ParetoSearch(DesignSweep):
+    """
+    Finds the Pareto front of a design space by branch and bound.
+
+    Takes the same design space as DesignSweep. Each configuration is evaluated
+    once, at a single reference input flow; configurations that fail to simulate
+    are left out. See the module docstring for the objectives and bounds.
+    Bounds are compared without tolerance, so a configuration whose objectives
+    differ from a front member's only by rounding may be left off the front.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize a Pareto search.
+
+        Args:
+            pumps, fermenters, filtrations, distillations, dehydrations (list):
+                Options for each slot, as for DesignSweep.
+            diameters (list, optional): Pipe diameters in meters. Default is [0.12].
+            friction_factors (list, optional): Pipe friction factors. Default is [0.02].
+            input_volume_composition (dict, optional): Component volumetric fractions of
+                the feed. Default is 60% water, 20% sugar, 20% fiber.
+            input_volumetric_flow (float, optional): Reference input flow in m³/s for the
+                cost and energy objectives. Default is 0.01 m³/s.
+            interval (float, optional): Time interval in seconds for energy calculations.
+                Default is 86400 (one day).
+            target_gallons_per_day (float, optional): Ethanol target for the threshold
+                flow. Default is 100000 gallons/day.
+            build_facility (callable, optional): Facility builder. Default is
+                build_standard_facility.
+            prune (bool, optional): Whether to skip dominated subtrees. Default is True.
+
+        Raises:
+            ValueError: If more than one input flow is given.
+        """
+        super().__init__(**kwargs)
+        if len(self.input_volumetric_flow) != 1:
+            raise ValueError("ParetoSearch evaluates a single reference input flow")
+        self.reference_flow = float(self.input_volumetric_flow[0])
+        self.composition = dict(zip(Facility.COMPONENTS, self.input_volume_composition))
+        self.target_gallons_per_day = kwargs.get("target_gallons_per_day", 100000)
+        self.target_ethanol_mass_flow = (self.target_gallons_per_day * Facility.GALLON_VOLUME *
+                                         Process.DENSITY_ETHANOL / Facility.SECONDS_PER_DAY)
+        self.prune = kwargs.get("prune", True)
+
+    def evaluate(self, indices):
+        """
+        Evaluate the objectives of one configuration.
+
+        Args:
+            indices (tuple): Option indices as produced by configurations().
+
+        Returns:
+            numpy.ndarray or None: Objective values ordered as OBJECTIVES, or None if
+                the configuration fails to simulate.
+        """
+        facility = self.build(indices)
+        try:
+            output = facility.facility_process(
+                input_volume_composition=dict(self.composition),
+                input_volumetric_flow=self.reference_flow,
+                interval=self.interval
+            )
+        except (ValueError, ZeroDivisionError):
+            return None
+        outputs = [
+            output["total_cost_consumed"],
+            output["power_generated"],
+            output["total_power_consumed"],
+            output["mass_flow"]["amount"]["ethanol"]
+        ]
+        # Losses exceeding the kinetic power give complex flows; the batch path reports NaN
+        if any(isinstance(value, complex) for value in outputs):
+            return None
+        total_cost_consumed, power_generated, total_power_consumed, ethanol = outputs
+        values = np.array([
+            facility.cost,
+            total_cost_consumed,
+            energy_return(power_generated, total_power_consumed, self.interval),
+            self._threshold_flow(ethanol)
+        ], dtype=float)
+        if np.isnan(values).any() or not np.isfinite(values[:3]).all():
+            return None
+        return values
+
+    def _threshold_flow(self, ethanol):
+        """Input flow reaching the target, given the ethanol output at the reference flow."""
+        return self.reference_flow * self.target_ethanol_mass_flow / ethanol if ethanol > 0 else math.inf
+
+    def run(self):
+        """
+        Search the design space for its Pareto front.
+
+        Returns:
+            dict: Search results with keys:
+                - "front" (dict): Columnar table of the non-dominated configurations,
+                  ordered by configuration index, with the DesignSweep identification
+                  columns (config_index, slot option names, diameter, friction_factor)
+                  and one column per objective
+                - "evaluated" (int): Configurations fully evaluated
+                - "pruned" (int): Configurations skipped without evaluation
+                - "configurations" (int): Size of the design space
+        """
+        self._front = []
+        self._evaluated = 0
+        self._pruned = 0
+
+        if len(self) > 0:
+            self._prepare()
+            feed = FlowState.from_composition(self.composition, self.reference_flow)
+            for p, pump in enumerate(self.options["pump"]):
+                state, power = pump.pump_process_state(feed)
+                self._search((p,), state, pump.cost, pump.cost * self.reference_flow, power)
+
+        return {
+            "front": self._table(),
+            "evaluated": self._evaluated,
+            "pruned": self._pruned,
+            "configurations": len(self)
+        }
+
+    def _prepare(self):
+        """Precompute per-slot bound ingredients for the processor slots."""
+        self._cheapest = {}
+        self._lowest_cost_per_flow = {}
+        self._lowest_power = {}
+        self._most_efficient = {}
+        for slot in DesignSweep.SLOTS[1:]:
+            options = self.options[slot]
+            self._cheapest[slot] = min(option.cost for option in options)
+            self._lowest_cost_per_flow[slot] = min(option.cost_per_flow for option in options)
+            self._lowest_power[slot] = min(option.processPowerConsumption() for option in options)
+            best = max(options, key=lambda option: option.efficiency)
+            self._most_efficient[slot] = with_parameters(
+                best, efficiency=max(option.efficiency for option in options)
+            )
+
+        # Connector costs enter both the build cost and the daily cost
+        first = tuple(0 for _ in DesignSweep.SLOTS)
+        option_cost = sum(self.options[slot][0].cost for slot in DesignSweep.SLOTS)
+        self._connector_cost = min(
+            self.build(first + (d, f)).cost - option_cost
+            for d in range(len(self.diameters))
+            for f in range(len(self.friction_factors))
+        )
+
+    def _search(self, prefix, state, build_cost, daily_cost, power):
+        """Depth-first search below a partial configuration."""
+        depth = len(prefix)
+        remaining = DesignSweep.SLOTS[depth:]
+        leaves = math.prod(self.shape[depth:])
+
+        if self.prune and self._front and self._dominated(self._bound(state, remaining, build_cost, daily_cost, power)):
+            self._pruned += leaves
+            return
+
+        if not remaining:
+            for d in range(len(self.diameters)):
+                for f in range(len(self.friction_factors)):
+                    indices = prefix + (d, f)
+                    self._evaluated += 1
+                    values = self.evaluate(indices)
+                    if values is not None:
+                        self._insert(indices, values)
+            return
+
+        slot = remaining[0]
+        for i, option in enumerate(self.options[slot]):
+            try:
+                child = option.processFlowState(state)
+            except (ValueError, ZeroDivisionError):
+                # Every configuration below fails to simulate
+                self._pruned += leaves // len(self.options[slot])
+                continue
+            self._search(
+                prefix + (i,),
+                child,
+                build_cost + option.cost,
+                daily_cost + option.cost_per_flow * child.total_volumetric_flow,
+                power + option.processPowerConsumption()
+            )
+
+    def _bound(self, state, remaining, build_cost, daily_cost, power):
+        """Optimistic objective bounds of a partial configuration, in minimization form."""
+        build_bound = build_cost + self._connector_cost + sum(self._cheapest[slot] for slot in remaining)
+        ethanol_volume = state.volumetric_amounts[0]
+        daily_bound = daily_cost + self._connector_cost + ethanol_volume * sum(
+            self._lowest_cost_per_flow[slot] for slot in remaining
+        )
+        power_bound = power + sum(self._lowest_power[slot] for slot in remaining)
+
+        try:
+            for slot in remaining:
+                state = self._most_efficient[slot].processFlowState(state)
+            ethanol = state.mass_amounts[0]
+        except (ValueError, ZeroDivisionError):
+            ethanol = math.inf
+
+        generated = ethanol * Facility.ETHANOL_ENERGY_DENSITY * self.interval
+        return_bound = energy_return(generated, power_bound, self.interval) if ethanol < math.inf else math.inf
+        return np.array([build_bound, daily_bound, -return_bound, self._threshold_flow(ethanol)])
+
+    def _dominated(self, values):
+        """Whether a front member dominates an objective vector in minimization form."""
+        front = np.array([entry[1] for entry in self._front])
+        return bool(np.any(np.all(front <= values, axis=1) & np.any(front < values, axis=1)))
+
+    def _insert(self, indices, values):
+        """Add a configuration to the front unless dominated, dropping members it dominates."""
+        point = minimization_form(values)
+        if self._front and self._dominated(point):
+            return
+        self._front = [
+            entry for entry in self._front
+            if not (np.all(point <= entry[1]) and np.any(point < entry[1]))
+        ]
+        self._front.append((indices, point, values))
+
+    def _table(self):
+        """Columnar table of the current front, ordered by configuration index."""
+        entries = sorted(self._front, key=lambda entry: entry[0])
+        table = {
+            "config_index": np.asarray([np.ravel_multi_index(entry[0], self.shape) for entry in entries], dtype=int)
+        }
+        for position, slot in enumerate(DesignSweep.SLOTS):
+            table[slot] = np.asarray([self.options[slot][entry[0][position]].name for entry in entries], dtype=object)
+        table["diameter"] = np.asarray([self.diameters[entry[0][5]] for entry in entries], dtype=float)
+        table["friction_factor"] = np.asarray([self.friction_factors[entry[0][6]] for entry in entries], dtype=float)
+        for position, objective in enumerate(OBJECTIVES):
+            table[objective] = np.asarray([entry[2][position] for entry in entries], dtype=float)
+        return table
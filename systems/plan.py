@@ -0,0 +1,274 @@
+from .process import Process
+from .connectors import Connector
+from .flow import COMPONENTS, DENSITIES
+import numpy as np
+
+# Step kinds in a compiled plan
+LINEAR_PROCESS = 0
+PROCESS = 1
+LOSS_CONNECTOR = 2
+CONNECTOR = 3
+KERNEL_PROCESS = 4
+FUSED_PROCESSES = 5
+
+
+class FacilityPlan:
+    """
+    Flat, precomputed evaluation plan for a facility's component chain.
+
+    Compiling resolves every component once: linear processes become a single
+    volumetric-in/mass-out matrix (density conversion folded in), nonlinear
+    processes with a closed form become their vectorized kernel, connectors with a
+    kinetic-power loss factor become a loss coefficient and a flow ratio, and all
+    flow-independent terms (process power draw, fixed connector costs) are summed
+    up front. Evaluation then walks a list of tuples over NumPy arrays with no
+    type dispatch, dict building or unit conversion. Components without a closed
+    form fall back to their batch methods.
+
+    Runs of consecutive loss connectors are merged into one loss step: the total
+    mass flow is the same for all of them and each only scales the volumetric
+    flow, so the run's loss is a single coefficient times m * Q² and its outlet
+    flow a single ratio times Q.
+
+    Runs of two or more linear processes, with only loss connectors between them,
+    are fused into one step: a single matrix product gives the run's output mass
+    flows together with the total mass and volumetric flow after each process,
+    which is all the costs and connector losses inside the run depend on.
+
+    A plan is a snapshot: it does not see later changes to component parameters.
+    Facility.compile() rebuilds it after add_component().
+
+    Component parameters (efficiencies, friction factors, ...) may be arrays with
+    one entry per sample, as used by Monte Carlo propagation; the plan then holds
+    per-sample matrices and coefficients.
+    """
+
+    def __init__(self, facility):
+        """
+        Compile a facility into an evaluation plan.
+
+        Args:
+            facility (Facility): Facility whose pump and components are compiled.
+        """
+        self.pump = facility.pump
+        self.ethanol_energy_density = facility.ETHANOL_ENERGY_DENSITY
+        self.steps = []
+        self.process_power = 0
+        self.connector_cost = 0
+        self.last_step = None
+
+        for component in facility.components:
+            if isinstance(component, Process):
+                self.process_power += component.power_consumption_rate
+                operator = component.massFlowOperator()
+                if operator is not None and operator.linear:
+                    # Volumetric amounts → output mass amounts in one product
+                    self.steps.append((LINEAR_PROCESS, np.swapaxes(operator.matrix * DENSITIES, -1, -2), component.cost_per_flow))
+                elif operator is not None:
+                    self.steps.append((KERNEL_PROCESS, operator.kernel, component.cost_per_flow))
+                else:
+                    self.steps.append((PROCESS, component, component.cost_per_flow))
+                self.last_step = PROCESS
+            elif isinstance(component, Connector):
+                self.connector_cost += component.cost
+                loss_factor = component.lossFactor()
+                if loss_factor is not None:
+                    # P_loss = ζ * m * Q² / (2A²) and Q_out = Q * (1 - ζ)^(1/3)
+                    loss_coefficient = loss_factor / (2 * component.cross_sectional_area**2)
+                    if np.ndim(loss_factor) == 0:
+                        flow_ratio = (1 - loss_factor) ** (1 / 3) if loss_factor <= 1 else np.nan
+                    else:
+                        flow_ratio = np.where(loss_factor <= 1, np.abs(1 - loss_factor) ** (1 / 3), np.nan)
+                    self.steps.append((LOSS_CONNECTOR, loss_coefficient, flow_ratio))
+                else:
+                    self.steps.append((CONNECTOR, component, None))
+                self.last_step = CONNECTOR
+        self.steps = self._fuse_linear_runs(self._fuse_connector_runs(self.steps))
+
+    @staticmethod
+    def _fuse_connector_runs(steps):
+        """Merge runs of consecutive loss connectors into single loss steps."""
+        fused = []
+        for step in steps:
+            if step[0] == LOSS_CONNECTOR and fused and fused[-1][0] == LOSS_CONNECTOR:
+                _, loss_coefficient, flow_ratio = fused[-1]
+                # The next connector sees the flow scaled by the run so far; a flow
+                # stopped by an earlier connector stays zero
+                fused[-1] = (
+                    LOSS_CONNECTOR,
+                    loss_coefficient + step[1] * flow_ratio**2,
+                    np.where(flow_ratio != 0, flow_ratio * step[2], 0)
+                )
+            else:
+                fused.append(step)
+        return fused
+
+    @staticmethod
+    def _fuse_linear_runs(steps):
+        """Replace runs of linear processes and loss connectors with fused steps."""
+        fused = []
+        i = 0
+        while i < len(steps):
+            end = i
+            processes = 0
+            if steps[i][0] == LINEAR_PROCESS:
+                # Extend the run to its last linear process
+                j = i
+                while j < len(steps) and steps[j][0] in (LINEAR_PROCESS, LOSS_CONNECTOR):
+                    if steps[j][0] == LINEAR_PROCESS:
+                        end = j
+                        processes += 1
+                    j += 1
+            if processes < 2:
+                fused.append(steps[i])
+                i += 1
+                continue
+
+            # cumulative maps input volumetric amounts to the current mass amounts;
+            # each process adds its total mass flow and total volumetric flow columns
+            cumulative = None
+            columns = []
+            operations = []
+            for kind, first, second in steps[i:end + 1]:
+                if kind == LINEAR_PROCESS:
+                    cumulative = first if cumulative is None else np.matmul(cumulative / DENSITIES, first)
+                    operations.append((LINEAR_PROCESS, len(COMPONENTS) + len(columns), second))
+                    columns.append(cumulative.sum(axis=-1))
+                    columns.append((cumulative / DENSITIES).sum(axis=-1))
+                else:
+                    operations.append((kind, first, second))
+            shape = np.broadcast_shapes(cumulative.shape, *(column.shape + (1,) for column in columns))
+            matrix = np.concatenate(
+                [np.broadcast_to(cumulative, shape)]
+                + [np.broadcast_to(column[..., None], shape[:-1] + (1,)) for column in columns],
+                axis=-1
+            )
+            fused.append((FUSED_PROCESSES, matrix, operations))
+            i = end + 1
+        return fused
+
+    def evaluate(self, **kwargs):
+        """
+        Evaluate the plan for a batch of inputs.
+
+        Args:
+            input_volume_composition (array-like): Component volumetric fractions,
+                shape (N, 4) or (4,), columns ordered (ethanol, water, sugar, fiber).
+            input_volumetric_flow (array-like): Total input volumetric flow rates in m³/s.
+            interval (float, optional): Time interval in seconds. Default is 1.
+
+        Returns:
+            dict: Same layout as Facility.facility_process_batch().
+
+        Raises:
+            ValueError: If the composition does not have four columns or a step produces
+                a non-positive total flow.
+        """
+        input_total_volumetric_flow = np.atleast_1d(np.asarray(kwargs.get("input_volumetric_flow", 0), dtype=float))
+        input_volume_composition = np.asarray(kwargs.get("input_volume_composition", np.zeros(4)), dtype=float)
+        interval = kwargs.get("interval", 1)
+
+        if input_volume_composition.shape[-1] != len(COMPONENTS):
+            raise ValueError("input_volume_composition must have one column per component (ethanol, water, sugar, fiber)")
+        input_volume_composition = np.broadcast_to(
+            input_volume_composition, (input_total_volumetric_flow.shape[0], len(COMPONENTS))
+        )
+
+        _, total_volumetric_flow, total_power_consumed = self.pump.pump_process_batch(
+            input_volume_flow=input_total_volumetric_flow,
+            input_composition=input_volume_composition
+        )
+        total_power_consumed = total_power_consumed + self.process_power
+        total_cost_consumed = self.pump.cost * input_total_volumetric_flow + self.connector_cost
+
+        volumetric_amounts = total_volumetric_flow[:, None] * input_volume_composition
+        mass_amounts = volumetric_amounts * DENSITIES
+        total_mass_flow = mass_amounts.sum(axis=1)
+        if np.any(total_mass_flow <= 0):
+            raise ValueError("Total mass flow must be greater than zero to calculate composition")
+
+        for kind, first, second in self.steps:
+            if kind == LOSS_CONNECTOR:
+                total_power_consumed = total_power_consumed + first * total_mass_flow * total_volumetric_flow**2
+                total_volumetric_flow = np.where(total_volumetric_flow != 0, total_volumetric_flow * second, 0)
+            elif kind == LINEAR_PROCESS:
+                if first.ndim == 2:
+                    mass_amounts = volumetric_amounts @ first
+                else:
+                    # Per-sample matrices (sampled parameters)
+                    mass_amounts = np.matmul(volumetric_amounts[:, None, :], first)[:, 0, :]
+                volumetric_amounts = mass_amounts / DENSITIES
+                total_mass_flow = mass_amounts.sum(axis=1)
+                if np.any(total_mass_flow <= 0):
+                    raise ValueError("Total output amount must be greater than zero to calculate composition")
+                total_volumetric_flow = volumetric_amounts.sum(axis=1)
+                total_cost_consumed = total_cost_consumed + second * total_volumetric_flow
+            elif kind == FUSED_PROCESSES:
+                if first.ndim == 2:
+                    flows = volumetric_amounts @ first
+                else:
+                    flows = np.matmul(volumetric_amounts[:, None, :], first)[:, 0, :]
+                for operation, value, factor in second:
+                    if operation == LINEAR_PROCESS:
+                        # value is the process's total mass flow column, factor its cost per flow
+                        total_mass_flow = flows[:, value]
+                        if np.any(total_mass_flow <= 0):
+                            raise ValueError("Total output amount must be greater than zero to calculate composition")
+                        total_volumetric_flow = flows[:, value + 1]
+                        total_cost_consumed = total_cost_consumed + factor * total_volumetric_flow
+                    else:
+                        total_power_consumed = total_power_consumed + value * total_mass_flow * total_volumetric_flow**2
+                        total_volumetric_flow = np.where(total_volumetric_flow != 0, total_volumetric_flow * factor, 0)
+                mass_amounts = flows[:, :len(COMPONENTS)]
+                volumetric_amounts = mass_amounts / DENSITIES
+            elif kind == KERNEL_PROCESS:
+                mass_amounts = first(volumetric_amounts * DENSITIES)
+                volumetric_amounts = mass_amounts / DENSITIES
+                total_mass_flow = mass_amounts.sum(axis=1)
+                if np.any(total_mass_flow <= 0):
+                    raise ValueError("Total output amount must be greater than zero to calculate composition")
+                total_volumetric_flow = volumetric_amounts.sum(axis=1)
+                total_cost_consumed = total_cost_consumed + second * total_volumetric_flow
+            elif kind == PROCESS:
+                output = first.processVolumetricFlowBatch(
+                    inputs={component: volumetric_amounts[:, i] for i, component in enumerate(COMPONENTS)}
+                )
+                zeros = np.zeros_like(total_volumetric_flow)
+                volumetric_amounts = np.column_stack([output["amount"].get(component, zeros) for component in COMPONENTS])
+                mass_amounts = volumetric_amounts * DENSITIES
+                total_mass_flow = mass_amounts.sum(axis=1)
+                total_volumetric_flow = volumetric_amounts.sum(axis=1)
+                total_cost_consumed = total_cost_consumed + second * total_volumetric_flow
+            else:
+                power_consumed, _, total_volumetric_flow = first.evaluateFlowBatch(
+                    input_volumetric_flow=total_volumetric_flow,
+                    input_mass_flow=total_mass_flow
+                )
+                total_power_consumed = total_power_consumed + power_consumed
+
+        # Output composition follows facility_process(): mass fractions after a
+        # process, volume fractions after a connector, the input otherwise
+        if self.last_step == PROCESS:
+            volumetric_composition = mass_amounts / total_mass_flow[:, None]
+        elif self.last_step == CONNECTOR:
+            volumetric_composition = volumetric_amounts / volumetric_amounts.sum(axis=1)[:, None]
+        else:
+            volumetric_composition = input_volume_composition
+
+        power_generated = mass_amounts[:, 0] * self.ethanol_energy_density * interval
+        return {
+            "volumetric_flow": {
+                "total_volumetric_flow": total_volumetric_flow,
+                "amount": {component: volumetric_amounts[:, i] for i, component in enumerate(COMPONENTS)},
+                "composition": {component: volumetric_composition[:, i] for i, component in enumerate(COMPONENTS)}
+            },
+            "mass_flow": {
+                "total_mass_flow": total_mass_flow,
+                "amount": {component: mass_amounts[:, i] for i, component in enumerate(COMPONENTS)},
+                "composition": {component: mass_amounts[:, i] / total_mass_flow for i, component in enumerate(COMPONENTS)}
+            },
+            "total_power_consumed": total_power_consumed,
+            "total_cost_consumed": total_cost_consumed,
+            "power_generated": power_generated,
+            "net_power_gained": power_generated - total_power_consumed
+        }
@@ -0,0 +1,145 @@
+"""
+Prefix-sharing evaluation of many facilities.
+
+Facilities in a design sweep differ only in some of their components, so many
+of them pass the same feed through the same pump and leading components.
+PrefixTrie stores the flow state, power and cost after every component prefix
+it has evaluated, keyed by component identity, so each facility only pays for
+the part of its chain no earlier facility shared.
+"""
+from .process import Process
+from .connectors import Connector
+from .flow import FlowState
+
+
+class _Node:
+    """Flow state and accumulated totals after a component prefix."""
+    __slots__ = ("component", "state", "power", "cost", "children")
+
+    def __init__(self, component, state, power, cost):
+        # The component reference keeps its id() from being reused while cached
+        self.component = component
+        self.state = state
+        self.power = power
+        self.cost = cost
+        self.children = {}
+
+
+class PrefixTrie:
+    """
+    Trie of evaluated component prefixes.
+
+    The root level is keyed by pump and feed (composition and flow); each level
+    below by the next component. Components are identified by object identity,
+    so facilities share a prefix exactly when they hold the same component
+    objects in the same order: build them from shared option and connector
+    instances (as DesignSweep does with share_prefixes=True). Component
+    parameters must not change while the trie holds them; call clear() after
+    changing a component in place.
+    """
+
+    def __init__(self):
+        """Initialize an empty trie."""
+        self.roots = {}
+        self.steps = 0
+        self.reused = 0
+        self.nodes = 0
+
+    def evaluate(self, facility, **kwargs):
+        """
+        Process material through a facility, reusing cached prefixes.
+
+        Equivalent to facility.facility_process() without logging, caching or
+        profiling: results are identical, but only the components after the
+        longest previously evaluated prefix are computed.
+
+        Args:
+            facility (Facility): Facility to evaluate.
+            input_volume_composition (dict): Component volumetric fractions (0-1).
+            input_volumetric_flow (float): Total input volumetric flow rate in m³/s.
+            interval (float, optional): Time interval in seconds for energy
+                calculations. Default is 1.
+
+        Returns:
+            dict: Same layout as Facility.facility_process().
+
+        Raises:
+            ValueError: If the pump or a process produces a non-positive flow.
+        """
+        input_volume_composition = kwargs.get("input_volume_composition", {})
+        input_total_volumetric_flow = kwargs.get("input_volumetric_flow", 0)
+        interval = kwargs.get("interval", 1)
+        pump = facility.pump
+
+        key = (id(pump), input_total_volumetric_flow) + tuple(input_volume_composition.items())
+        node = self.roots.get(key)
+        if node is None:
+            state = FlowState.from_composition(input_volume_composition, input_total_volumetric_flow)
+            state, pump_power_consumed = pump.pump_process_state(state)
+            if state.total_mass_flow <= 0:
+                raise ValueError("Total mass flow must be greater than zero to calculate composition")
+            node = self.roots[key] = _Node(
+                pump, state, 0 + pump_power_consumed, 0 + pump.cost * input_total_volumetric_flow
+            )
+            self.steps += 1
+            self.nodes += 1
+        else:
+            self.reused += 1
+
+        for component in facility.components:
+            child = node.children.get(id(component))
+            if child is None:
+                child = node.children[id(component)] = self._step(node, component)
+                self.steps += 1
+                self.nodes += 1
+            else:
+                self.reused += 1
+            node = child
+
+        mass_flow = node.state.mass_flow_dict()
+        power_generated = mass_flow["amount"]["ethanol"] * facility.ETHANOL_ENERGY_DENSITY * interval
+        return {
+            "volumetric_flow": node.state.volumetric_flow_dict(),
+            "mass_flow": mass_flow,
+            "total_power_consumed": node.power,
+            "total_cost_consumed": node.cost,
+            "power_generated": power_generated,
+            "net_power_gained": power_generated - node.power
+        }
+
+    def _step(self, node, component):
+        """Evaluate one component after a cached prefix, as facility_process() does."""
+        if isinstance(component, Process):
+            state = component.processFlowState(node.state)
+            power = node.power + component.processPowerConsumption()
+            cost = node.cost + component.cost_per_flow * state.total_volumetric_flow
+        elif isinstance(component, Connector):
+            state, connector_power_consumed = component.processFlowState(node.state)
+            power = node.power + connector_power_consumed
+            cost = node.cost + component.cost
+        else:
+            state, power, cost = node.state, node.power, node.cost
+        return _Node(component, state, power, cost)
+
+    def stats(self):
+        """
+        Report how much work the trie saved.
+
+        Returns:
+            dict: "nodes" (cached prefixes), "steps" (pump and component steps
+                computed), "reused" (steps served from the trie) and "reuse_rate".
+        """
+        total = self.steps + self.reused
+        return {
+            "nodes": self.nodes,
+            "steps": self.steps,
+            "reused": self.reused,
+            "reuse_rate": self.reused / total if total else 0.0
+        }
+
+    def clear(self):
+        """Discard all cached prefixes and reset statistics."""
+        self.roots.clear()
+        self.steps = 0
+        self.reused = 0
+        self.nodes = 0
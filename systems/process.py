@@ -1,8 +1,11 @@
-import matplotlib
-import matplotlib.pyplot as plt
+import numpy as np
+from functools import partial
+from .logs import ArrayLog, build_flow_log, build_consumption_log
+from .operators import LinearOperator, KernelOperator
+from .cache import Fingerprinted
 
 
-class Process:
+class Process(Fingerprinted):
     """
     Base class for modeling chemical processing systems in an ethanol plant.
     
@@ -17,6 +20,15 @@ class Process:
     DENSITY_SUGAR = 1590
     DENSITY_FIBER = 1311
     
+    # Instrumentation hook (systems.profiling.Profiler), None when disabled
+    profiler = None
+
+    # Log storage, allocated on first access of input_log, output_log or consumption_log
+    _log_options = ("list",)
+    _input_log = None
+    _output_log = None
+    _consumption_log = None
+    
     def __init__(self, **kwargs):
         """
         Initialize a Process with configuration parameters and logging structures.
@@ -31,82 +43,28 @@ class Process:
                 Default: "kWh/day".
             cost (float): Fixed cost per unit operation (USD). Default: 0.
             cost_per_flow (float): Variable cost per m³/s of flow (USD). Default: 0.
+            log_backend (str): "list" for Python list logs or "array" for preallocated
+                NumPy columns (ArrayLog). Default: "list".
+            log_capacity (int): Initial entries per column for the "array" backend. Default: 1024.
+            log_overflow (str): "grow", "wrap" or "drop" for the "array" backend. Default: "grow".
+            log_dtype (numpy dtype): Element type for the "array" backend. Default: float64.
         """
         self.name = kwargs.get("name", "Process")
         
-        self.input_log = {
-            "mass_flow": {
-                "total_mass_flow": [],
-                "amount": {
-                    "ethanol": [],
-                    "water": [],
-                    "sugar": [],
-                    "fiber": []
-                }, 
-                "composition": {
-                    "ethanol": [],
-                    "water": [],
-                    "sugar": [],
-                    "fiber": []
-                }
-            },
-            "volumetric_flow": {
-                "total_volumetric_flow": [],
-                "amount": {
-                    "ethanol": [],
-                    "water": [],
-                    "sugar": [],
-                    "fiber": []
-                }, 
-                "composition": {
-                    "ethanol": [],
-                    "water": [],
-                    "sugar": [],
-                    "fiber": []
-                }
-            },
-        }
-        
-        self.output_log = {
-            "mass_flow": {
-                "total_mass_flow": [],
-                "amount": {
-                    "ethanol": [], 
-                    "water": [], 
-                    "sugar": [], 
-                    "fiber": []
-                }, 
-                "composition": {
-                    "ethanol": [], 
-                    "water": [], 
-                    "sugar": [], 
-                    "fiber": []
-                }
-            },
-            "volumetric_flow": {
-                "total_volumetric_flow": [],
-                "amount": {
-                    "ethanol": [], 
-                    "water": [], 
-                    "sugar": [], 
-                    "fiber": []
-                }, 
-                "composition": {
-                    "ethanol": [], 
-                    "water": [], 
-                    "sugar": [], 
-                    "fiber": []
-                }
-            },
-        }
-        
-        self.consumption_log = {
-            "power_consumption_rate": [],
-            "energy_consumed": [],
-            "interval": [],
-            "cost_per_unit_flow": [],
-            "cost_incurred": []
-        }
+        # Log storage: plain lists, or preallocated NumPy columns for long runs.
+        # The logs themselves are allocated on first use (see input_log).
+        log_backend = kwargs.get("log_backend", "list")
+        if log_backend == "list":
+            self._log_options = ("list",)
+        elif log_backend == "array":
+            self._log_options = (
+                "array",
+                kwargs.get("log_capacity", 1024),
+                kwargs.get("log_overflow", "grow"),
+                kwargs.get("log_dtype", np.float64)
+            )
+        else:
+            raise ValueError("log_backend must be either 'list' or 'array'")
         
         # Convert power consumption to Watts
         self.power_consumption_rate = kwargs.get("power_consumption_rate", 0)
@@ -123,6 +81,73 @@ class Process:
         self.efficiency = kwargs.get("efficiency", 1.0)
         self.massFlowFunction = kwargs.get("massFlowFunction", None)
 
+    def _log_column(self):
+        """Column factory for the configured log backend."""
+        if self._log_options[0] == "list":
+            return list
+        _, capacity, overflow, dtype = self._log_options
+        return partial(ArrayLog, capacity=capacity, overflow=overflow, dtype=dtype)
+
+    @property
+    def input_log(self):
+        """Logged inputs (see Logging Structures), allocated on first access."""
+        if self._input_log is None:
+            self._input_log = build_flow_log(self._log_column())
+        return self._input_log
+
+    @input_log.setter
+    def input_log(self, log):
+        self._input_log = log
+
+    @property
+    def output_log(self):
+        """Logged outputs, same layout as input_log, allocated on first access."""
+        if self._output_log is None:
+            self._output_log = build_flow_log(self._log_column())
+        return self._output_log
+
+    @output_log.setter
+    def output_log(self, log):
+        self._output_log = log
+
+    @property
+    def consumption_log(self):
+        """Logged power, energy and cost, allocated on first access."""
+        if self._consumption_log is None:
+            self._consumption_log = build_consumption_log(self._log_column())
+        return self._consumption_log
+
+    @consumption_log.setter
+    def consumption_log(self, log):
+        self._consumption_log = log
+
+    @property
+    def logs_allocated(self):
+        """Whether any log storage has been allocated."""
+        return not (self._input_log is None and self._output_log is None and self._consumption_log is None)
+
+    def detach_logs(self):
+        """
+        Take the logs out of the process, leaving it with no log storage.
+        
+        Logging later allocates fresh, empty logs; the detached ones are unaffected.
+        
+        Returns:
+            dict: "input_log", "output_log" and "consumption_log"; logs never allocated
+                are None.
+        """
+        logs = {
+            "input_log": self._input_log,
+            "output_log": self._output_log,
+            "consumption_log": self._consumption_log
+        }
+        self._input_log = self._output_log = self._consumption_log = None
+        return logs
+
+    def clear_logs(self):
+        """Discard all logged data and release the log storage."""
+        self.detach_logs()
+
     @staticmethod
     def volumetricToMass(**kwargs):
         """
@@ -355,6 +380,43 @@ class Process:
                 total_mass_flow = sum(inputs["amount"][component] for component in self.components)
             input_composition = inputs["composition"].copy()
 
+        return self._processMassFlowTrusted(
+            input_amounts, input_composition, total_mass_flow,
+            output_type=output_type,
+            store_inputs=store_inputs,
+            store_outputs=store_outputs,
+            store_cost=store_cost
+        )
+
+    def _processMassFlowTrusted(self, input_amounts, input_composition, total_mass_flow, **kwargs):
+        """
+        Trusted core of processMassFlow() for normalized, already validated inputs.
+        
+        Performs no argument checks and no copies: input_amounts must hold every
+        component, output_type must be valid and store_outputs requires "full".
+        Public callers go through processMassFlow().
+        
+        Args:
+            input_amounts (dict): Component mass flows (kg/s).
+            input_composition (dict): Component fractions to log with the inputs.
+            total_mass_flow (float): Total input mass flow (kg/s).
+            output_type (str): 'amount', 'composition', or 'full'. Default: 'full'.
+            store_inputs (bool): Whether to log input values. Default: False.
+            store_outputs (bool): Whether to log output values. Default: False.
+            store_cost (bool): Whether to log cost data. Default: False.
+        
+        Returns:
+            dict: Processed outputs in format specified by output_type.
+        
+        Raises:
+            ValueError: If the total output mass flow is not positive and compositions
+                are requested.
+        """
+        output_type = kwargs.get("output_type", "full")
+        store_inputs = kwargs.get("store_inputs", False)
+        store_outputs = kwargs.get("store_outputs", False)
+        store_cost = kwargs.get("store_cost", False)
+
         if store_inputs:
             for component in self.components:
                 self.input_log["mass_flow"]["amount"][component].append(input_amounts[component])
@@ -515,6 +577,223 @@ class Process:
                 "composition": mass_flow_outputs["composition"]
             }
 
+    def processVolumetricFlowBatch(self, **kwargs):
+        """
+        Process a batch of volumetric flow rate inputs in a single vectorized pass.
+
+        Array counterpart of processVolumetricFlow() for full-format inputs. Each
+        component amount is a NumPy array with one entry per sample, and
+        massFlowFunction is applied to the whole batch at once, so it must be
+        written with element-wise arithmetic (as all built-in processors are).
+        Nothing is logged.
+
+        Args:
+            inputs (dict): Component volumetric flow rate arrays (m³/s), keyed by
+                component name. All four components are required.
+
+        Returns:
+            dict: Output with keys "amount" (component volumetric flow arrays in m³/s)
+                and "composition" (component mass fraction arrays), matching the
+                layout of processVolumetricFlow(output_type="full").
+
+        Raises:
+            ValueError: For missing components or non-positive output mass flow.
+        """
+        inputs = kwargs.get("inputs", dict())
+
+        if any(key not in inputs for key in self.components):
+            raise ValueError("All components must be provided for batch processing")
+
+        input_amounts = Process.volumetricToMass(
+            inputs={component: np.asarray(inputs[component], dtype=float) for component in self.components},
+            mode="amount"
+        )
+
+        output_amounts = self.massFlowFunction(input_amounts) if self.massFlowFunction else input_amounts
+        filtered_output = {k: v for k, v in output_amounts.items() if v is not None}
+        output_total = sum(filtered_output.values())
+
+        if np.any(output_total <= 0):
+            raise ValueError("Total output amount must be greater than zero to calculate composition")
+
+        return {
+            "amount": Process.massToVolumetric(inputs=filtered_output, mode="amount"),
+            "composition": {component: filtered_output[component] / output_total for component in filtered_output}
+        }
+
+    def _processVolumetricFlowTrusted(self, state):
+        """
+        Trusted, logging counterpart of processVolumetricFlow(input_type="full").
+        
+        Logs and returns exactly what the public call does for the state's
+        volumetric flow dict with every store_* flag set, but reads the component
+        flows straight from the state and passes them to _processMassFlowTrusted()
+        without validating or copying them.
+        
+        Args:
+            state (FlowState): Input flow; its components must be self.components,
+                in order.
+        
+        Returns:
+            dict: "amount" (component volumetric flows in m³/s) and "composition"
+                (component mass fractions).
+        
+        Raises:
+            ValueError: If the total output mass flow is not positive.
+        """
+        components = self.components
+        volumetric_amounts = state.volumetric_amounts.tolist()
+        volumetric_composition = np.asarray(state.composition, dtype=float).tolist()
+        densities = (Process.DENSITY_ETHANOL, Process.DENSITY_WATER, Process.DENSITY_SUGAR, Process.DENSITY_FIBER)
+        mass_amounts = [amount * density for amount, density in zip(volumetric_amounts, densities)]
+
+        mass_flow_outputs = self._processMassFlowTrusted(
+            dict(zip(components, mass_amounts)),
+            dict(zip(components, volumetric_composition)),
+            sum(mass_amounts),
+            output_type="full",
+            store_inputs=True,
+            store_outputs=True
+        )
+        output_amounts = Process.massToVolumetric(inputs=mass_flow_outputs["amount"], mode="amount")
+        output_composition = mass_flow_outputs["composition"]
+        total_volumetric_flow = sum(volumetric_amounts)
+
+        input_log = self.input_log["volumetric_flow"]
+        for component, amount, fraction in zip(components, volumetric_amounts, volumetric_composition):
+            input_log["amount"][component].append(amount)
+            input_log["composition"][component].append(fraction)
+        input_log["total_volumetric_flow"].append(total_volumetric_flow)
+
+        self.consumption_log["cost_per_unit_flow"].append(self.cost_per_flow)
+        self.consumption_log["cost_incurred"].append(self.cost_per_flow * total_volumetric_flow)
+
+        output_log = self.output_log["volumetric_flow"]
+        for component in components:
+            if component in output_amounts:
+                output_log["amount"][component].append(output_amounts[component])
+            if component in output_composition:
+                output_log["composition"][component].append(output_composition[component])
+        output_log["total_volumetric_flow"].append(sum(output_amounts[component] for component in output_amounts))
+
+        return {"amount": output_amounts, "composition": output_composition}
+
+    def processFlowState(self, state, **kwargs):
+        """
+        Process a FlowState through the system.
+
+        Compact counterpart of processVolumetricFlow(input_type="full") used by
+        Facility: the mass flows come straight from the state's arrays, and the
+        output is a new state whose reported composition is the output mass
+        fractions. Components the massFlowFunction returns as None carry zero
+        flow. When logging is requested, the call is routed through
+        processVolumetricFlow() so the logs match it exactly, or through its
+        trusted counterpart when the caller has validated the wiring.
+
+        Args:
+            state (FlowState): Input flow.
+            store_data (bool): Whether to log inputs, outputs and cost. Default: False.
+            trusted (bool): Skip argument validation and input copies when logging;
+                only for callers that checked this process's components match the
+                state's (Facility.validate()). Default: False.
+
+        Returns:
+            FlowState: Output flow.
+
+        Raises:
+            ValueError: If the total output mass flow is not positive.
+        """
+        store_data = kwargs.get("store_data", False)
+        trusted = kwargs.get("trusted", False)
+        profiler = self.profiler
+        if profiler is not None:
+            mark = profiler.start()
+
+        if store_data:
+            if trusted:
+                output = self._processVolumetricFlowTrusted(state)
+            else:
+                output = self.processVolumetricFlow(
+                    inputs=state.volumetric_flow_dict(),
+                    input_type="full",
+                    output_type="full",
+                    store_inputs=True,
+                    store_outputs=True,
+                    store_cost=True
+                )
+            if profiler is not None:
+                mark = profiler.lap(mark, self, "log")
+            state = type(state)(
+                [output["amount"].get(component, 0) for component in self.components],
+                composition=[output["composition"].get(component, 0) for component in self.components]
+            )
+            if profiler is not None:
+                profiler.lap(mark, self, "convert")
+            return state
+
+        input_amounts = dict(zip(self.components, state.mass_amounts.tolist()))
+        if profiler is not None:
+            mark = profiler.lap(mark, self, "convert")
+        output_amounts = self.massFlowFunction(input_amounts) if self.massFlowFunction else input_amounts
+        if profiler is not None:
+            mark = profiler.lap(mark, self, "transform")
+        output_amounts = [output_amounts.get(component) or 0 for component in self.components]
+        output_total = sum(output_amounts)
+
+        if output_total <= 0:
+            raise ValueError("Total output amount must be greater than zero to calculate composition")
+
+        state = state.from_mass(output_amounts, composition=[amount / output_total for amount in output_amounts])
+        if profiler is not None:
+            profiler.lap(mark, self, "convert")
+        return state
+
+    def massFlowMatrix(self):
+        """
+        Get the 4×4 matrix of this process's mass flow transform, if it is linear.
+        
+        Rows and columns are ordered (ethanol, water, sugar, fiber), so that
+        output_mass = matrix @ input_mass. Subclasses with a linear massFlowFunction
+        override this; a pass-through process returns the identity.
+        
+        Returns:
+            numpy.ndarray or None: The transform matrix, or None if the transform is
+                not known to be linear.
+        """
+        return np.eye(len(self.components)) if self.massFlowFunction is None else None
+
+    def massFlowKernel(self):
+        """
+        Get a vectorized function computing this process's nonlinear mass flow transform.
+        
+        The function maps mass flows ordered (ethanol, water, sugar, fiber), shape
+        (..., 4), to output mass flows of the same shape. Subclasses whose
+        massFlowFunction is nonlinear but has a closed form override this.
+        
+        Returns:
+            callable or None: The kernel, or None if none is available.
+        """
+        return None
+
+    def massFlowOperator(self):
+        """
+        Get this process's mass flow transform as an operator.
+        
+        Linear transforms (massFlowMatrix()) give a LinearOperator, which fuses
+        with neighbouring linear stages into a single matrix; other closed-form
+        transforms (massFlowKernel()) give a KernelOperator flagged as nonlinear.
+        Both apply to whole batches of (ethanol, water, sugar, fiber) vectors.
+        
+        Returns:
+            LinearOperator, KernelOperator or None: The operator, or None for a custom
+                massFlowFunction, which is only available through the dict interface.
+        """
+        matrix = self.massFlowMatrix()
+        if matrix is not None:
+            return LinearOperator(matrix)
+        kernel = self.massFlowKernel()
+        return KernelOperator(kernel) if kernel is not None else None
+
     def processPowerConsumption(self, **kwargs):
         """
         Get the power consumption rate of the process.
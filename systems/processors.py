@@ -1,4 +1,5 @@
 from .process import Process
+import numpy as np
 
 
 class Fermentation(Process):
@@ -39,6 +40,23 @@ class Fermentation(Process):
             "fiber": input["fiber"] if input.get("fiber") is not None else None
         }
 
+    def massFlowMatrix(self):
+        """
+        Fermentation as a linear map on (ethanol, water, sugar, fiber) mass flows.
+        
+        An array of efficiencies gives a stack of matrices, shape (N, 4, 4).
+        Returns None if massFlowFunction has been replaced with a custom function.
+        """
+        if self.massFlowFunction != self.ferment:
+            return None
+        efficiency = np.asarray(self.efficiency, dtype=float)
+        matrix = np.zeros(efficiency.shape + (4, 4))
+        matrix[..., 0, 2] = 0.51 * efficiency
+        matrix[..., 1, 1] = 1
+        matrix[..., 2, 2] = 1 - efficiency
+        matrix[..., 3, 3] = 1
+        return matrix
+
 
 class Filtration(Process):
     """
@@ -75,6 +93,21 @@ class Filtration(Process):
             "fiber": (1 - self.efficiency) * input["fiber"] if input.get("fiber") is not None else None
         }
 
+    def massFlowMatrix(self):
+        """
+        Filtration as a linear map on (ethanol, water, sugar, fiber) mass flows.
+        
+        An array of efficiencies gives a stack of matrices, shape (N, 4, 4).
+        Returns None if massFlowFunction has been replaced with a custom function.
+        """
+        if self.massFlowFunction != self.filter:
+            return None
+        efficiency = np.asarray(self.efficiency, dtype=float)
+        matrix = np.zeros(efficiency.shape + (4, 4))
+        matrix[..., [0, 1, 2], [0, 1, 2]] = 1
+        matrix[..., 3, 3] = 1 - efficiency
+        return matrix
+
 
 class Distillation(Process):
     """
@@ -110,7 +143,7 @@ class Distillation(Process):
             - ethanol: all input ethanol passes through
             - water, sugar, fiber: amounts based on efficiency and input ratios
         """
-        if None in [input.get("ethanol"), input.get("water"), input.get("sugar"), input.get("fiber")]:
+        if any(input.get(component) is None for component in ["ethanol", "water", "sugar", "fiber"]):
             return {
                 "ethanol": None,
                 "water": None,
@@ -126,6 +159,30 @@ class Distillation(Process):
             "fiber": (input["fiber"] * input["ethanol"] * distill_inefficiency) / in_nonEthanol
         }
 
+    def massFlowKernel(self):
+        """
+        Distillation as a vectorized function of (..., 4) mass flow arrays.
+        
+        Computes exactly what distill() does, element by element; an array of
+        efficiencies broadcasts against the leading axes of the input.
+        Returns None if massFlowFunction has been replaced with a custom function.
+        """
+        if self.massFlowFunction != self.distill:
+            return None
+        efficiency = np.asarray(self.efficiency, dtype=float)
+
+        def distill_kernel(mass):
+            distill_inefficiency = (1 / efficiency) - 1
+            ethanol, water, sugar, fiber = mass[..., 0], mass[..., 1], mass[..., 2], mass[..., 3]
+            in_nonEthanol = water + sugar + fiber
+            return np.stack(np.broadcast_arrays(
+                ethanol,
+                (water * ethanol * distill_inefficiency) / in_nonEthanol,
+                (sugar * ethanol * distill_inefficiency) / in_nonEthanol,
+                (fiber * ethanol * distill_inefficiency) / in_nonEthanol
+            ), axis=-1)
+        return distill_kernel
+
 
 class Dehydration(Process):
     """
@@ -155,7 +212,7 @@ class Dehydration(Process):
             - ethanol, sugar, fiber: pass through unchanged
             - water: remaining water after dehydration (based on efficiency)
         """
-        if None in [input.get("ethanol"), input.get("water"), input.get("sugar"), input.get("fiber")]:
+        if any(input.get(component) is None for component in ["ethanol", "water", "sugar", "fiber"]):
             return {
                 "ethanol": None,
                 "water": None,
@@ -167,4 +224,19 @@ class Dehydration(Process):
             "water": input["water"] * (1 - self.efficiency),
             "sugar": input["sugar"],
             "fiber": input["fiber"],
-        }
\ No newline at end of file
+        }
+
+    def massFlowMatrix(self):
+        """
+        Dehydration as a linear map on (ethanol, water, sugar, fiber) mass flows.
+        
+        An array of efficiencies gives a stack of matrices, shape (N, 4, 4).
+        Returns None if massFlowFunction has been replaced with a custom function.
+        """
+        if self.massFlowFunction != self.dehydrate:
+            return None
+        efficiency = np.asarray(self.efficiency, dtype=float)
+        matrix = np.zeros(efficiency.shape + (4, 4))
+        matrix[..., [0, 2, 3], [0, 2, 3]] = 1
+        matrix[..., 1, 1] = 1 - efficiency
+        return matrix
@@ -0,0 +1,185 @@
+"""
+Opt-in instrumentation for facility runs.
+
+A Profiler collects call counts, cumulative wall time and allocation counts
+per component and per phase. Facility, Process, Connector and Pump each carry
+a profiler attribute that is None by default; instrumented code checks it
+once per call, so a disabled profiler costs a single attribute lookup.
+Facility.enable_profiling() attaches one profiler to the facility, its pump
+and every component.
+
+Phases:
+- "convert": building flow states and result dicts
+- "transform": a process's mass flow function
+- "flow": pump and connector physics
+- "power", "cost": power and cost accounting
+- "log": logged process steps (store_data=True), including their transform
+- "cache": evaluation cache lookups that hit
+- "total": whole facility_process() calls
+- "batch": whole facility_process_batch() calls
+"""
+import json
+import sys
+import time
+
+
+PHASES = ["convert", "transform", "flow", "power", "cost", "log", "cache", "total", "batch"]
+
+
+class Profiler:
+    """
+    Accumulates per-component, per-phase timing and allocation statistics.
+
+    Allocations are measured as the change in sys.getallocatedblocks() over a
+    phase: the net number of interpreter memory blocks the phase left allocated,
+    a cheap proxy for allocation pressure that needs no tracing.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize an empty profiler.
+
+        Args:
+            track_allocations (bool, optional): Whether to record allocated block
+                counts. Default is True.
+            clock (callable, optional): Timer returning seconds. Default is
+                time.perf_counter.
+        """
+        self.track_allocations = kwargs.get("track_allocations", True)
+        self.clock = kwargs.get("clock", time.perf_counter)
+        self.labels = {}
+        self.stats = {}
+
+    def register(self, owner, label):
+        """
+        Set the report label for a component.
+
+        Args:
+            owner: Component, pump or facility.
+            label (str): Label used in reports.
+        """
+        self.labels[id(owner)] = label
+
+    def label(self, owner):
+        """
+        Get the report label for a component, assigning one on first use.
+
+        Unregistered owners are labeled by name (or class name), with a numeric
+        suffix if that label is already taken by another owner.
+
+        Args:
+            owner: Component, pump or facility.
+
+        Returns:
+            str: The label.
+        """
+        label = self.labels.get(id(owner))
+        if label is None:
+            base = getattr(owner, "name", None) or type(owner).__name__
+            taken = set(self.labels.values())
+            label, suffix = base, 2
+            while label in taken:
+                label, suffix = f"{base}#{suffix}", suffix + 1
+            self.labels[id(owner)] = label
+        return label
+
+    def start(self):
+        """
+        Take a measurement mark.
+
+        Returns:
+            tuple: (time, allocated blocks) mark for lap().
+        """
+        return self.clock(), sys.getallocatedblocks() if self.track_allocations else 0
+
+    def lap(self, mark, owner, phase):
+        """
+        Record the time and allocations since a mark and take a new mark.
+
+        Args:
+            mark (tuple): Mark from start() or a previous lap().
+            owner: Component the phase belongs to.
+            phase (str): Phase name.
+
+        Returns:
+            tuple: New mark.
+        """
+        now = self.start()
+        key = (self.label(owner), phase)
+        entry = self.stats.get(key)
+        if entry is None:
+            entry = self.stats[key] = [0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += now[0] - mark[0]
+        entry[2] += now[1] - mark[1]
+        return now
+
+    def measure(self, owner, phase):
+        """
+        Context manager recording one phase for an owner.
+
+        Args:
+            owner: Component the phase belongs to.
+            phase (str): Phase name.
+
+        Returns:
+            context manager
+        """
+        return _Measurement(self, owner, phase)
+
+    def reset(self):
+        """Discard all recorded statistics (labels are kept)."""
+        self.stats.clear()
+
+    def report(self):
+        """
+        Build a structured report of the recorded statistics.
+
+        Returns:
+            dict: Report with keys:
+                - "components" (dict): label → phase → {"calls", "wall_time", "allocated_blocks"}
+                - "phases" (dict): phase → totals over all components
+                - "rows" (list): one flat dict per (component, phase), for tabulation
+        """
+        components = {}
+        phases = {}
+        rows = []
+        for (label, phase), (calls, wall_time, blocks) in self.stats.items():
+            entry = {"calls": calls, "wall_time": wall_time, "allocated_blocks": blocks}
+            components.setdefault(label, {})[phase] = entry
+            total = phases.setdefault(phase, {"calls": 0, "wall_time": 0.0, "allocated_blocks": 0})
+            total["calls"] += calls
+            total["wall_time"] += wall_time
+            total["allocated_blocks"] += blocks
+            rows.append(dict(component=label, phase=phase, **entry))
+        rows.sort(key=lambda row: row["wall_time"], reverse=True)
+        return {"components": components, "phases": phases, "rows": rows}
+
+    def to_json(self, **kwargs):
+        """
+        Serialize report() as JSON.
+
+        Args:
+            **kwargs: Passed to json.dumps (e.g. indent).
+
+        Returns:
+            str: JSON report.
+        """
+        return json.dumps(self.report(), **kwargs)
+
+
+class _Measurement:
+    """Context manager behind Profiler.measure()."""
+
+    def __init__(self, profiler, owner, phase):
+        self.profiler = profiler
+        self.owner = owner
+        self.phase = phase
+
+    def __enter__(self):
+        self.mark = self.profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.lap(self.mark, self.owner, self.phase)
+        return False
@@ -1,8 +1,13 @@
 from .process import Process
 from .connectors import Connector
+from .cache import Fingerprinted
 import math
+import numpy as np
+
+class Pump(Fingerprinted):
+    # Instrumentation hook (systems.profiling.Profiler), None when disabled
+    profiler = None
 
-class Pump():
     def __init__(self, **kwargs):
         """
         Initialize Pump.
@@ -54,6 +59,27 @@ class Pump():
             input_composition.get("fiber", 0) * Process.DENSITY_FIBER
         )
         
+        output_volumetric_flow, power_consumed = self._energy_balance(input_volume_flow, input_density)
+        output_mass_flow = output_volumetric_flow * input_density  # in kg/s
+
+        return output_mass_flow, output_volumetric_flow, power_consumed
+
+    def _energy_balance(self, input_volume_flow, input_density):
+        """
+        Outlet flow and power of the pump for inlet flows and densities.
+
+        The one implementation of the pump physics, shared by pump_process(),
+        pump_process_batch() and pump_process_state(). Plain floats are computed
+        with float arithmetic; arrays element-wise, with zero-density samples
+        producing zero outlet flow.
+
+        Args:
+            input_volume_flow (float or numpy.ndarray): Inlet volumetric flow in m³/s
+            input_density (float or numpy.ndarray): Inlet density in kg/m³
+
+        Returns:
+            tuple: (output_volumetric_flow, power_consumed) in m³/s and Watts
+        """
         # Calculate mass flow rate: mass_flow = volumetric_flow × density
         input_mass_flow = input_volume_flow * input_density
 
@@ -66,7 +92,71 @@ class Pump():
         power_consumed = input_kinetic_energy + energy_added  # in Watts
 
         # Calculate output flow using energy balance at outlet
-        output_volumetric_flow = (2 * energy_added * self.cross_sectional_area**2 / input_density) ** (1 / 3) if input_density != 0 else 0
-        output_mass_flow = output_volumetric_flow * input_density  # in kg/s
+        if np.ndim(input_density) == 0:
+            output_volumetric_flow = (2 * energy_added * self.cross_sectional_area**2 / input_density) ** (1 / 3) if input_density != 0 else 0
+        else:
+            safe_density = np.where(input_density != 0, input_density, 1)
+            output_volumetric_flow = np.where(
+                input_density != 0,
+                (2 * energy_added * self.cross_sectional_area**2 / safe_density) ** (1 / 3),
+                0
+            )
+        return output_volumetric_flow, power_consumed
+
+    def pump_process_batch(self, **kwargs):
+        """
+        Vectorized pump process over a batch of inlet flows and compositions.
+        
+        Array counterpart of pump_process(), evaluating the same energy balance
+        element-wise for every sample in the batch.
+        
+        Args:
+            input_volume_flow (array-like): Inlet volumetric flow rates in m³/s, shape (N,)
+            input_composition (array-like): Component volume fractions with columns
+                ordered (ethanol, water, sugar, fiber), shape (N, 4) or (4,)
+        
+        Returns:
+            tuple: (output_mass_flow, output_volumetric_flow, power_consumed), each an
+                array of shape (N,) with the same units as pump_process()
+        """
+        input_volume_flow = np.asarray(kwargs.get("input_volume_flow", 0), dtype=float)  # in m³/s
+        input_composition = np.asarray(kwargs.get("input_composition", np.zeros(4)), dtype=float)
+        
+        # Calculate solution density as weighted average of component densities (kg/m³)
+        input_density = (
+            input_composition[..., 0] * Process.DENSITY_ETHANOL +
+            input_composition[..., 1] * Process.DENSITY_WATER +
+            input_composition[..., 2] * Process.DENSITY_SUGAR +
+            input_composition[..., 3] * Process.DENSITY_FIBER
+        )
+        
+        output_volumetric_flow, power_consumed = self._energy_balance(input_volume_flow, input_density)
+        output_mass_flow = output_volumetric_flow * input_density
 
         return output_mass_flow, output_volumetric_flow, power_consumed
+
+    def pump_process_state(self, state):
+        """
+        Pump a FlowState.
+
+        Applies the pump_process() energy balance to the state's total flow and
+        reported composition; the outlet component flows are the outlet total
+        flow split by that composition. Works for single flows and batches.
+
+        Args:
+            state (FlowState): Inlet flow
+
+        Returns:
+            tuple: (output_state, power_consumed)
+                - output_state (FlowState): Flow at the pump outlet
+                - power_consumed (float or array): Mechanical power consumed by pump in Watts
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            mark = profiler.start()
+
+        output_volumetric_flow, power_consumed = self._energy_balance(state.total_volumetric_flow, state.density())
+        state = state.from_composition(state.composition, output_volumetric_flow)
+        if profiler is not None:
+            profiler.lap(mark, self, "flow")
+        return state, power_consumed
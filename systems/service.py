@@ -0,0 +1,351 @@
+"""
+Local micro-batching simulation service.
+
+A SimulationService holds compiled facilities in memory and serves evaluation
+requests over a localhost TCP socket. Concurrent requests for the same facility
+and interval are coalesced into one Facility.facility_process_batch() call:
+a batch is evaluated as soon as it reaches max_batch requests, or max_delay
+seconds after its first request arrived, whichever comes first.
+
+The protocol is newline-delimited JSON. Each request is an object
+
+    {"id": 1, "facility": "standard", "input_volume_composition": {...},
+     "input_volumetric_flow": 0.01, "interval": 1}
+
+and each response {"id": 1, "result": {...}} with the facility_process()
+result layout, or {"id": 1, "error": "..."}. Responses are written as their
+batches complete, so a client may pipeline many requests on one connection
+and must match responses by id.
+
+    service = SimulationService({"standard": facility})
+    await service.start()                      # or serve({"standard": facility})
+    async with await ServiceClient.connect(*service.address) as client:
+        result = await client.evaluate(input_volume_composition=feed, input_volumetric_flow=0.01)
+"""
+import asyncio
+import json
+import numpy as np
+from .flow import COMPONENTS
+
+
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def _split(output, count):
+    """Split a batch result into per-request results of plain floats."""
+    if isinstance(output, dict):
+        columns = {key: _split(value, count) for key, value in output.items()}
+        return [{key: column[i] for key, column in columns.items()} for i in range(count)]
+    return np.broadcast_to(np.asarray(output, dtype=float), (count,)).tolist()
+
+
+class SimulationService:
+    """
+    Asyncio service that batches facility evaluations.
+
+    Attributes:
+        facilities (dict): Facility name → Facility.
+        batches (int): Batch evaluations run so far.
+        evaluated (int): Requests answered so far.
+    """
+
+    def __init__(self, facilities, **kwargs):
+        """
+        Initialize the service.
+
+        Args:
+            facilities (dict): Facility name → Facility. Each is compiled up front.
+            max_batch (int, optional): Largest batch evaluated at once. Default is 1024.
+            max_delay (float, optional): Latency budget in seconds: the longest a
+                request waits for others to join its batch. Default is 0.002.
+            host (str, optional): Address to listen on; must be a loopback address.
+                Default is "127.0.0.1".
+            port (int, optional): Port to listen on; 0 picks a free port. Default is 0.
+
+        Raises:
+            ValueError: If no facilities are given or host is not a loopback address.
+        """
+        if not facilities:
+            raise ValueError("At least one facility is required")
+        self.host = kwargs.get("host", "127.0.0.1")
+        if self.host not in LOCAL_HOSTS:
+            raise ValueError(f"The simulation service only listens on localhost, not {self.host}")
+        self.port = kwargs.get("port", 0)
+        self.max_batch = kwargs.get("max_batch", 1024)
+        self.max_delay = kwargs.get("max_delay", 0.002)
+
+        self.facilities = dict(facilities)
+        for facility in self.facilities.values():
+            facility.compile()
+        self.server = None
+        self.pending = {}
+        self.batches = 0
+        self.evaluated = 0
+
+    @property
+    def address(self):
+        """(host, port) the service is listening on, or None before start()."""
+        if self.server is None:
+            return None
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        """Start listening for connections."""
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+
+    async def stop(self):
+        """Stop listening, evaluate batches still pending and close the server."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for key in list(self.pending):
+            self._flush(key)
+
+    async def serve_forever(self):
+        """Start the service if needed and serve until cancelled."""
+        if self.server is None:
+            await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def evaluate(self, **kwargs):
+        """
+        Evaluate one input through a facility, batched with concurrent requests.
+
+        Args:
+            facility (str, optional): Facility name. May be omitted when the service
+                holds a single facility.
+            input_volume_composition (dict): Component volumetric fractions (0-1);
+                missing components are zero.
+            input_volumetric_flow (float): Total input volumetric flow rate in m³/s.
+            interval (float, optional): Time interval in seconds for energy
+                calculations. Default is 1.
+
+        Returns:
+            dict: Same layout as Facility.facility_process().
+
+        Raises:
+            KeyError: For an unknown facility name.
+            ValueError: If the facility produces a non-positive flow for this input.
+        """
+        name = kwargs.get("facility")
+        if name is None and len(self.facilities) == 1:
+            name = next(iter(self.facilities))
+        if name not in self.facilities:
+            raise KeyError(f"Unknown facility: {name}")
+        composition = kwargs.get("input_volume_composition", {})
+        row = [float(composition.get(component, 0)) for component in COMPONENTS]
+        flow = float(kwargs.get("input_volumetric_flow", 0))
+        key = (name, float(kwargs.get("interval", 1)))
+
+        future = asyncio.get_running_loop().create_future()
+        batch = self.pending.get(key)
+        if batch is None:
+            batch = self.pending[key] = {"rows": [], "flows": [], "futures": []}
+            batch["timer"] = asyncio.get_running_loop().call_later(self.max_delay, self._flush, key)
+        batch["rows"].append(row)
+        batch["flows"].append(flow)
+        batch["futures"].append(future)
+        if len(batch["futures"]) >= self.max_batch:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key):
+        """Evaluate a pending batch and resolve its futures."""
+        batch = self.pending.pop(key, None)
+        if batch is None:
+            return
+        batch["timer"].cancel()
+        name, interval = key
+        facility = self.facilities[name]
+        futures = batch["futures"]
+        self.batches += 1
+        self.evaluated += len(futures)
+        rows, flows = batch["rows"], batch["flows"]
+        try:
+            try:
+                output = facility.facility_process_batch(
+                    input_volume_composition=np.array(rows),
+                    input_volumetric_flow=np.array(flows),
+                    interval=interval
+                )
+            except ValueError:
+                # One bad input fails the whole batch: find the offending requests one
+                # at a time and evaluate the rest together, so every request gets the
+                # batch result whatever else shares its batch
+                valid = []
+                for i, future in enumerate(futures):
+                    try:
+                        facility.facility_process_batch(
+                            input_volume_composition=np.array(rows[i:i + 1]),
+                            input_volumetric_flow=np.array(flows[i:i + 1]),
+                            interval=interval
+                        )
+                    except ValueError as error:
+                        if not future.done():
+                            future.set_exception(error)
+                    else:
+                        valid.append(i)
+                futures = [futures[i] for i in valid]
+                if not futures:
+                    return
+                output = facility.facility_process_batch(
+                    input_volume_composition=np.array([rows[i] for i in valid]),
+                    input_volumetric_flow=np.array([flows[i] for i in valid]),
+                    interval=interval
+                )
+        except Exception as error:
+            # Any other failure must still resolve the batch, or its requests wait forever
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for future, result in zip(futures, _split(output, len(futures))):
+            if not future.done():
+                future.set_result(result)
+
+    async def _handle(self, reader, writer):
+        """Serve one connection: read requests, write responses as they complete."""
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(self._respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _respond(self, line, writer):
+        """Evaluate one request line and write its response."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.pop("id", None)
+            response = json.dumps({"id": request_id, "result": await self.evaluate(**request)})
+        except Exception as error:
+            # Every request gets a response line, or its client waits forever
+            response = json.dumps({"id": request_id, "error": str(error)})
+        writer.write((response + "\n").encode())
+        await writer.drain()
+
+
+class ServiceClient:
+    """Asyncio client for a SimulationService connection, with request pipelining."""
+
+    def __init__(self, reader, writer):
+        """
+        Wrap an open connection; use ServiceClient.connect() to open one.
+
+        Args:
+            reader (asyncio.StreamReader): Connection reader.
+            writer (asyncio.StreamWriter): Connection writer.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.waiting = {}
+        self.listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        """
+        Connect to a running service.
+
+        Args:
+            host (str, optional): Service host. Default is "127.0.0.1".
+            port (int, optional): Service port. Default is 8765.
+
+        Returns:
+            ServiceClient: The connected client.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def evaluate(self, **kwargs):
+        """
+        Send one evaluation request and wait for its result.
+
+        Args:
+            **kwargs: Request fields, as for SimulationService.evaluate().
+
+        Returns:
+            dict: Same layout as Facility.facility_process().
+
+        Raises:
+            RuntimeError: If the service reports an error for the request.
+            ConnectionError: If the connection closes before the response arrives.
+        """
+        self.next_id += 1
+        request_id = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write((json.dumps(dict(kwargs, id=request_id)) + "\n").encode())
+        await self.writer.drain()
+        return await future
+
+    async def _listen(self):
+        """Resolve waiting requests as responses arrive."""
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self.waiting.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(RuntimeError(response["error"]))
+                else:
+                    future.set_result(response["result"])
+        finally:
+            for future in self.waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection to simulation service closed"))
+            self.waiting.clear()
+
+    async def close(self):
+        """Close the connection."""
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self.listener.cancel()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+        return False
+
+
+def serve(facilities, **kwargs):
+    """
+    Run a SimulationService until interrupted.
+
+    Args:
+        facilities (dict): Facility name → Facility.
+        **kwargs: SimulationService options (max_batch, max_delay, host, port).
+            The port defaults to 8765 here.
+    """
+    kwargs.setdefault("port", 8765)
+    service = SimulationService(facilities, **kwargs)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,253 @@
+"""
+Immutable component specifications.
+
+Processors, connectors and pumps keep their configuration together with
+runtime state (logs, profiler hooks, bound methods). A spec holds only the
+configuration: it is a frozen, hashable value that pickles to a few hundred
+bytes and builds a fresh runtime component on demand, so catalogs can be
+shared between facilities and broadcast to worker processes without carrying
+or mixing logs:
+
+    fermenters = [FermentationSpec(name="Premium", efficiency=0.9, cost_per_flow=460000)]
+    facility = build_standard_facility(fermenters[0], ...)   # fresh Fermentation per facility
+    spec_of(Fermentation(efficiency=0.9)) == FermentationSpec(efficiency=0.9, power_consumption_unit="W")
+"""
+import math
+from dataclasses import dataclass, fields
+from typing import ClassVar
+from .process import Process
+from .processors import Fermentation, Filtration, Distillation, Dehydration
+from .connectors import Pipe, Bend, Valve
+from .pump import Pump
+from .cache import component_fingerprint
+
+
+class ComponentSpec:
+    """Base of the spec types: builds its component_type from its fields."""
+    __slots__ = ()
+    component_type: ClassVar[type] = None
+
+    def build(self):
+        """
+        Build a runtime component with empty logs.
+
+        Returns:
+            The new component.
+        """
+        return self.component_type(**{field.name: getattr(self, field.name) for field in fields(self)})
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessSpec(ComponentSpec):
+    """Configuration of a pass-through Process; fields are its constructor arguments."""
+    component_type: ClassVar[type] = Process
+    name: str = "Process"
+    efficiency: float = 1.0
+    power_consumption_rate: float = 0
+    power_consumption_unit: str = "kWh/day"
+    cost: float = 0
+    cost_per_flow: float = 0
+
+    @classmethod
+    def from_component(cls, component):
+        """Spec fields of a runtime component; power is recorded in Watts."""
+        return cls(
+            name=component.name,
+            efficiency=float(component.efficiency),
+            power_consumption_rate=float(component.power_consumption_rate),
+            power_consumption_unit="W",
+            cost=float(component.cost),
+            cost_per_flow=float(component.cost_per_flow)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FermentationSpec(ProcessSpec):
+    """Configuration of a Fermentation process."""
+    component_type: ClassVar[type] = Fermentation
+    name: str = "Fermentation"
+
+
+@dataclass(frozen=True, slots=True)
+class FiltrationSpec(ProcessSpec):
+    """Configuration of a Filtration process."""
+    component_type: ClassVar[type] = Filtration
+    name: str = "Filtration"
+
+
+@dataclass(frozen=True, slots=True)
+class DistillationSpec(ProcessSpec):
+    """Configuration of a Distillation process."""
+    component_type: ClassVar[type] = Distillation
+    name: str = "Distillation"
+
+
+@dataclass(frozen=True, slots=True)
+class DehydrationSpec(ProcessSpec):
+    """Configuration of a Dehydration process."""
+    component_type: ClassVar[type] = Dehydration
+    name: str = "Dehydration"
+
+
+@dataclass(frozen=True, slots=True)
+class PipeSpec(ComponentSpec):
+    """Configuration of a Pipe; fields are its constructor arguments."""
+    component_type: ClassVar[type] = Pipe
+    length: float = 1.0
+    friction_factor: float = 0.02
+    diameter: float = 0.1
+    cost: float = 0
+
+    @classmethod
+    def from_component(cls, component):
+        """Spec fields of a runtime component."""
+        return cls(
+            length=float(component.length),
+            friction_factor=float(component.friction_factor),
+            diameter=float(component.diameter),
+            cost=float(component.cost)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class BendSpec(ComponentSpec):
+    """Configuration of a Bend; fields are its constructor arguments."""
+    component_type: ClassVar[type] = Bend
+    bend_radius: float = 0.5
+    bend_factor: float = 0.9
+    diameter: float = 0.1
+    cost: float = 0
+
+    @classmethod
+    def from_component(cls, component):
+        """Spec fields of a runtime component."""
+        return cls(
+            bend_radius=float(component.bend_radius),
+            bend_factor=float(component.bend_factor),
+            diameter=float(component.diameter),
+            cost=float(component.cost)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ValveSpec(ComponentSpec):
+    """Configuration of a Valve; fields are its constructor arguments."""
+    component_type: ClassVar[type] = Valve
+    resistance_coefficient: float = 1.0
+    diameter: float = 0.1
+    cost: float = 0
+
+    @classmethod
+    def from_component(cls, component):
+        """Spec fields of a runtime component."""
+        return cls(
+            resistance_coefficient=float(component.resistance_coefficient),
+            diameter=float(component.diameter),
+            cost=float(component.cost)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PumpSpec(ComponentSpec):
+    """Configuration of a Pump; fields are its constructor arguments."""
+    component_type: ClassVar[type] = Pump
+    name: str = "Pump"
+    performance_rating: float = 0
+    cost: float = 0
+    efficiency: float = 1.0
+    opening_diameter: float = 0.1
+
+    @classmethod
+    def from_component(cls, component):
+        """Spec fields of a runtime component; the opening diameter is recovered from its area."""
+        return cls(
+            name=component.name,
+            performance_rating=float(component.performance_rating),
+            cost=float(component.cost),
+            efficiency=float(component.efficiency),
+            opening_diameter=_opening_diameter(component.cross_sectional_area)
+        )
+
+
+def _opening_diameter(area):
+    """Diameter whose circular area is exactly area, searching the nearest floats."""
+    diameter = math.sqrt(area / math.pi) * 2
+    candidates = [diameter]
+    above = below = diameter
+    for _ in range(4):
+        above = math.nextafter(above, math.inf)
+        below = math.nextafter(below, 0)
+        candidates += [above, below]
+    for candidate in candidates:
+        if math.pi * (candidate / 2) ** 2 == area:
+            return candidate
+    return diameter
+
+
+SPEC_TYPES = {
+    spec.component_type: spec
+    for spec in [ProcessSpec, FermentationSpec, FiltrationSpec, DistillationSpec, DehydrationSpec,
+                 PipeSpec, BendSpec, ValveSpec, PumpSpec]
+}
+
+
+def spec_of(component):
+    """
+    Get the immutable spec of a runtime component.
+
+    The spec must rebuild an identically configured component: components with
+    array parameters, a replaced massFlowFunction or power function, or extra
+    attributes have no spec.
+
+    Args:
+        component (Process, Connector or Pump): Component of a built-in type, or a spec
+            (returned unchanged).
+
+    Returns:
+        The spec.
+
+    Raises:
+        TypeError: If the component type has no spec type.
+        ValueError: If the component cannot be reproduced from a spec.
+    """
+    if isinstance(component, ComponentSpec):
+        return component
+    spec_type = SPEC_TYPES.get(type(component))
+    if spec_type is None:
+        raise TypeError(f"No spec type for {type(component).__name__}")
+    try:
+        spec = spec_type.from_component(component)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"{type(component).__name__} parameters are not scalars: {error}") from None
+    if component_fingerprint(spec.build()) != component_fingerprint(component):
+        raise ValueError(f"{type(component).__name__} has configuration a spec cannot represent")
+    return spec
+
+
+def portable(component):
+    """
+    Get the spec of a component when it has one, else the component itself.
+
+    Args:
+        component: Component or spec.
+
+    Returns:
+        The spec, or the component unchanged.
+    """
+    try:
+        return spec_of(component)
+    except (TypeError, ValueError):
+        return component
+
+
+def instantiate(component):
+    """
+    Get a runtime component: build a spec, pass a component through.
+
+    Args:
+        component: Spec or runtime component.
+
+    Returns:
+        Runtime component.
+    """
+    return component.build() if isinstance(component, ComponentSpec) else component
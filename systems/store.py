@@ -0,0 +1,259 @@
+"""
+Persistent storage of sweep and simulation results.
+
+A ResultStore is a single-table SQLite database of result rows keyed by a
+digest of the facility configuration and its inputs. Rows are appended in
+batches, one transaction per batch, so an interrupted sweep keeps every
+completed chunk and can resume by skipping keys already stored.
+"""
+import hashlib
+import sqlite3
+import numpy as np
+
+
+def fingerprint_digest(fingerprint):
+    """
+    Digest a component or facility fingerprint into a short, process-independent string.
+
+    Args:
+        fingerprint (tuple): Fingerprint from component_fingerprint() or
+            Facility.fingerprint().
+
+    Returns:
+        str: Hex digest.
+    """
+    return hashlib.sha1(repr(fingerprint).encode()).hexdigest()
+
+
+def result_key(digests, *inputs):
+    """
+    Build the storage key of one result.
+
+    Args:
+        digests (list): Fingerprint digests of the pump and every component, in order.
+        *inputs (float): Evaluation inputs (feed composition, flow, interval, ...).
+
+    Returns:
+        str: Hex digest identifying the configuration and inputs.
+    """
+    text = "|".join(digests) + "|" + "|".join(repr(float(value)) for value in inputs)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class ResultStore:
+    """
+    SQLite-backed store of columnar result tables.
+
+    The schema is taken from the first appended table: integer columns become
+    INTEGER, floating-point columns REAL and everything else TEXT, with "key"
+    as the primary key and an index on every other column, so queries by
+    configuration attributes and metric ranges use indexes. NaN values are
+    stored as NULL and read back as NaN.
+    """
+
+    def __init__(self, path=":memory:", **kwargs):
+        """
+        Open (or create) a result store.
+
+        Args:
+            path (str, optional): Database file path. Default is ":memory:".
+            table (str, optional): Table name. Default is "results".
+            indexed (list, optional): Columns to index when the table is created.
+                Default is every column.
+        """
+        self.path = path
+        self.table = kwargs.get("table", "results")
+        self.indexed = kwargs.get("indexed", None)
+        self.connection = sqlite3.connect(path)
+        if path != ":memory:":
+            # Readers are not blocked by appends, and a crash keeps committed batches
+            self.connection.execute("PRAGMA journal_mode=WAL")
+        self.columns = {
+            row[1]: row[2]
+            for row in self.connection.execute(f'PRAGMA table_info("{self.table}")')
+        }
+
+    def _create(self, table):
+        """Create the table and its indexes from a columnar table."""
+        columns = {}
+        for name, values in table.items():
+            kind = np.asarray(values).dtype.kind
+            columns[name] = "INTEGER" if kind in "iub" else "REAL" if kind == "f" else "TEXT"
+        definitions = ", ".join(
+            f'"{name}" {sqltype}' + (" PRIMARY KEY" if name == "key" else "")
+            for name, sqltype in columns.items()
+        )
+        with self.connection:
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({definitions})')
+            for name in self.indexed if self.indexed is not None else columns:
+                if name != "key":
+                    self.connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{self.table}_{name}" ON "{self.table}" ("{name}")'
+                    )
+        self.columns = columns
+
+    def append(self, table):
+        """
+        Append a columnar table in one transaction, replacing rows with existing keys.
+
+        Args:
+            table (dict): Column name → array, including a "key" column.
+
+        Raises:
+            ValueError: If the table has no "key" column or its columns do not
+                match the stored schema.
+        """
+        if "key" not in table:
+            raise ValueError("Result tables need a 'key' column")
+        if not self.columns:
+            self._create(table)
+        if set(table) != set(self.columns):
+            raise ValueError(f"Columns {sorted(table)} do not match stored columns {sorted(self.columns)}")
+
+        names = list(self.columns)
+        columns = [np.asarray(table[name]).tolist() for name in names]
+        placeholders = ", ".join("?" for _ in names)
+        quoted = ", ".join(f'"{name}"' for name in names)
+        with self.connection:
+            self.connection.executemany(
+                f'INSERT OR REPLACE INTO "{self.table}" ({quoted}) VALUES ({placeholders})',
+                zip(*columns)
+            )
+
+    def contains(self, keys):
+        """
+        Find which keys are already stored.
+
+        Args:
+            keys (iterable): Keys to look up.
+
+        Returns:
+            set: The stored subset of keys.
+        """
+        keys = list(keys)
+        found = set()
+        if not self.columns:
+            return found
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            found.update(
+                row[0] for row in self.connection.execute(
+                    f'SELECT "key" FROM "{self.table}" WHERE "key" IN ({placeholders})', batch
+                )
+            )
+        return found
+
+    def fetch(self, keys):
+        """
+        Read the rows for a list of keys.
+
+        Args:
+            keys (iterable): Keys to read.
+
+        Returns:
+            dict: Columnar table of the stored rows, in no particular order.
+        """
+        keys = list(keys)
+        rows = []
+        if self.columns:
+            quoted = ", ".join(f'"{name}"' for name in self.columns)
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                rows.extend(self.connection.execute(
+                    f'SELECT {quoted} FROM "{self.table}" WHERE "key" IN ({placeholders})', batch
+                ))
+        return self._columnar(rows)
+
+    def query(self, **kwargs):
+        """
+        Select rows by column values and ranges.
+
+        Keyword arguments other than the options below filter on the column of
+        that name: a list or set selects any of its values, a (low, high) tuple
+        selects an inclusive range (either end may be None), and anything else
+        selects equal values.
+
+        Args:
+            order_by (str, optional): Column to sort by; prefix with "-" for
+                descending order. Default is None (storage order).
+            limit (int, optional): Maximum number of rows. Default is None.
+            **filters: Column filters, e.g. fermenter="Premium",
+                ethanol_mass_flow=(0.5, None), pump=["Cheap", "Value"].
+
+        Returns:
+            dict: Columnar table of the matching rows.
+
+        Raises:
+            ValueError: For filters or order_by on unknown columns.
+        """
+        order_by = kwargs.pop("order_by", None)
+        limit = kwargs.pop("limit", None)
+        if not self.columns:
+            return self._columnar([])
+
+        clauses = []
+        parameters = []
+        for name, condition in kwargs.items():
+            if name not in self.columns:
+                raise ValueError(f"Unknown column: {name}")
+            if isinstance(condition, tuple):
+                low, high = condition
+                if low is not None:
+                    clauses.append(f'"{name}" >= ?')
+                    parameters.append(low)
+                if high is not None:
+                    clauses.append(f'"{name}" <= ?')
+                    parameters.append(high)
+            elif isinstance(condition, (list, set, frozenset)):
+                values = list(condition)
+                clauses.append(f'"{name}" IN ({", ".join("?" for _ in values)})')
+                parameters.extend(values)
+            else:
+                clauses.append(f'"{name}" = ?')
+                parameters.append(condition)
+
+        quoted = ", ".join(f'"{name}"' for name in self.columns)
+        sql = f'SELECT {quoted} FROM "{self.table}"'
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by is not None:
+            column = order_by.lstrip("-")
+            if column not in self.columns:
+                raise ValueError(f"Unknown column: {column}")
+            sql += f' ORDER BY "{column}"' + (" DESC" if order_by.startswith("-") else "")
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(int(limit))
+        return self._columnar(self.connection.execute(sql, parameters).fetchall())
+
+    def _columnar(self, rows):
+        """Convert fetched rows to a dict of arrays typed by the schema."""
+        table = {}
+        for i, (name, sqltype) in enumerate(self.columns.items()):
+            values = [row[i] for row in rows]
+            if sqltype == "REAL":
+                table[name] = np.asarray(values, dtype=float)
+            elif sqltype == "INTEGER":
+                table[name] = np.asarray(values, dtype=int)
+            else:
+                table[name] = np.asarray(values, dtype=object)
+        return table
+
+    def __len__(self):
+        """Number of stored rows."""
+        if not self.columns:
+            return 0
+        return self.connection.execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,351 @@
+"""
+Surrogate lookup tables of facility response curves.
+
+A ResponseTable holds the facility response (ethanol mass flow, power, cost and
+net power) sampled on a grid over the input flow and, optionally, over a line
+of feed compositions from one feed to another. Grid intervals are bisected
+until linear interpolation reproduces the simulation at every interval
+midpoint within rtol of each output's largest magnitude, so the grid is dense
+only where the response curves. Every grid cell keeps an error estimate, which
+is reported with each answer: twice the error measured at its midpoints, raised
+to twice the error measured at its quarter points when the table is built. It is
+a heuristic estimate, not a guaranteed bound; a response with features narrower
+than a cell can exceed it.
+
+Queries inside the grid are answered by interpolation in microseconds; queries
+outside it (flows beyond the range, or compositions off the feed line) fall
+back to the full simulation:
+
+    table = facility.response_table(input_volume_composition=feed, flow_range=(0.002, 0.05))
+    table.save("tables/standard.npz")
+    table = ResponseTable.load("tables/standard.npz", facility)
+    table.query(input_volumetric_flow=0.013)["net_power_gained"]
+"""
+import json
+import numpy as np
+from .flow import COMPONENTS
+from .store import fingerprint_digest
+
+
+RESPONSE_KEYS = ["ethanol_mass_flow", "total_power_consumed", "total_cost_consumed", "net_power_gained"]
+TABLE_VERSION = 1
+# Interpolation error estimate per measured error: the error of linear
+# interpolation peaks near a cell's midpoint, and for smooth responses rarely
+# exceeds twice the error measured there
+ERROR_SAFETY = 2
+# Cell fractions along the flow axis where build_response_table() checks the estimate
+CHECK_FRACTIONS = np.array([0.25, 0.75])
+
+
+def _as_composition(composition):
+    """Composition dict or array as a float array with columns (ethanol, water, sugar, fiber)."""
+    if isinstance(composition, dict):
+        composition = [composition.get(component, 0) for component in COMPONENTS]
+    return np.asarray(composition, dtype=float)
+
+
+def _simulate(facility, flows, compositions, interval):
+    """Response rows, shape (N, 4), from the compiled facility simulation."""
+    output = facility.facility_process_batch(
+        input_volume_composition=compositions,
+        input_volumetric_flow=flows,
+        interval=interval
+    )
+    return np.column_stack([
+        output["mass_flow"]["amount"]["ethanol"],
+        output["total_power_consumed"],
+        output["total_cost_consumed"],
+        output["net_power_gained"]
+    ])
+
+
+def _midpoint_errors(values, midpoints, axis):
+    """Interpolation error estimate of each interval along an axis, from its midpoint."""
+    lower = np.take(values, np.arange(values.shape[axis] - 1), axis=axis)
+    upper = np.take(values, np.arange(1, values.shape[axis]), axis=axis)
+    return ERROR_SAFETY * np.abs(midpoints - (lower + upper) / 2)
+
+
+def _refine(nodes, errors, tolerance, budget):
+    """Insert the midpoints of intervals whose error exceeds the tolerance, up to budget nodes."""
+    split = np.flatnonzero(np.any(errors > tolerance, axis=tuple(range(1, errors.ndim))))
+    split = split[:max(budget - len(nodes), 0)]
+    if len(split) == 0:
+        return nodes
+    return np.sort(np.concatenate([nodes, (nodes[split] + nodes[split + 1]) / 2]))
+
+
+def build_response_table(facility, **kwargs):
+    """
+    Sample a facility's response on an adaptive grid.
+
+    Every grid pass is one facility_process_batch() call. Refinement alternates
+    between the flow and composition axes until every interval's error estimate
+    is within the tolerance or an axis reaches its node budget; cells left above the
+    tolerance by the budget report their larger error. A final pass simulates the
+    quarter points of every cell and raises any estimate below twice the error
+    measured there.
+
+    Args:
+        facility (Facility): Facility to tabulate.
+        input_volume_composition (dict or array-like): Feed volumetric fractions.
+        composition_to (dict or array-like, optional): Second feed. The table then also
+            spans every mixture (1 - t) * input_volume_composition + t * composition_to
+            for t in [0, 1]. Default is None (one composition).
+        flow_range (tuple): (lowest, highest) input volumetric flow in m³/s.
+        interval (float, optional): Time interval in seconds for energy calculations.
+            Default is 1.
+        rtol (float, optional): Target interpolation error, relative to the largest
+            magnitude of each output over the table. Default is 1e-4.
+        initial_points (int, optional): Starting nodes per axis. Default is 9.
+        max_points (int, optional): Node budget per axis. Default is 2049.
+
+    Returns:
+        ResponseTable: The table.
+
+    Raises:
+        ValueError: If the flow range is empty, or the simulation fails on the grid.
+    """
+    composition = _as_composition(kwargs.get("input_volume_composition", {}))
+    composition_to = kwargs.get("composition_to", None)
+    composition_to = None if composition_to is None else _as_composition(composition_to)
+    lowest, highest = (float(flow) for flow in kwargs["flow_range"])
+    interval = kwargs.get("interval", 1)
+    rtol = kwargs.get("rtol", 1e-4)
+    initial_points = max(kwargs.get("initial_points", 9), 2)
+    max_points = kwargs.get("max_points", 2049)
+    if not highest > lowest:
+        raise ValueError(f"flow_range must be increasing, got ({lowest}, {highest})")
+
+    direction = np.zeros(len(COMPONENTS)) if composition_to is None else composition_to - composition
+
+    def grid_values(flows, mixes):
+        """Response at every (mix, flow) pair, shape (len(mixes), len(flows), 4)."""
+        compositions = composition + mixes[:, None] * direction
+        values = _simulate(facility, np.tile(flows, len(mixes)), np.repeat(compositions, len(flows), axis=0), interval)
+        return values.reshape(len(mixes), len(flows), len(RESPONSE_KEYS))
+
+    flows = np.linspace(lowest, highest, initial_points)
+    mixes = np.zeros(1) if composition_to is None else np.linspace(0, 1, initial_points)
+    while True:
+        values = grid_values(flows, mixes)
+        tolerance = rtol * np.max(np.abs(values), axis=(0, 1))
+        # Flow errors per (mix node, flow interval), mix errors per (mix interval, flow node)
+        flow_errors = _midpoint_errors(values, grid_values((flows[:-1] + flows[1:]) / 2, mixes), axis=1)
+        refined_flows = _refine(flows, np.swapaxes(flow_errors, 0, 1), tolerance, max_points)
+        refined_mixes = mixes
+        if composition_to is not None:
+            mix_errors = _midpoint_errors(values, grid_values(flows, (mixes[:-1] + mixes[1:]) / 2), axis=0)
+            refined_mixes = _refine(mixes, mix_errors, tolerance, max_points)
+        if len(refined_flows) == len(flows) and len(refined_mixes) == len(mixes):
+            break
+        flows, mixes = refined_flows, refined_mixes
+
+    # A cell's error: its worst flow edge plus its worst composition edge
+    errors = np.maximum(flow_errors[:-1], flow_errors[1:]) if composition_to is not None else flow_errors
+    if composition_to is not None:
+        errors = errors + np.maximum(mix_errors[:, :-1], mix_errors[:, 1:])
+
+    # Check the estimates away from the refinement midpoints: quarter points along
+    # the flow axis, at each composition node or composition cell midpoint
+    check_flows = (flows[:-1, None] + np.diff(flows)[:, None] * CHECK_FRACTIONS).ravel()
+    check_mixes = mixes if composition_to is None else (mixes[:-1] + mixes[1:]) / 2
+    table = ResponseTable(
+        facility,
+        flows=flows,
+        mixes=mixes,
+        values=values,
+        errors=errors,
+        input_volume_composition=composition,
+        composition_to=composition_to,
+        interval=interval,
+        rtol=rtol
+    )
+    answer = table.query(
+        input_volumetric_flow=np.tile(check_flows, len(check_mixes)),
+        input_volume_composition=np.repeat(composition + check_mixes[:, None] * direction, len(check_flows), axis=0)
+    )
+    measured = np.abs(np.column_stack([answer[key] for key in RESPONSE_KEYS]) - grid_values(check_flows, check_mixes).reshape(-1, len(RESPONSE_KEYS)))
+    measured = measured.reshape(len(check_mixes), len(flows) - 1, len(CHECK_FRACTIONS), len(RESPONSE_KEYS)).max(axis=2)
+    table.errors = np.maximum(errors, ERROR_SAFETY * measured)
+    return table
+
+
+class ResponseTable:
+    """
+    Facility response sampled on a grid, answered by interpolation.
+
+    The table is a snapshot of the facility configuration it was built from;
+    load() refuses a table built for a different configuration.
+
+    Attributes:
+        facility (Facility): Facility used for queries outside the grid.
+        flows (numpy.ndarray): Flow nodes in m³/s, shape (F,).
+        mixes (numpy.ndarray): Composition nodes t along the feed line, shape (M,);
+            [0] for a single composition.
+        values (numpy.ndarray): Response at the nodes, shape (M, F, 4), outputs
+            ordered as RESPONSE_KEYS.
+        errors (numpy.ndarray): Interpolation error estimate per cell and output,
+            shape (max(M - 1, 1), F - 1, 4).
+        input_volume_composition (numpy.ndarray): Feed at t = 0, shape (4,).
+        composition_to (numpy.ndarray or None): Feed at t = 1.
+        interval (float): Time interval in seconds the energies were computed for.
+        rtol (float): Relative tolerance the grid was refined to.
+        digest (str): Fingerprint digest of the facility configuration.
+    """
+
+    def __init__(self, facility, **kwargs):
+        """
+        Wrap precomputed table arrays; use build_response_table() or
+        Facility.response_table() to sample a facility, load() to read a file.
+
+        Args:
+            facility (Facility): Facility the table belongs to.
+            flows, mixes, values, errors (numpy.ndarray): Table arrays, see Attributes.
+            input_volume_composition (array-like): Feed at t = 0.
+            composition_to (array-like, optional): Feed at t = 1. Default is None.
+            interval (float, optional): Time interval in seconds. Default is 1.
+            rtol (float, optional): Refinement tolerance. Default is 1e-4.
+            digest (str, optional): Configuration digest. Default is the facility's.
+        """
+        self.facility = facility
+        self.flows = np.asarray(kwargs["flows"], dtype=float)
+        self.mixes = np.asarray(kwargs["mixes"], dtype=float)
+        self.values = np.asarray(kwargs["values"], dtype=float)
+        self.errors = np.asarray(kwargs["errors"], dtype=float)
+        self.input_volume_composition = _as_composition(kwargs["input_volume_composition"])
+        composition_to = kwargs.get("composition_to", None)
+        self.composition_to = None if composition_to is None else _as_composition(composition_to)
+        self.interval = kwargs.get("interval", 1)
+        self.rtol = kwargs.get("rtol", 1e-4)
+        self.digest = kwargs.get("digest") or fingerprint_digest(facility.fingerprint())
+        self.direction = (
+            np.zeros(len(COMPONENTS)) if self.composition_to is None
+            else self.composition_to - self.input_volume_composition
+        )
+
+    def __len__(self):
+        """Number of grid nodes."""
+        return self.values.shape[0] * self.values.shape[1]
+
+    def save(self, path):
+        """
+        Write the table to a .npz file.
+
+        Args:
+            path (str): Output file path.
+        """
+        layout = {
+            "version": TABLE_VERSION,
+            "interval": self.interval,
+            "rtol": self.rtol,
+            "digest": self.digest,
+            "outputs": RESPONSE_KEYS
+        }
+        np.savez(
+            path,
+            flows=self.flows,
+            mixes=self.mixes,
+            values=self.values,
+            errors=self.errors,
+            input_volume_composition=self.input_volume_composition,
+            composition_to=np.zeros(0) if self.composition_to is None else self.composition_to,
+            layout=np.array(json.dumps(layout))
+        )
+
+    @classmethod
+    def load(cls, path, facility):
+        """
+        Read a table written by save().
+
+        Args:
+            path (str): Table file.
+            facility (Facility): Facility the table was built for, used for queries
+                outside the grid.
+
+        Returns:
+            ResponseTable: The table.
+
+        Raises:
+            ValueError: If the file version is not supported or the table was built
+                for a different facility configuration.
+        """
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        layout = json.loads(str(arrays.pop("layout")))
+        if layout.get("version") != TABLE_VERSION:
+            raise ValueError(f"Unsupported response table version: {layout.get('version')}")
+        if layout["digest"] != fingerprint_digest(facility.fingerprint()):
+            raise ValueError("Response table was built for a different facility configuration")
+        if arrays["composition_to"].size == 0:
+            arrays["composition_to"] = None
+        return cls(facility, interval=layout["interval"], rtol=layout["rtol"], digest=layout["digest"], **arrays)
+
+    def query(self, **kwargs):
+        """
+        Answer response queries by interpolation, simulating those outside the grid.
+
+        Args:
+            input_volumetric_flow (float or array-like): Input volumetric flows in m³/s.
+            input_volume_composition (dict or array-like, optional): Feed volumetric
+                fractions, shape (4,) or (N, 4). Default is the table's first feed.
+            composition_tolerance (float, optional): Largest distance of a composition
+                from the feed line that still counts as on it. Default is 1e-9.
+
+        Returns:
+            dict: Floats for a single query, arrays of shape (N,) otherwise:
+                - "ethanol_mass_flow", "total_power_consumed", "total_cost_consumed",
+                  "net_power_gained": Response values
+                - "error" (dict): Estimated absolute interpolation error per output;
+                  0 for simulated queries
+                - "interpolated": Whether the answer came from the table
+
+        Raises:
+            ValueError: If a query outside the grid fails to simulate.
+        """
+        flows = kwargs.get("input_volumetric_flow", 0)
+        composition = kwargs.get("input_volume_composition", None)
+        composition = self.input_volume_composition if composition is None else _as_composition(composition)
+        scalar = np.ndim(flows) == 0 and composition.ndim == 1
+        flows = np.atleast_1d(np.asarray(flows, dtype=float))
+        compositions = np.broadcast_to(composition, np.broadcast_shapes(composition.shape, (len(flows), len(COMPONENTS))))
+        flows = np.broadcast_to(flows, (len(compositions),))
+
+        # Position along the feed line, and whether the composition is on it
+        offsets = compositions - self.input_volume_composition
+        length = self.direction @ self.direction
+        mixes = offsets @ self.direction / length if length > 0 else np.zeros(len(flows))
+        residual = np.max(np.abs(offsets - mixes[:, None] * self.direction), axis=1)
+        inside = (
+            (flows >= self.flows[0]) & (flows <= self.flows[-1])
+            & (mixes >= self.mixes[0]) & (mixes <= self.mixes[-1])
+            & (residual <= kwargs.get("composition_tolerance", 1e-9))
+        )
+
+        # Bilinear interpolation in the enclosing cell
+        i = np.clip(np.searchsorted(self.flows, flows, side="right") - 1, 0, len(self.flows) - 2)
+        weight = np.clip((flows - self.flows[i]) / (self.flows[i + 1] - self.flows[i]), 0, 1)[:, None]
+        if len(self.mixes) > 1:
+            j = np.clip(np.searchsorted(self.mixes, mixes, side="right") - 1, 0, len(self.mixes) - 2)
+            mix_weight = np.clip((mixes - self.mixes[j]) / (self.mixes[j + 1] - self.mixes[j]), 0, 1)[:, None]
+            lower = self.values[j, i] * (1 - weight) + self.values[j, i + 1] * weight
+            upper = self.values[j + 1, i] * (1 - weight) + self.values[j + 1, i + 1] * weight
+            result = lower * (1 - mix_weight) + upper * mix_weight
+        else:
+            j = np.zeros_like(i)
+            result = self.values[0, i] * (1 - weight) + self.values[0, i + 1] * weight
+        errors = self.errors[j, i]
+
+        outside = np.flatnonzero(~inside)
+        if len(outside):
+            result[outside] = _simulate(self.facility, flows[outside], compositions[outside], self.interval)
+            errors[outside] = 0
+
+        if scalar:
+            result, errors, inside = result[0].tolist(), errors[0].tolist(), bool(inside[0])
+        else:
+            result, errors = result.T, errors.T
+        output = {key: result[k] for k, key in enumerate(RESPONSE_KEYS)}
+        output["error"] = {key: errors[k] for k, key in enumerate(RESPONSE_KEYS)}
+        output["interpolated"] = inside
+        return output
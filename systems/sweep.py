@@ -0,0 +1,498 @@
+from .facility import Facility
+from .connectors import Pipe, Valve, Bend
+from .prefix import PrefixTrie
+from .cache import component_fingerprint
+from .store import fingerprint_digest, result_key
+from .specs import instantiate, portable
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import itertools
+import math
+import os
+import numpy as np
+
+
+# Fitting costs (USD) by pipe diameter (m) for the standard facility layout
+VALVE_COST = {0.10: 270, 0.11: 323, 0.12: 694, 0.13: 1700, 0.14: 3700, 0.15: 6900}
+BEND_COST = {0.10: 128, 0.11: 190, 0.12: 700, 0.13: 1800, 0.14: 4100, 0.15: 8000}
+FEET_TO_METERS = 0.3048
+
+
+def build_standard_facility(fermenter, filtration, distillation, dehydration, pump, diameter=0.12, friction_factor=0.02):
+    """
+    Build the standard facility layout used by the design-space analysis.
+
+    Structure: Pump → Fermenter → Filter → Distiller → Dehydrator → Output, with a
+    valve after every process and pipe/bend runs between them.
+
+    Args:
+        fermenter, filtration, distillation, dehydration (Process or ProcessSpec): Processor
+            options. Specs are built into fresh components, so facilities built from one
+            spec catalog never share logs.
+        pump (Pump or PumpSpec): Pump option.
+        diameter (float, optional): Pipe, valve and bend diameter in meters. Default is 0.12 m.
+        friction_factor (float, optional): Darcy friction factor for all pipes. Default is 0.02.
+
+    Returns:
+        Facility: The assembled facility.
+    """
+    fermenter, filtration, distillation, dehydration, pump = (
+        instantiate(option) for option in (fermenter, filtration, distillation, dehydration, pump)
+    )
+    facility = Facility(pump=pump, components=[])
+
+    valve_cost = VALVE_COST.get(diameter, 694)
+    bend_cost = BEND_COST.get(diameter, 700)
+    pipe_length = 20 * FEET_TO_METERS
+    pipe_cost = pipe_length * friction_factor
+
+    # Pump to Fermenter
+    facility.add_component(Valve(diameter=diameter, cost=valve_cost))
+    facility.add_component(fermenter)
+    facility.add_component(Valve(diameter=diameter, cost=valve_cost))
+
+    # Fermenter to Filtration (20ft)
+    facility.add_component(Pipe(length=pipe_length, friction_factor=friction_factor, diameter=diameter, cost=pipe_cost))
+    facility.add_component(filtration)
+    facility.add_component(Valve(diameter=diameter, cost=valve_cost))
+
+    # Filtration to Distillation (20ft)
+    facility.add_component(Pipe(length=pipe_length, friction_factor=friction_factor, diameter=diameter, cost=pipe_cost))
+    facility.add_component(distillation)
+    facility.add_component(Valve(diameter=diameter, cost=valve_cost))
+
+    # Distillation to Dehydration with bends
+    facility.add_component(Pipe(length=pipe_length, friction_factor=friction_factor, diameter=diameter, cost=pipe_cost))
+    facility.add_component(Bend(diameter=diameter, bend_radius=diameter * 2, bend_factor=0.7, cost=bend_cost))
+    facility.add_component(Pipe(length=pipe_length, friction_factor=friction_factor, diameter=diameter, cost=pipe_cost))
+    facility.add_component(Bend(diameter=diameter, bend_radius=diameter * 2, bend_factor=0.7, cost=bend_cost))
+    facility.add_component(Pipe(length=10 * FEET_TO_METERS, friction_factor=friction_factor, diameter=diameter, cost=pipe_cost / 2))
+
+    facility.add_component(dehydration)
+    facility.add_component(Valve(diameter=diameter, cost=valve_cost))
+
+    # Output pipes
+    facility.add_component(Pipe(length=5 * FEET_TO_METERS, friction_factor=friction_factor, diameter=diameter, cost=pipe_cost / 4))
+    facility.add_component(Bend(diameter=diameter, bend_radius=diameter * 2, bend_factor=0.7, cost=bend_cost))
+    facility.add_component(Pipe(length=15 * FEET_TO_METERS, friction_factor=friction_factor, diameter=diameter, cost=pipe_cost * 0.75))
+
+    return facility
+
+
+class DesignSweep:
+    """
+    Evaluates every facility configuration in a design space, optionally in parallel.
+
+    The design space is the Cartesian product of the option lists for each slot
+    (pump, fermenter, filtration, distillation, dehydration) and the pipe parameters
+    (diameter, friction factor). Configurations are enumerated by index, so each one
+    is evaluated exactly once, and work is distributed to a process pool in chunks.
+    Results are returned as a columnar table: a dict mapping column names to arrays.
+
+    Options may be runtime components or immutable specs (systems.specs). Worker
+    processes receive the catalog as specs, so it pickles to a few hundred bytes
+    per option whatever logs the components carry, and each process builds its
+    own runtime instances once; options without a spec (custom functions, array
+    parameters) are sent as they are.
+    """
+    SLOTS = ["pump", "fermenter", "filtration", "distillation", "dehydration"]
+    METRICS = [
+        "ethanol_mass_flow",
+        "total_power_consumed",
+        "total_cost_consumed",
+        "power_generated",
+        "net_power_gained",
+        "facility_cost"
+    ]
+
+    def __init__(self, **kwargs):
+        """
+        Initialize a design sweep.
+
+        Args:
+            pumps (list): Pump options (Pump or PumpSpec).
+            fermenters (list): Fermentation options (Fermentation or FermentationSpec).
+            filtrations (list): Filtration options (Filtration or FiltrationSpec).
+            distillations (list): Distillation options (Distillation or DistillationSpec).
+            dehydrations (list): Dehydration options (Dehydration or DehydrationSpec).
+            diameters (list, optional): Pipe diameters in meters. Default is [0.12].
+            friction_factors (list, optional): Pipe friction factors. Default is [0.02].
+            input_volume_composition (dict, optional): Component volumetric fractions of the
+                feed. Default is 60% water, 20% sugar, 20% fiber.
+            input_volumetric_flow (float or list, optional): Input flow rate(s) in m³/s to
+                evaluate for every configuration. Default is 0.01 m³/s.
+            interval (float, optional): Time interval in seconds for energy calculations.
+                Default is 86400 (one day).
+            build_facility (callable, optional): Picklable function with the signature of
+                build_standard_facility(). Default is build_standard_facility.
+            share_prefixes (bool, optional): Evaluate each chunk through a PrefixTrie, so
+                configurations pay only for the part of their chain after the longest
+                prefix shared with an earlier configuration in the chunk. Requires
+                build_facility to insert the option objects themselves, with every other
+                component depending only on diameter and friction factor (true for
+                build_standard_facility). Results match facility_process(), which can
+                differ from the default batch evaluation in the last digits. Default
+                is False.
+        """
+        catalog = {
+            "pump": kwargs.get("pumps", []),
+            "fermenter": kwargs.get("fermenters", []),
+            "filtration": kwargs.get("filtrations", []),
+            "distillation": kwargs.get("distillations", []),
+            "dehydration": kwargs.get("dehydrations", [])
+        }
+        # Runtime instances for evaluation; specs are built once here
+        self.options = {slot: [instantiate(option) for option in options] for slot, options in catalog.items()}
+        self.diameters = list(kwargs.get("diameters", [0.12]))
+        self.friction_factors = list(kwargs.get("friction_factors", [0.02]))
+        composition = kwargs.get("input_volume_composition", {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2})
+        self.input_volume_composition = [composition.get(component, 0) for component in Facility.COMPONENTS]
+        self.input_volumetric_flow = np.atleast_1d(np.asarray(kwargs.get("input_volumetric_flow", 0.01), dtype=float))
+        self.interval = kwargs.get("interval", 86400)
+        self.build_facility = kwargs.get("build_facility", build_standard_facility)
+        self.share_prefixes = kwargs.get("share_prefixes", False)
+
+        self.shape = tuple(len(self.options[slot]) for slot in DesignSweep.SLOTS) + (
+            len(self.diameters), len(self.friction_factors)
+        )
+
+    def __getstate__(self):
+        """Pickle the option catalog as specs, without runtime state."""
+        state = dict(vars(self))
+        state["options"] = {slot: [portable(option) for option in options] for slot, options in self.options.items()}
+        return state
+
+    def __setstate__(self, state):
+        """Build this process's runtime instances from the pickled specs."""
+        state["options"] = {slot: [instantiate(option) for option in options] for slot, options in state["options"].items()}
+        vars(self).update(state)
+
+    def __len__(self):
+        """Number of configurations in the design space."""
+        return math.prod(self.shape)
+
+    def configurations(self):
+        """
+        Enumerate the design space lazily.
+
+        Returns:
+            iterator: Tuples of option indices ordered (pump, fermenter, filtration,
+                distillation, dehydration, diameter, friction_factor).
+        """
+        return itertools.product(*(range(n) for n in self.shape))
+
+    def build(self, indices):
+        """
+        Build the facility for one configuration.
+
+        Args:
+            indices (tuple): Option indices as produced by configurations().
+
+        Returns:
+            Facility: The assembled facility.
+        """
+        pump, fermenter, filtration, distillation, dehydration = (
+            self.options[slot][i] for slot, i in zip(DesignSweep.SLOTS, indices)
+        )
+        return self.build_facility(
+            fermenter, filtration, distillation, dehydration, pump,
+            diameter=self.diameters[indices[5]],
+            friction_factor=self.friction_factors[indices[6]]
+        )
+
+    def evaluate_chunk(self, chunk):
+        """
+        Evaluate a chunk of configurations at every input flow.
+
+        Configurations that fail to simulate (for example because a stage produces
+        no output) are kept with NaN metrics so the table stays rectangular.
+
+        Args:
+            chunk (list): Configuration index tuples.
+
+        Returns:
+            dict: Columnar table with one row per (configuration, input flow) pair.
+        """
+        num_flows = len(self.input_volumetric_flow)
+        columns = {name: [] for name in self.column_names()}
+        if self.share_prefixes:
+            trie = PrefixTrie()
+            templates = {}
+
+        for indices in chunk:
+            if self.share_prefixes:
+                facility = self.build_shared(indices, templates)
+                metrics = self._evaluate_prefixes(trie, facility)
+            else:
+                facility = self.build(indices)
+                try:
+                    output = facility.facility_process_batch(
+                        input_volume_composition=self.input_volume_composition,
+                        input_volumetric_flow=self.input_volumetric_flow,
+                        interval=self.interval
+                    )
+                    metrics = {
+                        "ethanol_mass_flow": output["mass_flow"]["amount"]["ethanol"],
+                        "total_power_consumed": output["total_power_consumed"],
+                        "total_cost_consumed": output["total_cost_consumed"],
+                        "power_generated": output["power_generated"],
+                        "net_power_gained": output["net_power_gained"]
+                    }
+                except (ValueError, ZeroDivisionError):
+                    metrics = {name: np.full(num_flows, np.nan) for name in DesignSweep.METRICS[:-1]}
+            metrics["facility_cost"] = np.full(num_flows, facility.cost)
+
+            config_index = np.ravel_multi_index(indices, self.shape)
+            columns["config_index"].extend([config_index] * num_flows)
+            for slot, i in zip(DesignSweep.SLOTS, indices):
+                columns[slot].extend([self.options[slot][i].name] * num_flows)
+            columns["diameter"].extend([self.diameters[indices[5]]] * num_flows)
+            columns["friction_factor"].extend([self.friction_factors[indices[6]]] * num_flows)
+            columns["input_flow"].extend(self.input_volumetric_flow.tolist())
+            for name in DesignSweep.METRICS:
+                columns[name].extend(np.asarray(metrics[name], dtype=float).tolist())
+
+        return {name: np.asarray(values) for name, values in columns.items()}
+
+    def build_shared(self, indices, templates):
+        """
+        Build the facility for one configuration from shared component instances.
+
+        One facility is built per (diameter, friction factor) pair and kept in
+        templates; every configuration with that pair reuses its connectors and
+        swaps in its own option objects, so configurations share component
+        objects wherever their chains agree. Falls back to build() when the
+        template does not contain each option object exactly once.
+
+        Args:
+            indices (tuple): Option indices as produced by configurations().
+            templates (dict): Template cache, filled on first use of each pair.
+
+        Returns:
+            Facility: The assembled facility.
+        """
+        pipe_parameters = indices[5:]
+        template = templates.get(pipe_parameters)
+        if template is None:
+            facility = self.build((0,) * len(DesignSweep.SLOTS) + pipe_parameters)
+            positions = {}
+            for slot in DesignSweep.SLOTS[1:]:
+                matches = [i for i, component in enumerate(facility.components)
+                           if component is self.options[slot][0]]
+                if len(matches) != 1:
+                    positions = None
+                    break
+                positions[slot] = matches[0]
+            if positions is not None and facility.pump is not self.options["pump"][0]:
+                positions = None
+            template = templates[pipe_parameters] = (facility, positions)
+
+        facility, positions = template
+        if positions is None:
+            return self.build(indices)
+        components = list(facility.components)
+        for slot, i in zip(DesignSweep.SLOTS[1:], indices[1:5]):
+            components[positions[slot]] = self.options[slot][i]
+        return type(facility)(pump=self.options["pump"][indices[0]], components=components)
+
+    def _evaluate_prefixes(self, trie, facility):
+        """Metrics of one facility at every input flow, evaluated through a PrefixTrie."""
+        composition = dict(zip(Facility.COMPONENTS, self.input_volume_composition))
+        metrics = {name: np.full(len(self.input_volumetric_flow), np.nan) for name in DesignSweep.METRICS[:-1]}
+        for j, flow in enumerate(self.input_volumetric_flow.tolist()):
+            try:
+                output = trie.evaluate(
+                    facility,
+                    input_volume_composition=composition,
+                    input_volumetric_flow=flow,
+                    interval=self.interval
+                )
+                values = [
+                    output["mass_flow"]["amount"]["ethanol"],
+                    output["total_power_consumed"],
+                    output["total_cost_consumed"],
+                    output["power_generated"],
+                    output["net_power_gained"]
+                ]
+            except (ValueError, ZeroDivisionError):
+                continue
+            # Losses exceeding the kinetic power give complex flows; the batch path reports NaN
+            if any(isinstance(value, complex) for value in values):
+                continue
+            for name, value in zip(DesignSweep.METRICS[:-1], values):
+                metrics[name][j] = value
+        return metrics
+
+    def result_keys(self, indices, memo):
+        """
+        Storage keys of one configuration, one per input flow.
+
+        Keys digest the fingerprints of the pump and every component together with
+        the feed composition, input flow and interval, so they identify a result
+        independently of option order or process. Shared instances from
+        build_shared() are digested once per memo.
+
+        Args:
+            indices (tuple): Option indices as produced by configurations().
+            memo (dict): Digest and template cache, reused between calls.
+
+        Returns:
+            list: One key (str) per input flow.
+        """
+        templates = memo.setdefault("templates", {})
+        digests = memo.setdefault("digests", {})
+        if "options" not in memo:
+            memo["options"] = True
+            for options in self.options.values():
+                for option in options:
+                    digests[id(option)] = fingerprint_digest(component_fingerprint(option))
+
+        known = len(templates)
+        facility = self.build_shared(indices, templates)
+        if len(templates) > known:
+            # Template connectors are kept alive by the template, so their ids stay valid
+            template = templates[indices[5:]][0]
+            for component in template.components:
+                digests.setdefault(id(component), fingerprint_digest(component_fingerprint(component)))
+
+        parts = [
+            digests.get(id(component)) or fingerprint_digest(component_fingerprint(component))
+            for component in [facility.pump] + facility.components
+        ]
+        return [
+            result_key(parts, *self.input_volume_composition, flow, self.interval)
+            for flow in self.input_volumetric_flow.tolist()
+        ]
+
+    def column_names(self):
+        """Column names of the result table, in order."""
+        return ["config_index"] + DesignSweep.SLOTS + ["diameter", "friction_factor", "input_flow"] + DesignSweep.METRICS
+
+    def iter_results(self, **kwargs):
+        """
+        Evaluate the design space and stream results chunk by chunk.
+
+        Chunks are yielded as soon as they complete, so with workers > 1 they may
+        arrive out of order. At most two chunks per worker are in flight at a time,
+        which keeps memory bounded for arbitrarily large design spaces.
+
+        Args:
+            workers (int, optional): Number of worker processes. 1 evaluates in the
+                calling process. Default is os.cpu_count().
+            chunk_size (int, optional): Configurations per chunk. Default splits the
+                design space into about four chunks per worker.
+            store (ResultStore, optional): Store that receives every chunk, with an
+                added "key" column (see result_keys()), as soon as it completes.
+                Configurations whose results are all stored already are skipped, so
+                an interrupted sweep resumes where it stopped. Default is None.
+
+        Returns:
+            iterator: Columnar tables (dicts of arrays), one per chunk.
+        """
+        workers = kwargs.get("workers", os.cpu_count() or 1)
+        chunk_size = kwargs.get("chunk_size", None) or max(1, math.ceil(len(self) / (4 * workers)))
+        store = kwargs.get("store", None)
+
+        configurations = self.configurations()
+        chunks = iter(lambda: list(itertools.islice(configurations, chunk_size)), [])
+        if store is not None:
+            pending = {}
+            chunks = self._unstored(chunks, store, pending)
+
+        for table in self._evaluate_chunks(chunks, workers):
+            if store is not None:
+                num_flows = len(self.input_volumetric_flow)
+                keys = []
+                for config_index in table["config_index"][::num_flows].tolist():
+                    keys.extend(pending.pop(config_index))
+                table["key"] = np.asarray(keys)
+                store.append(table)
+            yield table
+
+    def _unstored(self, chunks, store, pending):
+        """Drop stored configurations from chunks, recording the keys of the rest."""
+        memo = {}
+        for chunk in chunks:
+            keys = [self.result_keys(indices, memo) for indices in chunk]
+            stored = store.contains(key for row in keys for key in row)
+            remaining = []
+            for indices, row in zip(chunk, keys):
+                if not stored.issuperset(row):
+                    pending[int(np.ravel_multi_index(indices, self.shape))] = row
+                    remaining.append(indices)
+            if remaining:
+                yield remaining
+
+    def _evaluate_chunks(self, chunks, workers):
+        """Evaluate chunks in this process or a process pool, yielding tables as they complete."""
+        if workers <= 1:
+            for chunk in chunks:
+                yield self.evaluate_chunk(chunk)
+            return
+
+        # Each worker receives the sweep (and its option catalog) once at startup
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker, initargs=(self,)) as executor:
+            pending = set()
+            for chunk in chunks:
+                pending.add(executor.submit(_evaluate_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in wait(pending).done:
+                yield future.result()
+
+    def run(self, **kwargs):
+        """
+        Evaluate the whole design space and collect a single columnar table.
+
+        Args:
+            workers (int, optional): Number of worker processes. Default is os.cpu_count().
+            chunk_size (int, optional): Configurations per chunk.
+            store (ResultStore, optional): Store to resume from and append to. The
+                returned table then covers the whole design space, read back from the
+                store, and includes the "key" column.
+
+        Returns:
+            dict: Column name → array, one row per (configuration, input flow) pair,
+                ordered by configuration index. Pass to pandas.DataFrame for analysis.
+        """
+        store = kwargs.get("store", None)
+        if store is not None:
+            for _ in self.iter_results(**kwargs):
+                pass
+            return self._read_back(store)
+        tables = list(self.iter_results(**kwargs))
+        if not tables:
+            return {name: np.asarray([]) for name in self.column_names()}
+        table = {name: np.concatenate([t[name] for t in tables]) for name in self.column_names()}
+        order = np.argsort(table["config_index"], kind="stable")
+        return {name: values[order] for name, values in table.items()}
+
+    def _read_back(self, store):
+        """Read this design space's results from a store, ordered by configuration index."""
+        memo = {}
+        positions = {}
+        for indices in self.configurations():
+            config_index = int(np.ravel_multi_index(indices, self.shape))
+            for j, key in enumerate(self.result_keys(indices, memo)):
+                positions[key] = (config_index, j)
+        table = store.fetch(positions)
+        # Stored indices may come from a sweep with the options in another order
+        located = np.asarray([positions[key] for key in table["key"].tolist()], dtype=int).reshape(-1, 2)
+        table["config_index"] = located[:, 0]
+        order = np.lexsort((located[:, 1], located[:, 0]))
+        return {name: values[order] for name, values in table.items()}
+
+
+_worker_sweep = None
+
+
+def _initialize_worker(sweep):
+    """Store the sweep broadcast to this worker process."""
+    global _worker_sweep
+    _worker_sweep = sweep
+
+
+def _evaluate_chunk(chunk):
+    """Evaluate a chunk of configurations in a worker process."""
+    return _worker_sweep.evaluate_chunk(chunk)
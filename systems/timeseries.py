@@ -0,0 +1,229 @@
+"""
+Columnar, memory-mapped plant time series.
+
+Historian exports (CSV files of timestamp, flow and composition columns) are
+converted once with convert_csv() into a directory of raw binary columns plus
+a JSON description. TimeSeries opens that directory with memory mapping, so
+replays start immediately, only the pages actually read are loaded, and the
+simulation drivers receive zero-copy array slices:
+
+    series = convert_csv("historian.csv", "data/historian")   # once
+    series = TimeSeries("data/historian")                     # every replay
+    for chunk in facility.facility_process_series(series):
+        ...
+"""
+import json
+import os
+import numpy as np
+import pandas as pd
+from .flow import COMPONENTS
+
+
+LAYOUT_FILE = "series.json"
+LAYOUT_VERSION = 1
+
+
+def convert_csv(csv_path, directory, **kwargs):
+    """
+    Convert a time-series CSV into the memory-mappable columnar layout.
+
+    The CSV is read in chunks and appended column by column, so files larger
+    than memory can be converted. The layout description is written last, so
+    an interrupted conversion is never mistaken for a complete one.
+
+    Timestamps are stored as datetime64[ns] when the column holds dates and as
+    float seconds when it is numeric. Composition columns missing from the CSV
+    are filled with zeros.
+
+    Args:
+        csv_path (str): Source CSV file.
+        directory (str): Output directory, created if needed. Existing series
+            files in it are overwritten.
+        timestamp_column (str, optional): Timestamp column name. Default is "timestamp".
+        flow_column (str, optional): Total volumetric flow column (m³/s). Default is
+            "volumetric_flow".
+        composition_columns (dict, optional): Component → CSV column of its volumetric
+            fraction. Default maps each component (ethanol, water, sugar, fiber) to a
+            column of the same name.
+        chunk_size (int, optional): Rows parsed per chunk. Default is 1000000.
+
+    Returns:
+        TimeSeries: The converted series, opened from directory.
+
+    Raises:
+        ValueError: If the timestamp or flow column is missing, or timestamps change
+            between dates and numbers part way through the file.
+    """
+    timestamp_column = kwargs.get("timestamp_column", "timestamp")
+    flow_column = kwargs.get("flow_column", "volumetric_flow")
+    composition_columns = kwargs.get("composition_columns", {component: component for component in COMPONENTS})
+    chunk_size = kwargs.get("chunk_size", 1000000)
+
+    header = pd.read_csv(csv_path, nrows=0).columns
+    for column in (timestamp_column, flow_column):
+        if column not in header:
+            raise ValueError(f"Column not found in {csv_path}: {column}")
+    present = {component: column for component, column in composition_columns.items() if column in header}
+    usecols = [timestamp_column, flow_column] + list(present.values())
+
+    os.makedirs(directory, exist_ok=True)
+    layout_path = os.path.join(directory, LAYOUT_FILE)
+    if os.path.exists(layout_path):
+        os.remove(layout_path)
+
+    rows = 0
+    timestamp_dtype = None
+    with open(os.path.join(directory, "timestamps.bin"), "wb") as timestamps_file, \
+            open(os.path.join(directory, "volumetric_flow.bin"), "wb") as flow_file, \
+            open(os.path.join(directory, "composition.bin"), "wb") as composition_file:
+        for chunk in pd.read_csv(csv_path, usecols=usecols, chunksize=chunk_size):
+            column = chunk[timestamp_column]
+            if pd.api.types.is_numeric_dtype(column):
+                timestamps = column.to_numpy(dtype=np.float64)
+            else:
+                timestamps = pd.to_datetime(column, utc=True).dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")
+            if timestamp_dtype is None:
+                timestamp_dtype = timestamps.dtype
+            elif timestamps.dtype != timestamp_dtype:
+                raise ValueError("Timestamps must be all dates or all numbers")
+
+            composition = np.zeros((len(chunk), len(COMPONENTS)))
+            for i, component in enumerate(COMPONENTS):
+                if component in present:
+                    composition[:, i] = chunk[present[component]].to_numpy(dtype=np.float64)
+
+            timestamps_file.write(np.ascontiguousarray(timestamps).tobytes())
+            flow_file.write(chunk[flow_column].to_numpy(dtype=np.float64).tobytes())
+            composition_file.write(composition.tobytes())
+            rows += len(chunk)
+
+    layout = {
+        "version": LAYOUT_VERSION,
+        "rows": rows,
+        "components": COMPONENTS,
+        "columns": {
+            "timestamps": {"file": "timestamps.bin", "dtype": np.dtype(timestamp_dtype or np.float64).str, "shape": [rows]},
+            "volumetric_flow": {"file": "volumetric_flow.bin", "dtype": "<f8", "shape": [rows]},
+            "composition": {"file": "composition.bin", "dtype": "<f8", "shape": [rows, len(COMPONENTS)]}
+        },
+        "source": os.path.basename(csv_path)
+    }
+    with open(layout_path, "w") as file:
+        json.dump(layout, file, indent=2)
+    return TimeSeries(directory)
+
+
+class TimeSeries:
+    """
+    Read-only, memory-mapped view of a converted time series.
+
+    Attributes:
+        timestamps (numpy.ndarray): datetime64[ns] or float seconds, shape (N,).
+        volumetric_flow (numpy.ndarray): Total volumetric flow in m³/s, shape (N,).
+        composition (numpy.ndarray): Volumetric fractions ordered (ethanol, water,
+            sugar, fiber), shape (N, 4).
+    """
+
+    def __init__(self, directory):
+        """
+        Open a series converted by convert_csv().
+
+        Args:
+            directory (str): Series directory.
+
+        Raises:
+            FileNotFoundError: If the directory holds no complete series.
+            ValueError: If the layout version is not supported.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, LAYOUT_FILE)) as file:
+            self.layout = json.load(file)
+        if self.layout.get("version") != LAYOUT_VERSION:
+            raise ValueError(f"Unsupported series layout version: {self.layout.get('version')}")
+        for name, column in self.layout["columns"].items():
+            setattr(self, name, self._open(column))
+
+    def _open(self, column):
+        """Memory-map one column file."""
+        shape = tuple(column["shape"])
+        if shape[0] == 0:
+            # Empty files cannot be memory-mapped
+            return np.empty(shape, dtype=column["dtype"])
+        return np.memmap(os.path.join(self.directory, column["file"]), dtype=column["dtype"], mode="r", shape=shape)
+
+    def __len__(self):
+        """Number of records."""
+        return self.layout["rows"]
+
+    def chunks(self, chunk_size=65536, start=0, stop=None):
+        """
+        Iterate over the series in zero-copy slices.
+
+        Args:
+            chunk_size (int, optional): Records per slice. Default is 65536.
+            start (int, optional): First record. Default is 0.
+            stop (int, optional): End record (exclusive). Default is the end.
+
+        Yields:
+            tuple: (timestamps, volumetric_flow, composition) array views.
+        """
+        stop = len(self) if stop is None else stop
+        for begin in range(start, stop, chunk_size):
+            end = min(begin + chunk_size, stop)
+            yield self.timestamps[begin:end], self.volumetric_flow[begin:end], self.composition[begin:end]
+
+    def seconds(self, start=0, stop=None):
+        """
+        Timestamps as float seconds (since the Unix epoch for dates).
+
+        Args:
+            start (int, optional): First record. Default is 0.
+            stop (int, optional): End record (exclusive). Default is the end.
+
+        Returns:
+            numpy.ndarray: Seconds, shape (stop - start,). A view for numeric timestamps.
+        """
+        timestamps = self.timestamps[start:stop]
+        if timestamps.dtype.kind == "M":
+            return timestamps.astype("datetime64[ns]").astype(np.int64) / 1e9
+        return timestamps
+
+    def records(self, start=0, stop=None, chunk_size=65536):
+        """
+        Iterate over (timestamp, volumetric_flow, composition) records.
+
+        Compatibility path for Facility.facility_process_stream(); timestamps are
+        float seconds. Facility.facility_process_series() consumes the arrays
+        directly and is much faster.
+
+        Args:
+            start (int, optional): First record. Default is 0.
+            stop (int, optional): End record (exclusive). Default is the end.
+            chunk_size (int, optional): Records read at a time. Default is 65536.
+
+        Yields:
+            tuple: (seconds, flow, composition row view).
+        """
+        stop = len(self) if stop is None else stop
+        for begin in range(start, stop, chunk_size):
+            end = min(begin + chunk_size, stop)
+            composition = self.composition[begin:end]
+            for i, (timestamp, flow) in enumerate(zip(self.seconds(begin, end).tolist(), self.volumetric_flow[begin:end].tolist())):
+                yield timestamp, flow, composition[i]
+
+    def volumetric_inputs(self, start=0, stop=None):
+        """
+        Inputs for Process.iterateVolumetricFlowInputs(input_type="composition").
+
+        Args:
+            start (int, optional): First record. Default is 0.
+            stop (int, optional): End record (exclusive). Default is the end.
+
+        Returns:
+            tuple: (inputValues, total_flow_list), where inputValues maps each
+                component to a zero-copy column view of its fractions and
+                total_flow_list is a view of the flows.
+        """
+        composition = self.composition[start:stop]
+        inputs = {component: composition[:, i] for i, component in enumerate(COMPONENTS)}
+        return inputs, self.volumetric_flow[start:stop]
@@ -0,0 +1,323 @@
+"""
+Closed-form facility transfer functions.
+
+Every step of Facility.facility_process() is algebraic and scales with the
+input flow: the pump passes Q_out = efficiency^(1/3) * Q_in, the built-in
+processes are ratio-preserving maps (linear, or homogeneous like distillation)
+and connector losses are kinetic, ζ * m * Q² / (2A²). For an input volumetric
+flow Q and composition c the facility response therefore reduces to
+
+    ethanol mass flow  = a(c) * Q
+    power consumed     = P0 + b(c) * Q³
+    cost consumed      = C0 + g(c) * Q
+
+where P0 is the process power draw, C0 the fixed connector cost, a and g are
+linear in c and b is a sum of cubic terms (m_j · c)(q_j · c)², one per loss
+(pump and connectors). A distillation stage, which divides by its input, splits
+the chain into segments: each segment is one coefficient matrix applied to the
+output of the stage before it.
+
+    transfer = facility.transfer_function()
+    transfer.evaluate(input_volume_composition=feed, input_volumetric_flow=0.01)
+    coefficients = transfer.coefficients(feed)     # a, b, g for a fixed feed
+    transfer.evaluate(input_volume_composition=feed, input_volumetric_flow=0.01, verify=True)
+"""
+import numpy as np
+from .process import Process
+from .connectors import Connector
+from .flow import COMPONENTS, DENSITIES
+
+# Segment input features: the four volumetric amounts and the total volumetric flow
+FEATURES = len(COMPONENTS) + 1
+DENSITY_LIST = DENSITIES.tolist()
+VERIFIED_OUTPUTS = ["ethanol_mass_flow", "total_power_consumed", "total_cost_consumed"]
+
+
+def _segment_start():
+    """Amounts, total mass flow and total volumetric flow forms at a segment start."""
+    amounts = np.zeros((FEATURES, len(COMPONENTS)))
+    amounts[:len(COMPONENTS)] = np.eye(len(COMPONENTS))
+    return amounts, amounts @ DENSITIES, amounts.sum(axis=-1)
+
+
+def _columns(forms):
+    """Stack (..., FEATURES) linear forms into a (..., FEATURES, K) matrix."""
+    shape = np.broadcast_shapes(*(np.shape(form) for form in forms))
+    return np.stack([np.broadcast_to(form, shape) for form in forms], axis=-1)
+
+
+class TransferFunction:
+    """
+    Coefficient form of a facility's response to input flow and composition.
+
+    Derived once from the facility's current configuration; like FacilityPlan it
+    is a snapshot, and Facility.transfer_function() rebuilds it after
+    invalidate(). Component parameters may be arrays with one entry per sample.
+
+    Connector losses are grouped by run: between two processes the total mass
+    flow is fixed and each connector only scales the volumetric flow, so a whole
+    run of connectors contributes one term K * (m · x)(q · x)².
+
+    Evaluation does none of the flow checks of facility_process(): inputs for
+    which the simulation raises (non-positive flows) give meaningless values.
+
+    Attributes:
+        facility (Facility): Facility the function was derived from, used by
+            verification.
+        fixed_power (float or numpy.ndarray): P0, flow-independent power draw in Watts.
+        fixed_cost (float or numpy.ndarray): C0, flow-independent cost in USD.
+        segments (list): (matrix, run_losses, process, kernel) per segment. The matrix maps
+            segment features (volumetric amounts and total volumetric flow at unit
+            input flow) to [ethanol mass flow, cost per flow, total mass flow of
+            each connector run, total volumetric flow of each run, output
+            volumetric amounts]; process is the nonlinear process that ends the
+            segment and kernel its vectorized transform, both None for the last one.
+    """
+
+    def __init__(self, facility):
+        """
+        Derive the transfer function of a facility.
+
+        Args:
+            facility (Facility): Facility whose pump and components are reduced.
+
+        Raises:
+            ValueError: If a component has no closed form (a process with a custom
+                massFlowFunction or a connector without a kinetic loss factor).
+        """
+        pump = facility.pump
+        self.facility = facility
+        self.ethanol_energy_density = facility.ETHANOL_ENERGY_DENSITY
+        self.pump_cost = pump.cost
+        # P_pump = (1 + efficiency) * ρ * Q³ / (2A²) and Q_out = efficiency^(1/3) * Q
+        self.pump_loss = (1 + np.asarray(pump.efficiency, dtype=float)) / (2 * pump.cross_sectional_area**2)
+        self.pump_gain = np.asarray(pump.efficiency, dtype=float) ** (1 / 3)
+        self.fixed_power = 0
+        self.fixed_cost = 0
+        self.segments = []
+
+        # Segment 0 starts at the pump outlet, whose total flow is the pump's own
+        amounts, total_mass, total_volume = _segment_start()
+        total_volume = np.eye(FEATURES)[-1]
+        cost = np.zeros(FEATURES)
+        runs = []
+        run_loss, flow_ratio = None, 1.0
+
+        for component in facility.components:
+            if isinstance(component, Process):
+                self.fixed_power = self.fixed_power + component.power_consumption_rate
+                operator = component.massFlowOperator()
+                if operator is None:
+                    raise ValueError(f"{component.name} has no closed form; use facility_process()")
+                if run_loss is not None:
+                    runs.append((total_mass, total_volume, run_loss))
+                run_loss, flow_ratio = None, 1.0
+                if operator.linear:
+                    # Volumetric amounts → output mass amounts
+                    mass = np.matmul(amounts, np.swapaxes(operator.matrix * DENSITIES, -1, -2))
+                    amounts = mass / DENSITIES
+                    total_mass, total_volume = mass.sum(axis=-1), amounts.sum(axis=-1)
+                    cost = cost + np.asarray(component.cost_per_flow)[..., None] * total_volume
+                    continue
+                # A nonlinear stage ends the segment; the next starts from its output
+                self._close_segment(amounts, cost, runs, component)
+                amounts, total_mass, total_volume = _segment_start()
+                cost = np.asarray(component.cost_per_flow)[..., None] * total_volume
+                runs = []
+            elif isinstance(component, Connector):
+                self.fixed_cost = self.fixed_cost + component.cost
+                loss_factor = component.lossFactor()
+                if loss_factor is None:
+                    raise ValueError(f"{type(component).__name__} has no kinetic loss factor; use facility_process()")
+                # P_loss = ζ * m * Q² / (2A²) at the flow reaching this connector
+                loss = loss_factor / (2 * component.cross_sectional_area**2) * flow_ratio**2
+                run_loss = loss if run_loss is None else run_loss + loss
+                # Q_out = Q * (1 - ζ)^(1/3); ζ > 1 has no physical outlet flow, but a
+                # flow already stopped by an earlier connector stays zero
+                loss_factor = np.asarray(loss_factor, dtype=float)
+                ratio = np.where(loss_factor <= 1, np.abs(1 - loss_factor) ** (1 / 3), np.nan)
+                flow_ratio = np.where(flow_ratio != 0, flow_ratio * ratio, 0)
+        if run_loss is not None:
+            runs.append((total_mass, total_volume, run_loss))
+        self._close_segment(amounts, cost, runs, None)
+
+        # Plain-float coefficients for single inputs with scalar parameters
+        self._scalar_segments = None
+        if all(segment[0].ndim == 2 for segment in self.segments) and all(
+            np.ndim(value) == 0 for value in (self.pump_loss, self.pump_gain, self.pump_cost, self.fixed_power, self.fixed_cost)
+        ):
+            self._scalar_segments = [
+                (matrix, run_losses.tolist(), process.massFlowFunction if process is not None else None)
+                for matrix, run_losses, process, _ in self.segments
+            ]
+
+    def _close_segment(self, amounts, cost, runs, process):
+        """Store a segment as one coefficient matrix."""
+        columns = [amounts[..., 0] * DENSITIES[0], cost]
+        columns += [mass for mass, _, _ in runs] + [volume for _, volume, _ in runs]
+        if process is not None:
+            columns += [amounts[..., i] for i in range(len(COMPONENTS))]
+        run_losses = _columns([loss for _, _, loss in runs]) if runs else np.zeros(0)
+        kernel = process.massFlowOperator().kernel if process is not None else None
+        self.segments.append((_columns(columns), run_losses, process, kernel))
+
+    def coefficients(self, input_volume_composition):
+        """
+        Flow coefficients for one or more compositions.
+
+        Args:
+            input_volume_composition (dict or array-like): Component volumetric
+                fractions, as a dict or with columns ordered (ethanol, water, sugar,
+                fiber), shape (4,) or (N, 4).
+
+        Returns:
+            dict: Coefficients of the response at flow Q, each a float or an array:
+                - "ethanol" (a): ethanol mass flow = a * Q, in kg/s per m³/s
+                - "power" (b): total power consumed = fixed_power + b * Q³
+                - "cost" (g): total cost consumed = fixed_cost + g * Q
+                - "fixed_power" (P0), "fixed_cost" (C0)
+        """
+        if isinstance(input_volume_composition, dict):
+            input_volume_composition = [float(input_volume_composition.get(component, 0)) for component in COMPONENTS]
+        input_volume_composition = np.asarray(input_volume_composition, dtype=float)
+        if self._scalar_segments is not None and input_volume_composition.ndim == 1:
+            ethanol, power, cost = self._scalar_coefficients(input_volume_composition.tolist())
+        else:
+            ethanol, power, cost = self._batch_coefficients(input_volume_composition)
+        return {
+            "ethanol": ethanol,
+            "power": power,
+            "cost": cost,
+            "fixed_power": self.fixed_power,
+            "fixed_cost": self.fixed_cost
+        }
+
+    def _scalar_coefficients(self, composition):
+        """Coefficients of one composition as floats."""
+        power = float(self.pump_loss) * sum(fraction * density for fraction, density in zip(composition, DENSITY_LIST))
+        cost = float(self.pump_cost)
+        features = np.array(composition + [1.0]) * float(self.pump_gain)
+        for matrix, run_losses, mass_flow_function in self._scalar_segments:
+            columns = (features @ matrix).tolist()
+            cost += columns[1]
+            runs = len(run_losses)
+            for loss, mass, volume in zip(run_losses, columns[2:2 + runs], columns[2 + runs:2 + 2 * runs]):
+                power += loss * mass * volume * volume
+            if mass_flow_function is not None:
+                mass = mass_flow_function({
+                    component: amount * density
+                    for component, amount, density in zip(COMPONENTS, columns[-len(COMPONENTS):], DENSITY_LIST)
+                })
+                features = np.array([mass[component] / density for component, density in zip(COMPONENTS, DENSITY_LIST)] + [0.0])
+        return columns[0], power, cost
+
+    def _batch_coefficients(self, composition):
+        """Coefficients of a (4,) or (N, 4) composition array as arrays."""
+        composition = np.atleast_2d(composition)
+        power = self.pump_loss * (composition @ DENSITIES)
+        cost = np.zeros(composition.shape[0]) + self.pump_cost
+        features = np.column_stack([composition, np.ones(composition.shape[0])]) * self.pump_gain[..., None]
+        for matrix, run_losses, _, kernel in self.segments:
+            if matrix.ndim == 2:
+                columns = features @ matrix
+            else:
+                # Per-sample matrices (sampled parameters)
+                columns = np.matmul(features[:, None, :], matrix)[:, 0, :]
+            cost = cost + columns[:, 1]
+            runs = run_losses.shape[-1]
+            if runs:
+                volume = columns[:, 2 + runs:2 + 2 * runs]
+                power = power + (run_losses * columns[:, 2:2 + runs] * volume * volume).sum(axis=-1)
+            if kernel is not None:
+                mass = kernel(columns[:, -len(COMPONENTS):] * DENSITIES)
+                features = np.column_stack([mass / DENSITIES, np.zeros(mass.shape[0])])
+        return columns[:, 0], power, cost
+
+    def evaluate(self, **kwargs):
+        """
+        Evaluate the facility response in closed form.
+
+        Args:
+            input_volume_composition (dict or array-like): Component volumetric
+                fractions, as a dict or with columns ordered (ethanol, water, sugar,
+                fiber), shape (4,) or (N, 4).
+            input_volumetric_flow (float or array-like): Total input volumetric flow
+                rates in m³/s, shape () or (N,).
+            interval (float, optional): Time interval in seconds for energy
+                calculations. Default is 1.
+            verify (bool, optional): Also run the step-by-step simulation for every
+                input and check the closed form against it. Default is False.
+            rtol (float, optional): Relative tolerance of the verification. Default is 1e-9.
+
+        Returns:
+            dict: Floats for a single input, arrays of shape (N,) for a batch:
+                - "ethanol_mass_flow": Ethanol output in kg/s
+                - "total_power_consumed", "total_cost_consumed", "power_generated",
+                  "net_power_gained": As in Facility.facility_process()
+
+        Raises:
+            ValueError: With verify=True, if the closed form disagrees with the simulation.
+        """
+        input_volume_composition = kwargs.get("input_volume_composition", {})
+        flow = kwargs.get("input_volumetric_flow", 0)
+        interval = kwargs.get("interval", 1)
+
+        coefficients = self.coefficients(input_volume_composition)
+        if not isinstance(flow, (int, float)):
+            flow = np.asarray(flow, dtype=float)
+        ethanol = coefficients["ethanol"] * flow
+        total_power_consumed = self.fixed_power + coefficients["power"] * flow**3
+        power_generated = ethanol * self.ethanol_energy_density * interval
+        output = {
+            "ethanol_mass_flow": ethanol,
+            "total_power_consumed": total_power_consumed,
+            "total_cost_consumed": self.fixed_cost + coefficients["cost"] * flow,
+            "power_generated": power_generated,
+            "net_power_gained": power_generated - total_power_consumed
+        }
+        if kwargs.get("verify", False):
+            errors = self.verify(**kwargs)
+            rtol = kwargs.get("rtol", 1e-9)
+            failed = {key: error for key, error in errors.items() if not error <= rtol}
+            if failed:
+                raise ValueError(f"Transfer function disagrees with facility_process(): relative errors {failed}")
+        return output
+
+    def verify(self, **kwargs):
+        """
+        Compare the closed form with the step-by-step simulation.
+
+        Runs Facility.facility_process() for every input, so this costs as much as
+        the simulation itself.
+
+        Args:
+            input_volume_composition (dict or array-like): As for evaluate().
+            input_volumetric_flow (float or array-like): As for evaluate().
+            interval (float, optional): Time interval in seconds. Default is 1.
+
+        Returns:
+            dict: Largest relative error of "ethanol_mass_flow", "total_power_consumed"
+                and "total_cost_consumed" over the inputs.
+        """
+        input_volume_composition = kwargs.get("input_volume_composition", {})
+        interval = kwargs.get("interval", 1)
+        if isinstance(input_volume_composition, dict):
+            input_volume_composition = [input_volume_composition.get(component, 0) for component in COMPONENTS]
+        flows = np.atleast_1d(np.asarray(kwargs.get("input_volumetric_flow", 0), dtype=float))
+        compositions = np.broadcast_to(np.asarray(input_volume_composition, dtype=float), (len(flows), len(COMPONENTS)))
+        closed_form = self.evaluate(input_volume_composition=compositions, input_volumetric_flow=flows, interval=interval)
+
+        simulated = {key: np.empty(len(flows)) for key in VERIFIED_OUTPUTS}
+        for i, (composition, flow) in enumerate(zip(compositions.tolist(), flows.tolist())):
+            result = self.facility.facility_process(
+                input_volume_composition=dict(zip(COMPONENTS, composition)),
+                input_volumetric_flow=flow,
+                interval=interval
+            )
+            simulated["ethanol_mass_flow"][i] = result["mass_flow"]["amount"]["ethanol"]
+            simulated["total_power_consumed"][i] = result["total_power_consumed"]
+            simulated["total_cost_consumed"][i] = result["total_cost_consumed"]
+        return {
+            key: float(np.max(np.abs(closed_form[key] - simulated[key]) / np.maximum(np.abs(simulated[key]), np.finfo(float).tiny)))
+            for key in VERIFIED_OUTPUTS
+        }
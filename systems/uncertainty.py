@@ -0,0 +1,247 @@
+"""
+Monte Carlo uncertainty propagation through a facility.
+
+Component parameters (process efficiencies, pump efficiency, pipe friction
+factors) and the feed composition are drawn from distributions, attached to
+copies of the facility's components as per-sample arrays, and evaluated in one
+vectorized pass through the compiled plan.
+"""
+import copy
+import numpy as np
+from .process import Process
+from .flow import COMPONENTS
+
+
+PERCENTILES = [5, 25, 50, 75, 95]
+METRICS = ["ethanol_mass_flow", "net_power_gained", "total_cost_consumed", "total_power_consumed"]
+
+
+def draw(distribution, size, rng):
+    """
+    Draw samples from a distribution specification.
+
+    Args:
+        distribution: One of
+            - a number: a fixed value
+            - a tuple (name, *parameters) naming a numpy.random.Generator method,
+              e.g. ("normal", 0.9, 0.02), ("uniform", 0.85, 0.95),
+              ("triangular", 0.8, 0.9, 0.95) or ("beta", 40, 5)
+            - a callable (rng, size) → array
+            - an array of exactly size pre-drawn samples
+        size (int): Number of samples.
+        rng (numpy.random.Generator): Random number generator.
+
+    Returns:
+        numpy.ndarray: Samples, shape (size,).
+
+    Raises:
+        ValueError: For an unknown distribution name or samples of the wrong size.
+    """
+    if callable(distribution):
+        values = distribution(rng, size)
+    elif isinstance(distribution, tuple) and distribution and isinstance(distribution[0], str):
+        name, *parameters = distribution
+        sampler = getattr(rng, name, None)
+        if sampler is None:
+            raise ValueError(f"Unknown distribution: {name}")
+        values = sampler(*parameters, size=size)
+    else:
+        values = distribution
+
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 0:
+        values = np.full(size, float(values))
+    if values.shape != (size,):
+        raise ValueError(f"Expected {size} samples, got shape {values.shape}")
+    return values
+
+
+def with_parameters(component, **parameters):
+    """
+    Copy a component with some attributes replaced.
+
+    Methods of the component stored as attributes (such as a processor's
+    massFlowFunction or a connector's powerConsumed) are rebound to the copy,
+    so they see the replaced parameters. The original is not modified.
+
+    Args:
+        component (Process, Connector or Pump): Component to copy.
+        **parameters: Attributes to set on the copy, e.g. efficiency=array.
+
+    Returns:
+        The copy.
+    """
+    clone = copy.copy(component)
+    for name, value in vars(component).items():
+        if getattr(value, "__self__", None) is component:
+            setattr(clone, name, value.__func__.__get__(clone))
+    for name, value in parameters.items():
+        setattr(clone, name, value)
+    return clone
+
+
+def _select(components, key, predicate, description):
+    """Components matching a key: a position, a component, or a name or class name."""
+    if isinstance(key, int):
+        matches = [components[key]]
+    elif isinstance(key, str):
+        matches = [component for component in components
+                   if getattr(component, "name", None) == key or type(component).__name__ == key]
+    else:
+        matches = [component for component in components if component is key]
+    matches = [component for component in matches if predicate(component)]
+    if not matches:
+        raise ValueError(f"No {description} matches {key!r}")
+    return matches
+
+
+def propagate_uncertainty(facility, **kwargs):
+    """
+    Propagate parameter and feed uncertainty through a facility by Monte Carlo.
+
+    Every sample gets its own process efficiencies, pump efficiency, friction
+    factors, feed composition and flow; all samples are evaluated together with
+    Facility.facility_process_batch() on copies of the components, so the
+    facility itself is left unchanged.
+
+    Components in efficiencies and friction_factors are selected by position in
+    facility.components, by the component object, or by name or class name
+    (e.g. "Fermentation" or "Pipe"), which selects every match. Each selected
+    component draws its own independent samples; pass a pre-drawn array to share
+    one set of samples between components.
+
+    Args:
+        facility (Facility): Facility to evaluate.
+        samples (int, optional): Number of Monte Carlo samples. Default is 10000.
+        efficiencies (dict, optional): Process selector → efficiency distribution.
+            Samples above 1 are clipped to 1; samples at or below 0 make their
+            sample degenerate (see "degenerate_count").
+        pump_efficiency (optional): Pump efficiency distribution, treated the same way.
+        friction_factors (dict, optional): Pipe selector → friction factor distribution.
+            Samples are clipped to be non-negative.
+        input_volume_composition (dict, optional): Component → volumetric fraction
+            distribution (or fixed value). Samples are clipped to be non-negative and
+            each sample is normalized to sum to 1. Default is 60% water, 20% sugar,
+            20% fiber.
+        input_volumetric_flow (optional): Input flow distribution in m³/s. Default is 0.01.
+        interval (float, optional): Time interval in seconds. Default is 1.
+        percentiles (list, optional): Percentiles to report. Default is [5, 25, 50, 75, 95].
+        seed (int, optional): Seed for a new random generator. Default is None.
+        rng (numpy.random.Generator, optional): Generator to draw from instead of seed.
+        return_samples (bool, optional): Include per-sample inputs and outputs. Default is False.
+
+    Returns:
+        dict: Results with keys:
+            - "sample_count" (int), "valid_count" (int): samples drawn and samples with
+              finite results (losses exceeding the kinetic power give NaN)
+            - "degenerate_count" (int): samples left out of the statistics because an
+              efficiency was drawn at or below 0, where the model has no result
+            - "percentiles" (list): Reported percentiles
+            - "metrics" (dict): For each of ethanol_mass_flow (kg/s), net_power_gained (J),
+              total_cost_consumed (USD) and total_power_consumed (W): "mean", "std",
+              "min", "max" and "percentiles" (percentile → value), over valid samples
+            - "samples" (dict): Only with return_samples; metric arrays plus the drawn
+              "input_volumetric_flow", "input_volume_composition" and parameters
+
+    Raises:
+        ValueError: For unknown selectors or distributions, or if a sample produces a
+            non-positive flow.
+    """
+    size = kwargs.get("samples", 10000)
+    efficiencies = kwargs.get("efficiencies", {})
+    pump_efficiency = kwargs.get("pump_efficiency", None)
+    friction_factors = kwargs.get("friction_factors", {})
+    composition = kwargs.get("input_volume_composition", {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2})
+    flow = kwargs.get("input_volumetric_flow", 0.01)
+    interval = kwargs.get("interval", 1)
+    percentiles = kwargs.get("percentiles", PERCENTILES)
+    return_samples = kwargs.get("return_samples", False)
+    rng = kwargs.get("rng", None) or np.random.default_rng(kwargs.get("seed", None))
+
+    drawn = {}
+    parameters = {}
+    degenerate = np.zeros(size, dtype=bool)
+
+    def draw_efficiency(distribution):
+        # A zero efficiency divides by zero in distillation and stops the pump, so
+        # such samples are evaluated at efficiency 1 and left out of the statistics
+        values = np.minimum(draw(distribution, size, rng), 1)
+        nonpositive = values <= 0
+        degenerate[nonpositive] = True
+        return values, np.where(nonpositive, 1.0, values)
+
+    for key, distribution in efficiencies.items():
+        for component in _select(facility.components, key, lambda c: isinstance(c, Process), "process"):
+            values, evaluated = draw_efficiency(distribution)
+            parameters.setdefault(id(component), {})["efficiency"] = evaluated
+            drawn[f"efficiency[{facility.components.index(component)}]"] = values
+    for key, distribution in friction_factors.items():
+        for component in _select(facility.components, key, lambda c: hasattr(c, "friction_factor"), "pipe"):
+            values = np.clip(draw(distribution, size, rng), 0, None)
+            parameters.setdefault(id(component), {})["friction_factor"] = values
+            drawn[f"friction_factor[{facility.components.index(component)}]"] = values
+
+    pump = facility.pump
+    if pump_efficiency is not None:
+        values, evaluated = draw_efficiency(pump_efficiency)
+        pump = with_parameters(pump, efficiency=evaluated)
+        drawn["pump_efficiency"] = values
+
+    for component in composition:
+        if component not in COMPONENTS:
+            raise ValueError(f"Unknown component: {component}")
+    compositions = np.column_stack([
+        np.clip(draw(composition.get(component, 0), size, rng), 0, None) for component in COMPONENTS
+    ])
+    compositions /= compositions.sum(axis=1)[:, None]
+    flows = draw(flow, size, rng)
+
+    components = [
+        with_parameters(component, **parameters[id(component)]) if id(component) in parameters else component
+        for component in facility.components
+    ]
+    sampled = type(facility)(pump=pump, components=components)
+    output = sampled.facility_process_batch(
+        input_volume_composition=compositions,
+        input_volumetric_flow=flows,
+        interval=interval
+    )
+
+    values = {
+        "ethanol_mass_flow": output["mass_flow"]["amount"]["ethanol"],
+        "net_power_gained": output["net_power_gained"],
+        "total_cost_consumed": output["total_cost_consumed"],
+        "total_power_consumed": output["total_power_consumed"]
+    }
+    valid = np.logical_and.reduce([np.isfinite(values[metric]) for metric in METRICS]) & ~degenerate
+
+    metrics = {}
+    for metric in METRICS:
+        finite = values[metric][valid]
+        if len(finite) == 0:
+            metrics[metric] = {"mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan,
+                               "percentiles": {p: np.nan for p in percentiles}}
+            continue
+        metrics[metric] = {
+            "mean": float(finite.mean()),
+            "std": float(finite.std()),
+            "min": float(finite.min()),
+            "max": float(finite.max()),
+            "percentiles": dict(zip(percentiles, np.percentile(finite, percentiles).tolist()))
+        }
+
+    result = {
+        "sample_count": size,
+        "valid_count": int(valid.sum()),
+        "degenerate_count": int(degenerate.sum()),
+        "percentiles": list(percentiles),
+        "metrics": metrics
+    }
+    if return_samples:
+        result["samples"] = dict(
+            values,
+            input_volumetric_flow=flows,
+            input_volume_composition=compositions,
+            **drawn
+        )
+    return result
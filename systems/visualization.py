@@ -0,0 +1,84 @@
+"""
+Optional plotting helpers for process logs and facility time series.
+
+matplotlib is imported on first use, so the modeling core (process, facility,
+connectors, pump) never pays its import and backend start-up cost. Install
+it with the "plot" extra: pip install EthanolPlantModel[plot].
+"""
+
+
+def _pyplot():
+    """Import matplotlib.pyplot on demand."""
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError as error:
+        raise ImportError("Plotting requires matplotlib: pip install EthanolPlantModel[plot]") from error
+    return plt
+
+
+def plot_log(process, **kwargs):
+    """
+    Plot per-component columns from one of a process's flow logs.
+
+    Args:
+        process (Process): Process whose logs are plotted.
+        log (str, optional): "input_log" or "output_log". Default is "output_log".
+        flow (str, optional): "mass_flow" or "volumetric_flow". Default is "mass_flow".
+        field (str, optional): "amount" or "composition". Default is "amount".
+        ax (matplotlib Axes, optional): Axes to draw on. Default is a new figure.
+
+    Returns:
+        matplotlib Axes: The axes drawn on.
+    """
+    log = kwargs.get("log", "output_log")
+    flow = kwargs.get("flow", "mass_flow")
+    field = kwargs.get("field", "amount")
+    ax = kwargs.get("ax", None)
+
+    if ax is None:
+        _, ax = _pyplot().subplots()
+
+    for component, values in getattr(process, log)[flow][field].items():
+        if len(values):
+            ax.plot(list(values), label=component)
+
+    unit = {"mass_flow": "kg/s", "volumetric_flow": "m³/s"}[flow] if field == "amount" else "fraction"
+    ax.set_title(f"{process.name} {log.replace('_', ' ')}")
+    ax.set_xlabel("Sample")
+    ax.set_ylabel(f"{flow.replace('_', ' ')} {field} ({unit})")
+    ax.legend()
+    return ax
+
+
+def plot_stream(results, **kwargs):
+    """
+    Plot fields of Facility.facility_process_stream() results against time.
+
+    Args:
+        results (iterable): Result dicts yielded by facility_process_stream().
+        fields (list, optional): Result keys to plot. Default is
+            ["ethanol_mass_flow", "total_power_consumed"].
+        ax (matplotlib Axes, optional): Axes to draw on. Default is a new figure
+            with one subplot per field.
+
+    Returns:
+        list: The matplotlib Axes drawn on, one per field.
+    """
+    fields = kwargs.get("fields", ["ethanol_mass_flow", "total_power_consumed"])
+    ax = kwargs.get("ax", None)
+
+    results = list(results)
+    timestamps = [result["timestamp"] for result in results]
+
+    if ax is None:
+        _, axes = _pyplot().subplots(len(fields), 1, sharex=True, squeeze=False)
+        axes = list(axes[:, 0])
+    else:
+        axes = [ax] * len(fields)
+
+    for axis, field in zip(axes, fields):
+        axis.plot(timestamps, [result[field] for result in results], label=field)
+        axis.set_ylabel(field.replace("_", " "))
+        axis.legend()
+    axes[-1].set_xlabel("Time")
+    return axes
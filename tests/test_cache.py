@@ -0,0 +1,38 @@
+import pytest
+
+from systems.cache import component_fingerprint
+from systems.connectors import Connector, Valve
+from systems.facility import Facility
+from systems.pump import Pump
+
+
+def scaled_loss(factor):
+    return lambda **kwargs: factor * kwargs["input_power"]
+
+
+def test_callable_fingerprint_does_not_depend_on_identity():
+    first = Connector(power_consumed=scaled_loss(0.3))
+    second = Connector(power_consumed=scaled_loss(0.3))
+    other = Connector(power_consumed=scaled_loss(0.4))
+    assert component_fingerprint(first) == component_fingerprint(second)
+    assert component_fingerprint(first) != component_fingerprint(other)
+    assert id(first.powerConsumed) not in component_fingerprint(first)[1][-1]
+
+
+def test_unfingerprintable_callable_is_rejected():
+    class Loss:
+        def __call__(self, **kwargs):
+            return 0
+
+    with pytest.raises(ValueError):
+        component_fingerprint(Connector(power_consumed=Loss()))
+
+
+def test_fingerprint_follows_in_place_parameter_changes():
+    valve = Valve(diameter=0.12, resistance_coefficient=1.0)
+    facility = Facility(pump=Pump(efficiency=0.86), components=[valve])
+    before = facility.fingerprint()
+    valve.resistance_coefficient = 0.5
+    assert facility.fingerprint() != before
+    valve.resistance_coefficient = 1.0
+    assert facility.fingerprint() == before
@@ -0,0 +1,40 @@
+from systems.connectors import Bend, ConnectorRun, Pipe, Valve
+from systems.flow import FlowState
+from systems.profiling import Profiler
+
+
+FEED = {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2}
+
+
+def connectors():
+    return [
+        Valve(diameter=0.12, cost=694, resistance_coefficient=0.5),
+        Pipe(length=6.096, friction_factor=0.002, diameter=0.12, cost=0),
+        Bend(diameter=0.12, bend_factor=0.7, cost=700)
+    ]
+
+
+def test_costs_line_up_with_connectors():
+    run = ConnectorRun(connectors())
+    assert len(run.costs) == len(run.connectors)
+    assert run.costs == [connector.cost for connector in run.connectors]
+
+
+def test_run_matches_connectors_one_by_one():
+    state = FlowState.from_composition(FEED, 0.01)
+    expected, expected_power = state, 0
+    for connector in connectors():
+        expected, power = connector.processFlowState(expected)
+        expected_power += power
+
+    output, power = ConnectorRun(connectors()).processFlowState(state)
+    assert output.total_volumetric_flow == expected.total_volumetric_flow
+    assert power == expected_power
+
+
+def test_profiled_connector_inside_run_reports():
+    run = ConnectorRun(connectors())
+    profiler = Profiler()
+    run.connectors[2].profiler = profiler
+    run.processFlowState(FlowState.from_composition(FEED, 0.01))
+    assert profiler.report()["phases"]["flow"]["calls"] == 1
@@ -0,0 +1,79 @@
+import pytest
+
+from systems.facility import Facility
+from systems.process import Process
+from systems.processors import Fermentation, Filtration, Distillation, Dehydration
+from systems.pump import Pump
+from systems.sweep import build_standard_facility
+
+
+FEED = {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2}
+
+
+def standard():
+    return build_standard_facility(
+        Fermentation(efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000),
+        Filtration(efficiency=0.9, power_consumption_rate=47812, cost_per_flow=460000),
+        Distillation(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Dehydration(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Pump(efficiency=0.86, cost=280000, opening_diameter=0.10, performance_rating=6),
+        friction_factor=0.002
+    )
+
+
+def ethanol(facility, flow):
+    output = facility.facility_process(input_volume_composition=dict(FEED), input_volumetric_flow=flow)
+    return output["mass_flow"]["amount"]["ethanol"]
+
+
+def test_threshold_is_bracketed_within_tolerance():
+    facility = standard()
+    target = ethanol(facility, 0.0123)
+    tolerance = 1e-9
+    flow = facility.find_min_flow(target_ethanol_mass_flow=target, tolerance=tolerance)
+    assert flow == pytest.approx(0.0123, rel=1e-6)
+    assert ethanol(facility, flow) >= target * (1 - 1e-12)
+    assert ethanol(facility, flow - 2 * tolerance) < target
+
+
+def test_nonlinear_response_converges():
+    # Ethanol grows with the square of the fermented flow: regula falsi needs several steps
+    def squared(input):
+        total = input["water"] + input["sugar"] + input["fiber"] + input["ethanol"]
+        return dict(input, ethanol=input["ethanol"] + input["sugar"] * total)
+
+    facility = Facility(pump=Pump(efficiency=0.86, opening_diameter=0.10), components=[
+        Process(name="Squared", massFlowFunction=squared)
+    ])
+    target = ethanol(facility, 0.02)
+    flow = facility.find_min_flow(target_ethanol_mass_flow=target, tolerance=1e-12)
+    assert flow == pytest.approx(0.02, rel=1e-8)
+
+
+def test_threshold_below_the_grid():
+    facility = standard()
+    smallest = 10 * 2.0 ** -40
+    target = ethanol(facility, smallest / 2)
+    flow = facility.find_min_flow(target_ethanol_mass_flow=target, tolerance=1e-18)
+    assert 0 < flow <= smallest
+    assert flow == pytest.approx(smallest / 2, rel=1e-6)
+
+
+def test_unreachable_target_returns_none():
+    facility = standard()
+    target = ethanol(facility, 1.0)
+    assert facility.find_min_flow(target_ethanol_mass_flow=target, max_flow=0.5) is None
+
+
+def test_gallons_per_day_target_matches_mass_flow_target():
+    facility = standard()
+    gallons_per_day = 100000
+    mass_flow = gallons_per_day * Facility.GALLON_VOLUME * Process.DENSITY_ETHANOL / Facility.SECONDS_PER_DAY
+    assert facility.find_min_flow(target_gallons_per_day=gallons_per_day) == \
+        facility.find_min_flow(target_ethanol_mass_flow=mass_flow)
+
+
+@pytest.mark.parametrize("targets", [{}, {"target_ethanol_mass_flow": 1.0, "target_gallons_per_day": 1.0}])
+def test_exactly_one_target_is_required(targets):
+    with pytest.raises(ValueError):
+        standard().find_min_flow(**targets)
@@ -0,0 +1,50 @@
+import pytest
+
+from systems.connectors import Pipe
+from systems.facility import Facility
+from systems.pareto import ParetoSearch
+from systems.processors import Fermentation, Filtration, Distillation, Dehydration
+from systems.pump import Pump
+
+
+FEED = {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2}
+
+
+def catalog():
+    return {
+        "pumps": [Pump(name="Standard", efficiency=0.86, cost=280000, opening_diameter=0.10, performance_rating=6)],
+        "fermenters": [Fermentation(name="Average", efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000)],
+        "filtrations": [Filtration(name="Average", efficiency=0.9, power_consumption_rate=47812, cost_per_flow=460000)],
+        "distillations": [Distillation(name="Average", efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000)],
+        "dehydrations": [Dehydration(name="Average", efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000)]
+    }
+
+
+def lossy_facility(fermenter, filtration, distillation, dehydration, pump, diameter, friction_factor):
+    # Two pipes whose losses exceed the kinetic power: the scalar path turns complex
+    facility = Facility(pump=pump, components=[])
+    for _ in range(2):
+        facility.add_component(Pipe(length=30, friction_factor=friction_factor, diameter=diameter, cost=1))
+    for process in (fermenter, filtration, distillation, dehydration):
+        facility.add_component(process)
+    return facility
+
+
+def test_complex_results_are_left_out():
+    search = ParetoSearch(**catalog(), build_facility=lossy_facility, input_volume_composition=FEED)
+    indices = next(iter(search.configurations()))
+    output = search.build(indices).facility_process(input_volume_composition=dict(FEED), input_volumetric_flow=0.01)
+    assert isinstance(output["total_power_consumed"], complex)
+    assert search.evaluate(indices) is None
+    assert search.run()["evaluated"] == 1
+
+
+def test_configuration_errors_propagate():
+    def broken_mass_flow(input):
+        raise TypeError("unsupported option")
+
+    options = catalog()
+    options["fermenters"][0].massFlowFunction = broken_mass_flow
+    search = ParetoSearch(**options, input_volume_composition=FEED)
+    with pytest.raises(TypeError, match="unsupported option"):
+        search.evaluate(next(iter(search.configurations())))
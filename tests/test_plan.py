@@ -0,0 +1,166 @@
+import math
+
+import numpy as np
+import pytest
+
+from systems.connectors import Bend, Connector, Pipe, Valve
+from systems.facility import Facility
+from systems.plan import FUSED_PROCESSES, KERNEL_PROCESS, LOSS_CONNECTOR, CONNECTOR, PROCESS
+from systems.process import Process
+from systems.processors import Fermentation, Filtration, Distillation, Dehydration
+from systems.pump import Pump
+from systems.sweep import build_standard_facility
+
+
+COMPOSITIONS = [
+    [0.0, 0.6, 0.2, 0.2],
+    [0.05, 0.5, 0.3, 0.15],
+    [0.1, 0.7, 0.15, 0.05]
+]
+FLOWS = [0.002, 0.01, 0.05]
+OUTPUTS = ["ethanol_mass_flow", "total_volumetric_flow", "total_power_consumed", "total_cost_consumed", "net_power_gained"]
+
+
+def processors():
+    return (
+        Fermentation(efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000),
+        Filtration(efficiency=0.9, power_consumption_rate=47812, cost_per_flow=460000),
+        Distillation(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Dehydration(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000)
+    )
+
+
+def pump():
+    return Pump(efficiency=0.86, cost=280000, opening_diameter=0.10, performance_rating=6)
+
+
+def standard(resistance_coefficient=0.5, friction_factor=0.002):
+    facility = build_standard_facility(*processors(), pump(), friction_factor=friction_factor)
+    for component in facility.components:
+        if isinstance(component, Valve):
+            component.resistance_coefficient = resistance_coefficient
+    facility.invalidate()
+    return facility
+
+
+def fused_linear():
+    # Linear processes separated only by loss connectors compile to one fused step
+    fermentation, filtration, _, dehydration = processors()
+    return Facility(pump=pump(), components=[
+        fermentation, Pipe(length=6, friction_factor=0.002, diameter=0.12, cost=5),
+        Valve(diameter=0.12, cost=694, resistance_coefficient=0.2), filtration,
+        Bend(diameter=0.12, bend_factor=0.7, cost=700), dehydration
+    ])
+
+
+def custom():
+    # A process and a connector without closed forms use the fallback plan steps
+    def convert(input):
+        return {
+            "ethanol": input["ethanol"] + 0.1 * input["sugar"],
+            "water": input["water"],
+            "sugar": 0.9 * input["sugar"],
+            "fiber": input["fiber"]
+        }
+
+    fermentation, _, distillation, _ = processors()
+    return Facility(pump=pump(), components=[
+        fermentation, Process(name="Converter", massFlowFunction=convert, cost_per_flow=1000),
+        Connector(diameter=0.12, cost=10, power_consumed=lambda **kwargs: 0.3 * kwargs["input_power"]),
+        distillation, Pipe(length=6, friction_factor=0.002, diameter=0.12, cost=5)
+    ])
+
+
+FACILITIES = {
+    "standard": standard,
+    "fully_closed_valves": lambda: standard(resistance_coefficient=1.0),
+    "fused_linear": fused_linear,
+    "custom": custom
+}
+
+
+def scalar_outputs(facility, composition, flow):
+    output = facility.facility_process(
+        input_volume_composition=dict(zip(Facility.COMPONENTS, composition)),
+        input_volumetric_flow=flow
+    )
+    return {
+        "ethanol_mass_flow": output["mass_flow"]["amount"]["ethanol"],
+        "total_volumetric_flow": output["volumetric_flow"]["total_volumetric_flow"],
+        "total_power_consumed": output["total_power_consumed"],
+        "total_cost_consumed": output["total_cost_consumed"],
+        "net_power_gained": output["net_power_gained"]
+    }
+
+
+def batch_outputs(facility):
+    compositions = np.repeat(COMPOSITIONS, len(FLOWS), axis=0)
+    flows = np.tile(FLOWS, len(COMPOSITIONS))
+    output = facility.facility_process_batch(input_volume_composition=compositions, input_volumetric_flow=flows)
+    columns = {
+        "ethanol_mass_flow": output["mass_flow"]["amount"]["ethanol"],
+        "total_volumetric_flow": output["volumetric_flow"]["total_volumetric_flow"],
+        "total_power_consumed": output["total_power_consumed"],
+        "total_cost_consumed": output["total_cost_consumed"],
+        "net_power_gained": output["net_power_gained"]
+    }
+    return compositions.tolist(), flows.tolist(), columns
+
+
+@pytest.mark.parametrize("name", FACILITIES)
+def test_batch_matches_scalar(name):
+    facility = FACILITIES[name]()
+    compositions, flows, columns = batch_outputs(facility)
+    for i, (composition, flow) in enumerate(zip(compositions, flows)):
+        expected = scalar_outputs(facility, composition, flow)
+        for key in OUTPUTS:
+            assert columns[key][i] == pytest.approx(expected[key], rel=1e-12, abs=1e-12), (key, composition, flow)
+
+
+@pytest.mark.parametrize("name", ["standard", "fully_closed_valves", "fused_linear"])
+def test_transfer_function_matches_scalar(name):
+    facility = FACILITIES[name]()
+    transfer = facility.transfer_function()
+    for composition in COMPOSITIONS:
+        for flow in FLOWS:
+            expected = scalar_outputs(facility, composition, flow)
+            output = transfer.evaluate(input_volume_composition=composition, input_volumetric_flow=flow)
+            for key in ["ethanol_mass_flow", "total_power_consumed", "total_cost_consumed", "net_power_gained"]:
+                assert output[key] == pytest.approx(expected[key], rel=1e-12, abs=1e-12), (key, composition, flow)
+
+
+def test_plan_steps():
+    kinds = lambda facility: [step[0] for step in facility.compile().steps]
+    assert FUSED_PROCESSES in kinds(fused_linear())
+    assert KERNEL_PROCESS in kinds(standard())
+    # The standard layout's runs of pipes, bends and valves merge into one loss step each
+    standard_kinds = kinds(standard())
+    assert not any(a == b == LOSS_CONNECTOR for a, b in zip(standard_kinds, standard_kinds[1:]))
+    assert {PROCESS, CONNECTOR} <= set(kinds(custom()))
+
+
+def test_fully_closed_valve_stops_flow():
+    facility = standard(resistance_coefficient=1.0)
+    expected = scalar_outputs(facility, COMPOSITIONS[0], 0.01)
+    assert expected["total_volumetric_flow"] == 0
+    _, _, columns = batch_outputs(facility)
+    assert np.all(columns["total_volumetric_flow"] == 0)
+
+
+def test_losses_beyond_kinetic_power():
+    # ζ > 1: the scalar path produces complex values, the batch and transfer paths NaN
+    facility = Facility(pump=pump(), components=[
+        Pipe(length=30, friction_factor=0.02, diameter=0.12, cost=1),
+        Pipe(length=30, friction_factor=0.02, diameter=0.12, cost=1),
+        Fermentation(efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000)
+    ])
+    expected = scalar_outputs(facility, COMPOSITIONS[0], 0.01)
+    assert isinstance(expected["total_power_consumed"], complex)
+
+    _, _, columns = batch_outputs(facility)
+    assert np.all(np.isnan(columns["total_power_consumed"]))
+    assert np.all(np.isfinite(columns["total_cost_consumed"]))
+
+    output = facility.transfer_function().evaluate(input_volume_composition=COMPOSITIONS[0], input_volumetric_flow=0.01)
+    assert math.isnan(output["total_power_consumed"])
+    assert output["total_cost_consumed"] == pytest.approx(expected["total_cost_consumed"])
@@ -0,0 +1,61 @@
+import asyncio
+import math
+
+import pytest
+
+from systems.connectors import Pipe
+from systems.facility import Facility
+from systems.pump import Pump
+from systems.service import SimulationService, ServiceClient
+
+
+FEED = {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2}
+
+
+def lossy_facility():
+    # A 30 m pipe loses more than the kinetic power it receives (ζ > 1)
+    facility = Facility(pump=Pump(efficiency=0.86, cost=280000, opening_diameter=0.1, performance_rating=6))
+    facility.add_component(Pipe(length=30, friction_factor=0.02, diameter=0.12, cost=1))
+    return facility
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=5))
+
+
+async def evaluate_all(service, flows):
+    await service.start()
+    try:
+        async with await ServiceClient.connect(*service.address) as client:
+            return await asyncio.gather(
+                *(client.evaluate(input_volume_composition=FEED, input_volumetric_flow=flow) for flow in flows),
+                return_exceptions=True
+            )
+    finally:
+        await service.stop()
+
+
+def test_failing_batch_resolves_every_request():
+    facility = lossy_facility()
+
+    def fail(**kwargs):
+        raise RuntimeError("batch evaluation failed")
+
+    facility.facility_process_batch = fail
+    results = run(evaluate_all(SimulationService({"lossy": facility}, max_delay=0.05), [0.01, 0.02, 0.03]))
+    assert len(results) == 3
+    for result in results:
+        assert isinstance(result, RuntimeError)
+        assert "batch evaluation failed" in str(result)
+
+
+def test_result_does_not_depend_on_batch_neighbours():
+    service = SimulationService({"lossy": lossy_facility()}, max_delay=0.05)
+    alone, = run(evaluate_all(service, [0.01]))
+    valid, invalid = run(evaluate_all(service, [0.01, 0.0]))
+
+    assert isinstance(invalid, RuntimeError)
+    assert valid.keys() == alone.keys()
+    assert math.isnan(alone["volumetric_flow"]["total_volumetric_flow"])
+    assert math.isnan(valid["volumetric_flow"]["total_volumetric_flow"])
+    assert valid["total_power_consumed"] == pytest.approx(alone["total_power_consumed"])
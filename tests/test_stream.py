@@ -0,0 +1,90 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from systems.facility import Facility
+from systems.processors import Fermentation, Filtration, Distillation, Dehydration
+from systems.pump import Pump
+from systems.sweep import build_standard_facility
+from systems.timeseries import convert_csv
+
+
+FEEDS = [
+    {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2},
+    {"ethanol": 0.05, "water": 0.5, "sugar": 0.3, "fiber": 0.15}
+]
+
+
+def standard():
+    return build_standard_facility(
+        Fermentation(efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000),
+        Filtration(efficiency=0.9, power_consumption_rate=47812, cost_per_flow=460000),
+        Distillation(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Dehydration(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Pump(efficiency=0.86, cost=280000, opening_diameter=0.10, performance_rating=6),
+        friction_factor=0.002
+    )
+
+
+def records(count=25):
+    start = datetime.datetime(2026, 1, 1)
+    offsets = np.cumsum(np.arange(1, count + 1) * 60.0)
+    return [
+        (start + datetime.timedelta(seconds=float(offset)), 0.005 + 0.001 * (i % 7), FEEDS[i % 2])
+        for i, offset in enumerate(offsets)
+    ]
+
+
+def test_stream_prorates_cost_and_accumulates_across_chunks():
+    facility = standard()
+    stream = list(records())
+    results = list(facility.facility_process_stream(stream, chunk_size=4, interval=30, cost_period=3600))
+    assert len(results) == len(stream)
+
+    cumulative_cost = cumulative_energy = cumulative_ethanol = 0.0
+    previous = None
+    for (timestamp, flow, feed), result in zip(stream, results):
+        interval = 30 if previous is None else (timestamp - previous).total_seconds()
+        previous = timestamp
+        expected = facility.facility_process(input_volume_composition=dict(feed), input_volumetric_flow=flow, interval=interval)
+
+        assert result["interval"] == interval
+        assert result["power_generated"] == pytest.approx(expected["power_generated"], rel=1e-12)
+        assert result["total_cost_consumed"] == pytest.approx(expected["total_cost_consumed"], rel=1e-12)
+        assert result["cost_incurred"] == pytest.approx(expected["total_cost_consumed"] * interval / 3600, rel=1e-12)
+        assert result["energy_consumed"] == pytest.approx(expected["total_power_consumed"] * interval, rel=1e-12)
+
+        cumulative_cost += result["cost_incurred"]
+        cumulative_energy += result["energy_consumed"]
+        cumulative_ethanol += expected["mass_flow"]["amount"]["ethanol"] * interval
+        assert result["cumulative_cost"] == pytest.approx(cumulative_cost, rel=1e-12)
+        assert result["cumulative_energy_consumed"] == pytest.approx(cumulative_energy, rel=1e-12)
+        assert result["cumulative_ethanol_mass"] == pytest.approx(cumulative_ethanol, rel=1e-12)
+
+
+def test_stream_rejects_non_positive_flow():
+    stream = records(3)
+    stream[1] = (stream[1][0], 0.0, stream[1][2])
+    with pytest.raises(ValueError):
+        list(standard().facility_process_stream(stream))
+
+
+def test_series_matches_stream(tmp_path):
+    stream = records()
+    rows = ["timestamp,volumetric_flow,ethanol,water,sugar,fiber"]
+    for timestamp, flow, feed in stream:
+        rows.append(",".join([timestamp.isoformat(), repr(flow)] + [repr(feed[component]) for component in Facility.COMPONENTS]))
+    csv_path = tmp_path / "historian.csv"
+    csv_path.write_text("\n".join(rows) + "\n")
+    series = convert_csv(str(csv_path), str(tmp_path / "series"))
+
+    facility = standard()
+    expected = list(facility.facility_process_stream(series.records(), chunk_size=4, interval=30, cost_period=3600))
+    chunks = list(facility.facility_process_series(series, chunk_size=4, interval=30, cost_period=3600))
+    for key in ["interval", "cost_incurred", "energy_consumed", "cumulative_cost", "cumulative_energy_consumed",
+                "cumulative_energy_generated", "cumulative_ethanol_mass"]:
+        values = np.concatenate([chunk[key] for chunk in chunks])
+        np.testing.assert_allclose(values, [result[key] for result in expected], rtol=1e-12)
+    intervals = np.concatenate([chunk["interval"] for chunk in chunks])
+    np.testing.assert_array_equal(intervals[1:], [(b[0] - a[0]).total_seconds() for a, b in zip(stream, stream[1:])])
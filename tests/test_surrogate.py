@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from systems.processors import Fermentation, Filtration, Distillation, Dehydration
+from systems.pump import Pump
+from systems.sweep import build_standard_facility
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEED = {"ethanol": 0.0, "water": 0.6, "sugar": 0.2, "fiber": 0.2}
+
+
+def facility():
+    return build_standard_facility(
+        Fermentation(efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000),
+        Filtration(efficiency=0.9, power_consumption_rate=47812, cost_per_flow=460000),
+        Distillation(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Dehydration(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Pump(efficiency=0.86, cost=280000, opening_diameter=0.10, performance_rating=6),
+        friction_factor=0.002
+    )
+
+
+def test_facility_import_does_not_load_surrogate_storage():
+    probe = "import sys, systems.facility; print('sqlite3' in sys.modules, 'systems.surrogate' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True, cwd=ROOT).stdout
+    assert output.split() == ["False", "False"]
+
+
+def test_error_estimates_cover_sampled_errors():
+    plant = facility()
+    table = plant.response_table(input_volume_composition=FEED, flow_range=(0.002, 0.05), rtol=1e-5)
+    flows = np.random.default_rng(1).uniform(0.002, 0.05, 2000)
+    answer = table.query(input_volumetric_flow=flows)
+    truth = plant.facility_process_batch(input_volume_composition=np.array([0, 0.6, 0.2, 0.2]), input_volumetric_flow=flows)
+
+    assert answer["interpolated"].all()
+    for key, expected in [("total_power_consumed", truth["total_power_consumed"]),
+                          ("net_power_gained", truth["net_power_gained"])]:
+        assert np.all(np.abs(answer[key] - expected) <= answer["error"][key] * (1 + 1e-9))
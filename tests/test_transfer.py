@@ -0,0 +1,43 @@
+import numpy as np
+
+from systems.processors import Fermentation, Filtration, Distillation, Dehydration
+from systems.pump import Pump
+from systems.sweep import build_standard_facility
+
+
+FEED = [0.0, 0.6, 0.2, 0.2]
+
+
+def standard_facility():
+    return build_standard_facility(
+        Fermentation(name="Average", efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000),
+        Filtration(name="Average", efficiency=0.9, power_consumption_rate=47812, cost_per_flow=460000),
+        Distillation(name="Average", efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Dehydration(name="Average", efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Pump(name="Standard", efficiency=0.86, cost=280000, opening_diameter=0.10, performance_rating=6)
+    )
+
+
+def test_nested_list_batch_matches_array_batch():
+    transfer = standard_facility().transfer_function()
+    compositions = [FEED, [0.1, 0.5, 0.2, 0.2], [0.0, 0.7, 0.2, 0.1]]
+    flows = [0.005, 0.01, 0.02]
+
+    from_list = transfer.coefficients(compositions)
+    from_array = transfer.coefficients(np.array(compositions))
+    for key in ("ethanol", "power", "cost"):
+        np.testing.assert_array_equal(from_list[key], from_array[key])
+
+    from_list = transfer.evaluate(input_volume_composition=compositions, input_volumetric_flow=flows)
+    from_array = transfer.evaluate(input_volume_composition=np.array(compositions), input_volumetric_flow=np.array(flows))
+    for key, value in from_array.items():
+        np.testing.assert_array_equal(from_list[key], value)
+
+
+def test_flat_list_matches_single_row_batch():
+    transfer = standard_facility().transfer_function()
+    single = transfer.coefficients(FEED)
+    batch = transfer.coefficients(np.array([FEED]))
+    for key in ("ethanol", "power", "cost"):
+        assert isinstance(single[key], float)
+        np.testing.assert_allclose(single[key], batch[key][0], rtol=1e-12)
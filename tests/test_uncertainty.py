@@ -0,0 +1,39 @@
+import warnings
+
+import numpy as np
+
+from systems.processors import Fermentation, Filtration, Distillation, Dehydration
+from systems.pump import Pump
+from systems.sweep import build_standard_facility
+
+
+def facility():
+    return build_standard_facility(
+        Fermentation(efficiency=0.75, power_consumption_rate=47200, cost_per_flow=380000),
+        Filtration(efficiency=0.9, power_consumption_rate=47812, cost_per_flow=460000),
+        Distillation(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Dehydration(efficiency=0.75, power_consumption_rate=49538, cost_per_flow=240000),
+        Pump(efficiency=0.86, cost=280000, opening_diameter=0.10, performance_rating=6),
+        friction_factor=0.002
+    )
+
+
+def test_nonpositive_efficiency_samples_are_degenerate():
+    samples = 1000
+    distillation = np.linspace(-0.2, 1.2, samples)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        result = facility().monte_carlo(
+            samples=samples,
+            efficiencies={"Distillation": distillation},
+            pump_efficiency=distillation[::-1].copy(),
+            return_samples=True
+        )
+
+    degenerate = (distillation <= 0) | (distillation[::-1] <= 0)
+    assert result["degenerate_count"] == degenerate.sum()
+    assert result["valid_count"] == (~degenerate).sum()
+    for metric in result["metrics"].values():
+        assert np.isfinite(metric["mean"])
+    drawn = [values for key, values in result["samples"].items() if key.startswith("efficiency[")]
+    assert len(drawn) == 1 and drawn[0].max() == 1